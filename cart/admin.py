@@ -11,5 +11,7 @@ class CartAdmin(admin.ModelAdmin):
     list_display = ('session_key', 'total_items', 'subtotal', 'created_at', 'updated_at')
     list_filter = ('created_at', 'updated_at')
     search_fields = ('session_key',)
+    # item-ების ცვლილებით ივსება (Cart.add_product / update_item_quantity / clear)
+    readonly_fields = ('total_items', 'subtotal')
     
 
@@ -1,12 +1,11 @@
-from .models import Cart
+from .middleware import load_cart
+
 
 def cart_processor(request):
+    # cart_exempt view-ებზე request.cart არაა — წაკითხვა ჩაწერის გარეშე
     cart = getattr(request, "cart", None)
-    if not cart:
-        if not request.session.session_key:
-            request.session.create()
-        cart_key = request.session.get("cart_key", request.session.session_key)
-        cart, _ = Cart.objects.get_or_create(session_key=cart_key)
+    if cart is None:
+        cart = load_cart(request)
 
     return {
         "cart_total_items": cart.total_items,
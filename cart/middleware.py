@@ -1,14 +1,91 @@
+from decimal import Decimal
+from functools import wraps
+from inspect import iscoroutinefunction
+
 from django.utils.deprecation import MiddlewareMixin
-from .models import Cart
+from django.utils.functional import SimpleLazyObject
 
-class CartMiddleware(MiddlewareMixin):
-    def process_request(self, request):
-        if not request.session.session_key:
-            request.session.create()
+from .models import Cart, CartItem
+
+
+def cart_exempt(view_func):
+    """view, რომელსაც კალათა (და სესია) არ სჭირდება — მაგ. autocomplete, ბაზის გარეშე."""
+    # async view async-ად უნდა დარჩეს, თორემ Django მას thread-ში გაუშვებს
+    if iscoroutinefunction(view_func):
+        async def wrapped(*args, **kwargs):
+            return await view_func(*args, **kwargs)
+    else:
+        def wrapped(*args, **kwargs):
+            return view_func(*args, **kwargs)
+
+    wrapped = wraps(view_func)(wrapped)
+    wrapped.cart_exempt = True
+    return wrapped
+
+
+class EmptyCart:
+    """
+    კალათა, რომელიც ჯერ არ შექმნილა: მრიცხველები და შაბლონები ბაზის გარეშე.
+    მხოლოდ კითხვისთვის — ჩასაწერად get_or_create_cart().
+    """
+
+    pk = id = None
+    session_key = None
+    total_items = 0
+    subtotal = Decimal("0")
+
+    def __str__(self):
+        return "Cart (empty)"
+
+    @property
+    def items(self):
+        return CartItem.objects.none()
 
-        cart_key = request.session.setdefault("cart_key", request.session.session_key)
+    def update_item_quantity(self, item_id, quantity=None, delta=0):
+        return False
+
+    def remove_item(self, item_id):
+        return False
+
+    def clear(self):
+        pass
+
+
+def load_cart(request):
+    """სესიის კალათა ან EmptyCart; არც სესიას, არც Cart-ს არ ქმნის."""
+    cart_key = request.session.get("cart_key")
+    if cart_key:
+        try:
+            return Cart.objects.get(session_key=cart_key)
+        except Cart.DoesNotExist:
+            pass
+    return EmptyCart()
+
+
+def get_or_create_cart(request):
+    """პირველი ცვლილებისას (add to cart): სესია + Cart სტრიქონი."""
+    cart = request.cart if hasattr(request, "cart") else load_cart(request)
+    if cart.pk:
+        return cart
+    # save() და არა create(): create() არსებულ სესიას (login, messages) "ფლუშავს"
+    if not request.session.session_key:
+        request.session.save()
+    # login-ისას სესიის გასაღები იცვლება — კალათა cart_key-ით რჩება
+    cart_key = request.session.setdefault("cart_key", request.session.session_key)
+    cart, _ = Cart.objects.get_or_create(session_key=cart_key)
+    request.cart = cart
+    return cart
+
+
+class CartMiddleware(MiddlewareMixin):
+    """
+    request.cart — lazy: სესია/ბაზა მხოლოდ პირველ წვდომაზე. კრაულერები,
+    webhook-ები და 404-ები სესიის და Cart სტრიქონის გარეშე რჩებიან.
+    """
 
-        cart, _ = Cart.objects.get_or_create(session_key=cart_key)
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, "cart_exempt", False):
+            return None
 
-        request.cart = cart
+        request.cart = SimpleLazyObject(lambda: load_cart(request))
         return None
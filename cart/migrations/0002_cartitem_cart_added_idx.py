@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:44
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY — ცხრილი ჩაწერაზე არ იბლოკება; ტრანზაქციის გარეთ სრულდება
+    atomic = False
+
+
+    dependencies = [
+        ('cart', '0001_initial'),
+        ('core', '0006_catalog_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='cartitem',
+            index=models.Index(fields=['cart', '-added_at'], name='cart_item_cart_added_idx'),
+        ),
+    ]
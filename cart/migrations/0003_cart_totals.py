@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:17
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+# არსებული კალათების ჯამები item-ებიდან (მიმდინარე ფასით)
+BACKFILL_SQL = """
+UPDATE cart_cart c
+   SET total_items = s.items, subtotal = s.subtotal
+  FROM (
+       SELECT i.cart_id, SUM(i.quantity) AS items, SUM(i.quantity * p.price) AS subtotal
+         FROM cart_cartitem i
+         JOIN core_product p ON p.id = i.product_id
+        GROUP BY i.cart_id
+  ) s
+ WHERE c.id = s.cart_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_cartitem_cart_added_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='total_items',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -1,5 +1,10 @@
 from decimal import Decimal
-from django.db import models
+
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
 from core.models import Product, ProductSize
 
 
@@ -7,52 +12,87 @@ class Cart(models.Model):
     session_key = models.CharField(max_length=40, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # დენორმალიზებული ჯამები: CartItem-ის ყოველი ცვლილება იმავე ტრანზაქციაში F()-ით,
+    # ფასის ცვლილება / პროდუქტის წაშლა — recount_totals()-ით (cart/signals.py)
+    total_items = models.PositiveIntegerField(default=0)
+    subtotal = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
 
     def __str__(self):
         return f"Cart {self.session_key}"
 
-    @property
-    def total_items(self):
-        return sum(item.quantity for item in self.items.all())
+    # ყველა ცვლილება ჯერ კალათის სტრიქონს ბლოკავს, შემდეგ item-ებს — ერთი რიგი,
+    # პარალელურ add/clear-ს deadlock არ ემართება
+    def _lock(self):
+        list(Cart.objects.select_for_update().filter(pk=self.pk).values_list("pk"))
 
-    @property
-    def subtotal(self):
-        return sum((item.total_price for item in self.items.all()), Decimal("0"))
+    def _adjust_totals(self, items, amount):
+        """amount — თანხა ან expression (ფასი ბაზიდან, იმავე UPDATE-ში)."""
+        Cart.objects.filter(pk=self.pk).update(
+            total_items=F("total_items") + items,
+            subtotal=F("subtotal") + amount,
+            updated_at=timezone.now(),
+        )
 
     def add_product(self, product, product_size, quantity=1):
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=self,
-            product=product,
-            product_size=product_size,
-            defaults={"quantity": quantity},
-        )
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
-        return cart_item
+        """product_size სავალდებულოა: CartItem-ი ზომის გარეშე არ არსებობს."""
+        if product_size.product_id != product.pk:
+            raise ValueError("product_size does not belong to product")
+        with transaction.atomic():
+            self._lock()
+            item = self.items.filter(product=product, product_size=product_size).first()
+            if item:
+                CartItem.objects.filter(pk=item.pk).update(quantity=F("quantity") + quantity)
+            else:
+                item = CartItem.objects.create(
+                    cart=self, product=product, product_size=product_size, quantity=quantity
+                )
+            # ფასი ბაზიდან: product instance შეიძლება ფასის ცვლილებამდე იყოს წაკითხული
+            price = Subquery(Product.objects.filter(pk=product.pk).values("price")[:1])
+            self._adjust_totals(quantity, price * quantity)
+        self.refresh_from_db(fields=["total_items", "subtotal"])
+        return item
 
-    def remove_item(self, item_id):
-        try:
-            item = self.items.get(id=item_id)
-            item.delete()
-            return True
-        except CartItem.DoesNotExist:
-            return False
-
-    def update_item_quantity(self, item_id, quantity):
-        try:
-            item = self.items.get(id=item_id)
-            if quantity > 0:
-                item.quantity = quantity
-                item.save()
+    def update_item_quantity(self, item_id, quantity=None, delta=0):
+        """
+        quantity — ახალი რაოდენობა, ან delta — ცვლილება; შედეგი <= 0 — წაშლა.
+        False, თუ item ამ კალათაში არაა.
+        """
+        with transaction.atomic():
+            self._lock()
+            item = (
+                self.items.filter(pk=item_id).select_related("product").only("quantity", "product__price").first()
+            )
+            if item is None:
+                return False
+            new_quantity = max(item.quantity + delta if quantity is None else quantity, 0)
+            if new_quantity:
+                CartItem.objects.filter(pk=item.pk).update(quantity=new_quantity)
             else:
-                item.delete()
-            return True
-        except CartItem.DoesNotExist:
-            return False
+                CartItem.objects.filter(pk=item.pk).delete()
+            change = new_quantity - item.quantity
+            self._adjust_totals(change, item.product.price * change)
+        self.refresh_from_db(fields=["total_items", "subtotal"])
+        return True
+
+    def remove_item(self, item_id):
+        return self.update_item_quantity(item_id, quantity=0)
 
     def clear(self):
-        self.items.all().delete()
+        with transaction.atomic():
+            Cart.objects.filter(pk=self.pk).update(total_items=0, subtotal=0, updated_at=timezone.now())
+            self.items.all().delete()
+        self.total_items, self.subtotal = 0, Decimal("0")
+
+
+def recount_totals(carts):
+    """ჯამები item-ებიდან, ერთი UPDATE-ით; carts — Cart queryset (admin, ფასის ცვლილება)."""
+    items = CartItem.objects.filter(cart=OuterRef("pk")).order_by().values("cart")
+    carts.update(
+        total_items=Coalesce(Subquery(items.annotate(n=Sum("quantity")).values("n")), 0),
+        subtotal=Coalesce(
+            Subquery(items.annotate(s=Sum(F("quantity") * F("product__price"))).values("s")), Decimal("0")
+        ),
+    )
 
 
 class CartItem(models.Model):
@@ -64,6 +104,10 @@ class CartItem(models.Model):
 
     class Meta:
         unique_together = ("cart", "product", "product_size")
+        indexes = [
+            # კალათის/checkout-ის სია: WHERE cart_id = ... ORDER BY added_at DESC
+            models.Index(fields=["cart", "-added_at"], name="cart_item_cart_added_idx"),
+        ]
 
     def __str__(self):
         return f"{self.product.name} - {self.product_size.size.name} x {self.quantity}"
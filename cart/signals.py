@@ -0,0 +1,34 @@
+# cart/signals.py
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.models import Product, ProductSize
+
+from .models import Cart, CartItem, recount_totals
+
+
+# -----------------------------
+# შენახული ჯამები (Cart.total_items / subtotal)
+# -----------------------------
+@receiver(post_save, sender=Product)
+def product_price_totals(sender, instance, created, update_fields=None, **kwargs):
+    # subtotal მიმდინარე ფასით ითვლება
+    if created or (update_fields is not None and "price" not in update_fields):
+        return
+    recount_totals(Cart.objects.filter(items__product_id=instance.pk))
+
+
+@receiver(pre_delete, sender=Product)
+@receiver(pre_delete, sender=ProductSize)
+def remember_carts(sender, instance, **kwargs):
+    # item-ები CASCADE-ით იშლება — წაშლის შემდეგ ვეღარ ვიპოვით, რომელ კალათებში იყო
+    field = "product" if sender is Product else "product_size"
+    instance._cart_ids = list(CartItem.objects.filter(**{field: instance}).values_list("cart_id", flat=True))
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=ProductSize)
+def deleted_item_totals(sender, instance, **kwargs):
+    cart_ids = getattr(instance, "_cart_ids", None)
+    if cart_ids:
+        recount_totals(Cart.objects.filter(pk__in=set(cart_ids)))
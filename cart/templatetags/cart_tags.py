@@ -1,5 +1,6 @@
 from django import template
-from cart.models import Cart
+
+from cart.middleware import load_cart
 
 register = template.Library()
 
@@ -12,18 +13,11 @@ def get_cart_count(context):
     request = context.get("request")
     if not request:
         return 0
-    
-    if not request.session.session_key:
-        request.session.save()
-    skey = request.session.session_key
-
-    total = (
-        Cart.objects
-        .filter(session_key=skey)
-        .values_list("total_items", flat=True)
-        .first()
-    )
-    return total or 0
+    # lazy request.cart (cart/middleware.py) — სესიას და Cart-ს არ ქმნის
+    cart = getattr(request, "cart", None)
+    if cart is None:
+        cart = load_cart(request)
+    return cart.total_items
 
 
 @register.filter
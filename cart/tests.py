@@ -1,3 +1,152 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core.models import Product, ProductSize
+from core.seeding import seed_catalog
+from core.testing import StoreTestCase
+
+from .middleware import load_cart
+from .models import Cart, CartItem, recount_totals
+from .templatetags.cart_tags import get_cart_count
+
+
+def stored_totals(cart):
+    cart.refresh_from_db(fields=["total_items", "subtotal"])
+    return cart.total_items, cart.subtotal
+
+
+def expected_totals(cart):
+    items = list(CartItem.objects.filter(cart=cart).select_related("product"))
+    return sum(i.quantity for i in items), sum((i.total_price for i in items), Decimal("0"))
+
+
+# -----------------------------
+# შენახული ჯამები (Cart.total_items / subtotal)
+# -----------------------------
+class CartTotalsTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(4)
+        cls.sizes = {p.pk: list(ProductSize.objects.filter(product=p)) for p in cls.products}
+
+    def setUp(self):
+        super().setUp()
+        self.cart = Cart.objects.create(session_key="totals")
+
+    def add(self, product, quantity=1, size=0):
+        return self.cart.add_product(product, self.sizes[product.pk][size], quantity)
+
+    def test_add_merges_same_size(self):
+        a, b = self.products[:2]
+        self.add(a, 2)
+        self.add(a, 3)
+        self.add(b)
+        self.assertEqual(CartItem.objects.filter(cart=self.cart, product=a).get().quantity, 5)
+        self.assertEqual((self.cart.total_items, self.cart.subtotal), expected_totals(self.cart))
+        self.assertEqual(stored_totals(self.cart), (6, a.price * 5 + b.price))
+
+    def test_size_must_belong_to_product(self):
+        a, b = self.products[:2]
+        with self.assertRaises(ValueError):
+            self.cart.add_product(a, self.sizes[b.pk][0])
+        self.assertEqual(stored_totals(self.cart), (0, Decimal("0")))
+
+    def test_update_remove_clear(self):
+        a, b = self.products[:2]
+        item = self.add(a, 2)
+        self.add(b, 1)
+
+        self.assertTrue(self.cart.update_item_quantity(item.pk, delta=3))
+        self.assertEqual(stored_totals(self.cart), expected_totals(self.cart))
+        self.assertTrue(self.cart.update_item_quantity(item.pk, quantity=1))
+        self.assertEqual(stored_totals(self.cart), expected_totals(self.cart))
+
+        self.assertTrue(self.cart.remove_item(item.pk))
+        self.assertFalse(self.cart.remove_item(item.pk))
+        self.assertEqual(stored_totals(self.cart), (1, b.price))
+
+        self.cart.clear()
+        self.assertEqual(stored_totals(self.cart), (0, Decimal("0")))
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+    def test_item_of_another_cart_is_ignored(self):
+        other = Cart.objects.create(session_key="other")
+        item = other.add_product(self.products[0], self.sizes[self.products[0].pk][0], 2)
+        self.assertFalse(self.cart.update_item_quantity(item.pk, quantity=5))
+        self.assertEqual(stored_totals(other), (2, self.products[0].price * 2))
+
+    def test_price_change_and_deletes_recount(self):
+        a, b, c = self.products[:3]
+        self.add(a, 2)
+        self.add(b)
+        self.add(c)
+
+        a.price = Decimal("1.25")
+        a.save()
+        self.assertEqual(stored_totals(self.cart), expected_totals(self.cart))
+
+        self.sizes[b.pk][0].delete()
+        self.assertEqual(stored_totals(self.cart), expected_totals(self.cart))
+
+        Product.objects.get(pk=c.pk).delete()
+        self.assertEqual(stored_totals(self.cart), (2, Decimal("2.50")))
+
+    def test_add_prices_from_the_database(self):
+        a = self.products[0]
+        stale = Product.objects.get(pk=a.pk)
+        a.price = Decimal("3.10")
+        a.save()
+        self.cart.add_product(stale, self.sizes[a.pk][0], 2)
+        self.assertEqual(stored_totals(self.cart), (2, Decimal("6.20")))
+
+    def test_recount_totals(self):
+        self.add(self.products[0], 2)
+        Cart.objects.filter(pk=self.cart.pk).update(total_items=99, subtotal=0)
+        recount_totals(Cart.objects.filter(pk=self.cart.pk))
+        self.assertEqual(stored_totals(self.cart), expected_totals(self.cart))
+
+
+# -----------------------------
+# Lazy კალათა (cart/middleware.py)
+# -----------------------------
+class LazyCartTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = seed_catalog(1)[0]
+        cls.size = ProductSize.objects.filter(product=cls.product).first()
+
+    def test_browsing_creates_no_session_or_cart(self):
+        for url in ("/", "/catalog/", f"/product/{self.product.slug}/", "/cart/modal/"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertFalse(Cart.objects.exists())
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+
+    def test_first_add_creates_cart(self):
+        url = reverse("cart:add_to_cart", args=[self.product.slug])
+        self.client.post(url, {"size_id": self.size.pk, "quantity": 2})
+        self.client.post(url, {"size_id": self.size.pk})
+        cart = Cart.objects.get()
+        self.assertEqual(self.client.session["cart_key"], cart.session_key)
+        self.assertEqual((cart.total_items, cart.subtotal), (3, self.product.price * 3))
+
+    def test_cart_count_tag_reads_the_lazy_cart(self):
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        request.cart = load_cart(request)
+        self.assertEqual(get_cart_count({"request": request}), 0)
+        self.assertIsNone(request.session.session_key)
+
+        self.client.post(reverse("cart:add_to_cart", args=[self.product.slug]), {"size_id": self.size.pk})
+        request.session = SessionStore(self.client.session.session_key)
+        request.cart = load_cart(request)
+        self.assertEqual(get_cart_count({"request": request}), 1)
+
+    def test_add_without_size_redirects(self):
+        response = self.client.post(reverse("cart:add_to_cart", args=[self.product.slug]), {"size_id": ""})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(CartItem.objects.exists())
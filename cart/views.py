@@ -1,49 +1,15 @@
 # cart/views.py
-from django.db import transaction
-from django.db.models import F
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.views import View
 from django.views.generic import TemplateView
 
-from .models import Cart, CartItem
+from .middleware import get_or_create_cart, load_cart
+from .models import CartItem
+from core.engines import engine_for
 from core.models import Product, ProductSize
 
 
-# --------------------------
-# Helpers
-# --------------------------
-def _recalculate(cart: Cart):
-    """Recalculate totals safely (fallback if the model has no custom method)."""
-    if hasattr(cart, "recalculate") and callable(cart.recalculate):
-        cart.recalculate()
-        return
-    if hasattr(cart, "update_totals") and callable(cart.update_totals):
-        cart.update_totals()
-        return
-
-    try:
-        items = cart.items.select_related("product")
-        total_qty = sum(i.quantity for i in items)
-        try:
-            subtotal = sum(getattr(i, "total_price", i.product.price * i.quantity) for i in items)
-        except Exception:
-            subtotal = 0
-
-        dirty = []
-        if hasattr(cart, "total_items"):
-            cart.total_items = total_qty
-            dirty.append("total_items")
-        if hasattr(cart, "subtotal"):
-            cart.subtotal = subtotal
-            dirty.append("subtotal")
-        if dirty:
-            cart.save(update_fields=dirty)
-    except Exception:
-        # UI-ს არ ვაქცევინოთ erroრ
-        pass
-
-
 # --------------------------
 # Cart mixin
 # --------------------------
@@ -51,17 +17,14 @@ class CartMixin:
     """Reusable helpers for all cart views."""
 
     def get_cart(self, request):
-        # თუ middleware-მა უკვე მიაბა, გამოვიყენოთ ის
+        """წასაკითხად: არარსებული კალათის ნაცვლად EmptyCart (cart/middleware.py)."""
+        # თუ middleware-მა უკვე მიაბა (lazy), გამოვიყენოთ ის
         cart = getattr(request, "cart", None)
-        if cart:
-            return cart
-
-        # შექმენი სესია უსაფრთხოდ (create() ძველს "ფლუშავს"; save() — არა)
-        if not request.session.session_key:
-            request.session.save()
+        return cart if cart is not None else load_cart(request)
 
-        cart, _ = Cart.objects.get_or_create(session_key=request.session.session_key)
-        return cart
+    def get_or_create_cart(self, request):
+        """ჩასაწერად — სესია და Cart სტრიქონი მხოლოდ აქ იქმნება."""
+        return get_or_create_cart(request)
 
     def get_items(self, cart):
         return cart.items.select_related("product", "product_size__size")
@@ -82,7 +45,8 @@ class CartMixin:
         if context:
             base.update(context)
         template = force_template or self.pick_template(request)
-        return render(request, template, base)
+        using = engine_for("cart_modal") if template == "cart/cart_modal.html" else None
+        return render(request, template, base, using=using)
 
 
 # --------------------------
@@ -99,11 +63,8 @@ class CartCountView(CartMixin, View):
     http_method_names = ["get"]
 
     def get(self, request):
-        cart = self.get_cart(request)
-        total = getattr(cart, "total_items", None)
-        if total is None:
-            total = sum(i.quantity for i in cart.items.all())
-        return JsonResponse({"total_items": total})
+        # შენახული მრიცხველი — item-ების query-ის გარეშე
+        return JsonResponse({"total_items": self.get_cart(request).total_items})
 
 
 class AddToCartView(CartMixin, View):
@@ -114,7 +75,6 @@ class AddToCartView(CartMixin, View):
         return redirect(product.get_absolute_url())
 
     def post(self, request, slug):
-        cart = self.get_cart(request)
         product = get_object_or_404(Product, slug=slug)
 
         # qty (>=1)
@@ -124,26 +84,14 @@ class AddToCartView(CartMixin, View):
             qty = 1
         qty = max(qty, 1)
 
-        # size (optional, უნდა ეკუთვნოდეს ამ პროდუქტს)
+        # size (სავალდებულო, უნდა ეკუთვნოდეს ამ პროდუქტს)
         size_id = request.POST.get("size_id")
-        product_size = None
-        if size_id:
-            product_size = get_object_or_404(ProductSize.objects.filter(product=product), id=size_id)
-
-        with transaction.atomic():
-            qs = cart.items.select_for_update().filter(product=product)
-            if product_size:
-                qs = qs.filter(product_size=product_size)
-            item = qs.first()
-
-            if item:
-                CartItem.objects.filter(id=item.id).update(quantity=F("quantity") + qty)
-            else:
-                CartItem.objects.create(
-                    cart=cart, product=product, product_size=product_size, quantity=qty
-                )
-
-        _recalculate(cart)
+        if not size_id or not size_id.isdigit():
+            return redirect(product.get_absolute_url())
+        product_size = get_object_or_404(ProductSize.objects.filter(product=product), id=size_id)
+
+        cart = self.get_or_create_cart(request)
+        cart.add_product(product, product_size, qty)
         return self.render_cart(request)
 
 
@@ -155,30 +103,21 @@ class UpdateItemView(CartMixin, View):
 
     def post(self, request, item_id):
         cart = self.get_cart(request)
-        item = get_object_or_404(CartItem, id=item_id, cart=cart)
+        item = get_object_or_404(CartItem, id=item_id, cart_id=cart.pk)
 
         action = request.POST.get("action")
-        with transaction.atomic():
-            if action == "inc":
-                CartItem.objects.filter(id=item.id).update(quantity=F("quantity") + 1)
-            elif action == "dec":
-                item.refresh_from_db(fields=["quantity"])
-                if item.quantity <= 1:
-                    item.delete()
-                else:
-                    CartItem.objects.filter(id=item.id).update(quantity=F("quantity") - 1)
-            else:
-                # quantity=...
-                try:
-                    q = int(request.POST.get("quantity", item.quantity))
-                except ValueError:
-                    q = item.quantity
-                if q <= 0:
-                    item.delete()
-                else:
-                    CartItem.objects.filter(id=item.id).update(quantity=q)
-
-        _recalculate(cart)
+        if action == "inc":
+            cart.update_item_quantity(item.id, delta=1)
+        elif action == "dec":
+            cart.update_item_quantity(item.id, delta=-1)
+        else:
+            # quantity=...
+            try:
+                q = int(request.POST.get("quantity", item.quantity))
+            except ValueError:
+                q = item.quantity
+            cart.update_item_quantity(item.id, quantity=q)
+
         return self.render_cart(request)
 
 
@@ -190,9 +129,8 @@ class RemoveItemView(CartMixin, View):
 
     def post(self, request, item_id):
         cart = self.get_cart(request)
-        item = get_object_or_404(CartItem, id=item_id, cart=cart)
-        item.delete()
-        _recalculate(cart)
+        if not cart.remove_item(item_id):
+            raise Http404("No CartItem matches the given query.")
         return self.render_cart(request)
 
 
@@ -203,9 +141,7 @@ class ClearCartView(CartMixin, View):
         return redirect("cart:summary")
 
     def post(self, request):
-        cart = self.get_cart(request)
-        cart.items.all().delete()
-        _recalculate(cart)
+        self.get_cart(request).clear()
         return self.render_cart(request)
 
 
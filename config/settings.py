@@ -9,6 +9,7 @@ Production-friendly defaults:
 """
 
 from pathlib import Path
+import importlib.util
 import os
 
 from dotenv import load_dotenv
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Local apps
     "core",
@@ -54,6 +56,7 @@ INSTALLED_APPS = [
     "users",
     "orders",
     "payment",
+    "jobs",
 ]
 
 # ---------------------------------------------------------------------
@@ -94,6 +97,31 @@ TEMPLATES = [
     },
 ]
 
+# Jinja2 — მხოლოდ ცხელი storefront გვერდებისთვის (core/jinja2/, cart/jinja2/).
+# Django ძრავა პირველია, ამიტომ using-ის გარეშე ყველაფერი ძველებურად რენდერდება;
+# JINJA2_VIEWS-ში ჩამოთვლილი გვერდები გადადის (core/engines.py), მაგ.
+# JINJA2_VIEWS=index,catalog,search,cart_modal
+if importlib.util.find_spec("jinja2") is not None:
+    TEMPLATES.append(
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "DIRS": [],
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "environment": "core.jinja_env.environment",
+                # request/csrf_input/csrf_token backend-ი თვითონ ამატებს
+                "context_processors": [
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                    "cart.context_processors.cart_processor",
+                ],
+            },
+        }
+    )
+    JINJA2_VIEWS = {v for v in os.getenv("JINJA2_VIEWS", "").split(",") if v}
+else:
+    JINJA2_VIEWS = set()
+
 WSGI_APPLICATION = "config.wsgi.application"
 
 # ---------------------------------------------------------------------
@@ -125,6 +153,15 @@ else:
 # Ensure atomic requests on DATABASE_URL path as well
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
+# ASGI (koyeb_start.sh, SERVER=asgi): მოთხოვნა ყოველ ჯერზე ახალ thread-ში სრულდება,
+# thread-ზე მიბმული მუდმივი კავშირი აღარ მუშაობს — psycopg pool პროცესზე
+if os.getenv("DB_POOL", "0") == "1":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": 2,
+        "max_size": int(os.getenv("DB_POOL_MAX", "10")),
+    }
+
 # ---------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------
@@ -154,6 +191,10 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 # Django 5+: STATICFILES_STORAGE ჩანაცვლებულია STORAGES-ით
 STORAGES = {
+    # ატვირთული სურათები და მათი ვერსიები (core/images.py)
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     }
@@ -185,6 +226,56 @@ SESSION_SAVE_EVERY_REQUEST = True
 # Custom user model
 AUTH_USER_MODEL = "users.CustomUser"
 
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+# "default" — ყოველი worker-ის საკუთარი; "shared" — ყველა worker-ისთვის საერთო
+# (თაობის მრიცხველები, core.caching.tiered). ლოკალურად ფაილური backend-ია,
+# production-ში SHARED_CACHE_BACKEND/LOCATION-ით Redis/Memcached-ზე გადაირთვება.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": os.getenv(
+            "SHARED_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv("SHARED_CACHE_LOCATION", str(BASE_DIR / ".cache")),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "20000"))},
+    },
+}
+SHARED_CACHE_ALIAS = "shared"
+# core.caching.tiered-ის in-process LRU
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "2048"))
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", "30"))
+
+# ფონური დავალებები (jobs app): `manage.py runworker`, queue:concurrency
+JOBS_QUEUES = os.getenv("JOBS_QUEUES", "default:4,images:2")
+# worker (Procfile `worker:`) ცალკე კონტეინერია — ფაილური shared ქეში, MEDIA_ROOT და
+# EXPORTS_ROOT მას მხოლოდ საერთო volume-ით ეზიარება (ატვირთული სურათები, თაობები
+# web-სთვის, exports). 1 = web და worker ერთსა და იმავე დისკს ხედავენ; 0-ზე
+# runworker არ იღებს დავალებებს, რომლებსაც ეს სჭირდება (jobs/worker.py:
+# shared_state_problems) — მათთვის Redis/Memcached shared ქეში და ქსელური storage.
+# DEBUG-ზე — ერთი მანქანა.
+WORKER_SHARED_VOLUME = os.getenv("WORKER_SHARED_VOLUME", "1" if DEBUG else "0") == "1"
+
+# ძებნის typeahead-ის in-process ინდექსის ზედა ზღვარი (core/autocomplete.py)
+AUTOCOMPLETE_MAX_BYTES = int(os.getenv("AUTOCOMPLETE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# sitemap / shopping feed ფაილები (core/exports.py, `manage.py build_exports`)
+SITE_URL = os.getenv("SITE_URL", "http://localhost:8000")
+EXPORTS_ROOT = Path(os.getenv("EXPORTS_ROOT", str(BASE_DIR / "exports")))
+FEED_CURRENCY = os.getenv("FEED_CURRENCY", "GEL")
+
+# პროდუქტის გვერდის live მარაგი (core/stock_stream.py): "listen" (Postgres NOTIFY) ან "poll"
+STOCK_STREAM_BACKEND = os.getenv("STOCK_STREAM_BACKEND", "listen")
+
+# მთავარი / კატალოგი / ძებნა / პროდუქტი async view-ებით (core/async_views.py) — ASGI-სთვის
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "0") == "1"
+
+# Listing გვერდები ProductCard read model-იდან (0 -> ძველი Product + Category query-ები)
+CATALOG_READ_MODEL = os.getenv("CATALOG_READ_MODEL", "1") == "1"
+
 # ---------------------------------------------------------------------
 # Stripe
 # ---------------------------------------------------------------------
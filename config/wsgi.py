@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# ძებნის typeahead-ის ინდექსი ფონურად, პირველი მოთხოვნის მოლოდინის გარეშე
+from core.autocomplete import warm_up  # noqa: E402
+
+warm_up()
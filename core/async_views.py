@@ -0,0 +1,136 @@
+# core/async_views.py
+"""
+მთავარი, კატალოგი, ძებნა და პროდუქტი — async view-ებად (ASGI, settings.ASYNC_VIEWS).
+
+იგივე კლასები (core/views.py), მხოლოდ IO-ა async: Django-ს async ORM
+(aget, async for) და sync_to_async ქეშის/ქეშირებული helper-ებისთვის.
+
+Django 5.2-ში async ORM შიგნით sync_to_async(thread_sensitive=True)-ია —
+ერთი მოთხოვნის query-ები ერთ thread-ში რიგრიგობით სრულდება, ამიტომ
+ნაწილები აქაც რიგრიგობით await-დება (gather არაფერს აჩქარებდა). მოგება
+მოთხოვნებს შორისაა: ბაზის მოლოდინისას worker-ი სხვა მოთხოვნებს ემსახურება,
+thread-ების/პროცესების გამრავლების გარეშე (manage.py bench_http).
+
+ATOMIC_REQUESTS async view-ს არ უშვებს — as_view() non_atomic_requests-ითაა.
+"""
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.template.response import TemplateResponse
+
+from . import views
+from .conditional import AsyncConditionalGetMixin
+from .counters import record_view
+from .engines import engine_for
+from .facets import get_facets
+from .listing import hydrate, listing_page
+from .partials import AsyncPartialsMixin
+from .rows import afetch_rows
+
+acategories = sync_to_async(views.get_categories_cached)
+asizes = sync_to_async(views.get_sizes_cached)
+alisting_page = sync_to_async(listing_page)
+afacets = sync_to_async(get_facets)
+ahydrate = sync_to_async(hydrate)
+
+
+async def arelated_products(product, limit=views.RELATED_LIMIT):
+    """get_related_products (core/views.py) async ORM-ით."""
+    ids = [pk async for pk in views.related_ids(product, limit)]
+    if ids:
+        return await ahydrate(views.listing_queryset(), ids)
+    return await afetch_rows(views.same_category(product, limit))
+
+
+async def afacet_context(base, spec):
+    categories = await acategories()
+    sizes = await asizes()
+    facets = await afacets(base, spec, categories=categories, sizes=sizes)
+    return categories, sizes, facets
+
+
+class AsyncPageMixin(AsyncConditionalGetMixin):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+
+# -----------------------------
+# Pages
+# -----------------------------
+class IndexView(AsyncPageMixin, views.IndexView):
+    async def aget_context_data(self, **kwargs):
+        # ContextMixin — sync get_context_data-ს query-ების გარეშე
+        ctx = super(views.IndexView, self).get_context_data(**kwargs)
+        ctx["current_category"] = None
+        ctx["search_query"] = self.request.GET.get("q", "")
+
+        new_qs, featured_qs = views.home_querysets()
+        ctx["categories"] = await acategories()
+        ctx["new_products"] = await afetch_rows(new_qs)
+        # გაყიდვების გარეშე — ახლები
+        ctx["featured_products"] = await afetch_rows(featured_qs) or ctx["new_products"]
+        return ctx
+
+    async def get(self, request, *args, **kwargs):
+        context = await self.aget_context_data(**kwargs)
+        return TemplateResponse(request, self.template_name, context, using=engine_for("index"))
+
+
+class CatalogView(AsyncPageMixin, AsyncPartialsMixin, views.CatalogView):
+    async def aget_context_data(self, **kwargs):
+        context = super(views.CatalogView, self).get_context_data(**kwargs)
+        spec, filter_context = self.filter_context()
+        context.update(filter_context)
+        base = views.listing_queryset()
+
+        # კატეგორია ყოველ მოთხოვნაზე (partial-ზეც) — არარსებული slug ყოველთვის 404-ია
+        categories = await acategories()
+        category = views.find_category(categories, context["current_category"])
+        if "heading" in self.needs:
+            context["current_category_obj"] = category
+
+        if "listing" in self.needs:
+            page = await alisting_page(base, spec, self.request.GET.get("cursor"))
+            context.update(views.page_context(page, "core/includes/catalog_items.html"))
+        if "heading" in self.needs or "facets" in self.needs:
+            context["categories"] = categories
+        if "facets" in self.needs:
+            _, context["sizes"], context["facets"] = await afacet_context(base, spec)
+        return context
+
+
+class SearchView(AsyncPageMixin, AsyncPartialsMixin, views.SearchView):
+    async def aget_context_data(self, **kwargs):
+        ctx = super(views.SearchView, self).get_context_data(**kwargs)
+        spec, cd, q = self.filter_context()
+        base = views.listing_queryset()
+
+        page = await alisting_page(base, spec, self.request.GET.get("cursor"))
+        ctx.update(await sync_to_async(self.results_context)(page, cd, q))
+        if "facets" in self.needs:
+            categories, sizes, facets = await afacet_context(base, spec)
+            ctx.update(self.facets_context(facets, spec, cd, categories, sizes))
+        return ctx
+
+
+class ProductDetailView(AsyncPageMixin, views.ProductDetailView):
+    async def dispatch(self, request, *args, **kwargs):
+        response = await super().dispatch(request, *args, **kwargs)
+        # 304-იც ნახვაა (ბრაუზერის ქეშიდან ნაჩვენები გვერდი)
+        if response.status_code in (200, 304) and getattr(self, "product_pk", None):
+            await sync_to_async(record_view)(self.product_pk)
+        return response
+
+    async def aget_context_data(self, **kwargs):
+        # SingleObjectMixin — object / product კონტექსტში
+        ctx = super(views.ProductDetailView, self).get_context_data(**kwargs)
+        ctx.update(self.product_context(self.object))
+        ctx["categories"] = await acategories()
+        ctx["related_products"] = await arelated_products(self.object)
+        return ctx
+
+    async def get(self, request, *args, **kwargs):
+        # prefetch_related-იანი get() — ერთი გადასვლით
+        self.object = await sync_to_async(self.get_object)()
+        context = await self.aget_context_data(**kwargs)
+        return TemplateResponse(request, self.template_name, context)
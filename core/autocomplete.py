@@ -0,0 +1,376 @@
+# core/autocomplete.py
+"""
+ძებნის typeahead: პროცესის შიგნით prefix ინდექსი (პროდუქტის სახელები,
+კატეგორიები, ფერები), ბაზის გარეშე პასუხისთვის.
+
+- ინდექსი უცვლელი snapshot-ია: ყოველი ჩანაწერი (Suggestion) პოპულარობით
+  დალაგებულ სიაშია და მისი ნომერი რანგიცაა; გასაღებები — ნორმალიზებული
+  სახელის ყოველი სიტყვიდან დაწყებული სუფიქსი ("leather jacket", "jacket"),
+  უნიკალური და დალაგებული, bisect-ით. 1-3 ასოიან prefix-ებს top-N წინასწარ აქვს
+  დათვლილი — მოკლე prefix-ზე დიაპაზონის სკანი ძვირი იქნებოდა.
+- აიგება პროცესის სტარტზე ფონურ thread-ში (warm_up(), config/wsgi.py /
+  asgi.py); lookup-ი მანამდე ცარიელ სიას აბრუნებს.
+- განახლება: lookup-ი CHECK_INTERVAL-ში ერთხელ ადარებს suggestions და
+  categories თაობებს (საერთო ქეში, ბაზა არა). suggestions მხოლოდ მაშინ
+  იზრდება, როცა პროდუქტის სახელი / slug / ფერი / კატეგორია იცვლება ან
+  პროდუქტი იშლება (SuggestionChange ჟურნალი, core/signals.py) — მარაგის და
+  ფოტოების ცვლილება ინდექსს არ ეხება. შეცვლისას ფონურად იკითხება მხოლოდ
+  ჟურნალის ახალი სტრიქონები: შეცვლილი პროდუქტები პატარა delta ინდექსში
+  გადადის, ძირითად snapshot-ში მათი (და წაშლილების) ჩანაწერები იმალება.
+  სრული აგება: კატეგორიის ცვლილებისას, delta-ს PATCH_LIMIT-ზე გაზრდისას და
+  FULL_REBUILD_INTERVAL-ში ერთხელ (პოპულარობა — გაყიდული ერთეულები).
+- მეხსიერება: AUTOCOMPLETE_MAX_BYTES — ნაკლებად პოპულარული ჩანაწერები,
+  რომლებიც ბიუჯეტში აღარ ეტევა, ინდექსში არ შედის.
+"""
+import bisect
+import heapq
+import itertools
+import logging
+import re
+import sys
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Sum
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from .caching import CATEGORIES, SUGGESTIONS, bump_on_commit, get_generations
+from .models import Category, Product, SuggestionChange
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 8
+# ამ სიგრძემდე prefix-ებს top-N წინასწარ აქვს
+SHORT_PREFIX = 3
+# გრძელ prefix-ზე მაქსიმუმ ამდენი (უნიკალური) გასაღები გადაიხედება
+SCAN_LIMIT = 2000
+CHECK_INTERVAL = 5
+FULL_REBUILD_INTERVAL = 60 * 60
+# ამდენ შეცვლილ/წაშლილ პროდუქტზე მეტი — სრული აგება
+PATCH_LIMIT = 2000
+# ჟურნალის ათვლა ცოტა უკან — commit-ის დაგვიანება (ხელახლა წაკითხვა უვნებელია)
+CHANGE_SKEW = timedelta(seconds=5)
+# სრული აგების შემდეგ ჟურნალი აღარ სჭირდება — ჩამორჩენილი worker-ების მარაგით
+CHANGE_TTL = timedelta(seconds=FULL_REBUILD_INTERVAL * 2)
+# tuple/slot-ების სავარაუდო ხარჯი ჩანაწერზე და გასაღებზე (სტრიქონების გარდა)
+ENTRY_OVERHEAD = 120
+KEY_OVERHEAD = 24
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text):
+    return " ".join(_TERM_RE.findall((text or "").lower()))
+
+
+def suffixes(label):
+    """"leather jacket" -> ["leather jacket", "jacket"]"""
+    words = normalize(label).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class Suggestion:
+    __slots__ = ("kind", "label", "url", "score", "product_id")
+
+    def __init__(self, kind, label, url, score, product_id=None):
+        self.kind = kind
+        self.label = label
+        self.url = url
+        self.score = score
+        self.product_id = product_id
+
+    def order(self):
+        """ინდექსის რიგი: პოპულარობა, შემდეგ ტიპი და სახელი."""
+        return (-self.score, self.kind, self.label)
+
+    def as_dict(self):
+        return {"kind": self.kind, "label": self.label, "url": self.url}
+
+
+class PrefixIndex:
+    """
+    უცვლელი snapshot; products — {pk: (name, slug, color, category_id, popularity)}.
+    groups=False — მხოლოდ პროდუქტები (delta ინდექსი, PatchedIndex).
+    """
+
+    def __init__(self, products, categories, max_bytes, groups=True):
+        self.products = products
+        self.categories = categories
+        self.groups = groups
+        self.suggestions = []
+        self.keys = []
+        self.ids = []
+        self.short = {}
+        self.bytes = 0
+        self.dropped = 0
+        self._build(max_bytes)
+
+    def _candidates(self):
+        cat_score, color_score = {}, {}
+        for name, slug, color, category_id, popularity in self.products.values():
+            # კატეგორია/ფერი = მისი პროდუქტების გაყიდვები + პროდუქტების რაოდენობა
+            cat_score[category_id] = cat_score.get(category_id, 0) + popularity + 1
+            if color:
+                key = color.strip().lower()
+                label, score = color_score.get(key, (color.strip(), 0))
+                color_score[key] = (label, score + popularity + 1)
+
+        # reverse() ერთხელ — 100k პროდუქტზე ცალ-ცალკე წამებს ჭამდა
+        category_url = reverse("core:catalog_category", args=["-"])[:-2]
+        product_url = reverse("core:product_detail", args=["-"])[:-2]
+        color_url = reverse("core:catalog_all") + "?"
+        if self.groups:
+            yield from (
+                Suggestion("category", name, f"{category_url}{slug}/", cat_score.get(pk, 0))
+                for pk, (name, slug) in self.categories.items()
+            )
+            yield from (
+                Suggestion("color", label, color_url + urlencode({"color": key}), score)
+                for key, (label, score) in color_score.items()
+            )
+        yield from (
+            Suggestion("product", name, f"{product_url}{slug}/", popularity, pk)
+            for pk, (name, slug, _color, _category_id, popularity) in self.products.items()
+        )
+
+    def _build(self, max_bytes):
+        # ჯერ ყველაზე პოპულარულები — ბიუჯეტი რომ ამოიწუროს, ბოლოები იკარგება
+        candidates = sorted(self._candidates(), key=Suggestion.order)
+        pairs = []
+        for suggestion in candidates:
+            keys = suffixes(suggestion.label)
+            if not keys:
+                continue
+            cost = (
+                ENTRY_OVERHEAD + sys.getsizeof(suggestion.label) + sys.getsizeof(suggestion.url)
+                + sum(KEY_OVERHEAD + sys.getsizeof(k) for k in keys)
+            )
+            if self.bytes + cost > max_bytes:
+                self.dropped += 1
+                continue
+            self.bytes += cost
+            rank = len(self.suggestions)
+            self.suggestions.append(suggestion)
+            pairs.extend((key, rank) for key in keys)
+
+        # rank-ის ზრდადობით -> თითო მოკლე prefix-ის სია თავისთავად top-N-ია
+        for key, rank in pairs:
+            for n in range(1, min(SHORT_PREFIX, len(key)) + 1):
+                top = self.short.setdefault(key[:n], [])
+                if len(top) < MAX_RESULTS and (not top or top[-1] != rank):
+                    top.append(rank)
+        # ერთნაირი გასაღები (მაგ. "wool" ათასობით პროდუქტში) ერთხელ, მისი top-N rank-ით
+        pairs.sort()
+        for key, rank in pairs:
+            if self.keys and self.keys[-1] == key:
+                if len(self.ids[-1]) < MAX_RESULTS:
+                    self.ids[-1].append(rank)
+            else:
+                self.keys.append(key)
+                self.ids.append([rank])
+
+    def lookup(self, text, limit=MAX_RESULTS, hidden=frozenset()):
+        """hidden — პროდუქტების id-ები, რომლებიც გამოტოვდება (PatchedIndex)."""
+        q = normalize(text)
+        if not q:
+            return []
+        if len(q) <= SHORT_PREFIX:
+            # წინასწარ დათვლილი top-N — დამალულების გამო შეიძლება ნაკლები დაბრუნდეს
+            ranks = self.short.get(q, ())
+        else:
+            found = set()
+            start = bisect.bisect_left(self.keys, q)
+            for i in range(start, min(start + SCAN_LIMIT, len(self.keys))):
+                if not self.keys[i].startswith(q):
+                    break
+                found.update(self.ids[i])
+            ranks = heapq.nsmallest(limit + len(hidden), found)
+        suggestions = (self.suggestions[r] for r in ranks)
+        if hidden:
+            suggestions = (s for s in suggestions if s.product_id not in hidden)
+        return list(itertools.islice(suggestions, limit))
+
+
+class PatchedIndex:
+    """
+    ძირითადი snapshot + ჟურნალიდან შეცვლილი პროდუქტები: ძველი ჩანაწერები
+    იმალება, ახლები პატარა delta ინდექსიდან მოდის; შედეგები ინდექსის რიგით
+    ერთიანდება. products — შეცვლილები, removed — წაშლილების id-ები.
+    """
+
+    def __init__(self, base, products, removed, max_bytes):
+        self.base = base
+        self.products = products
+        self.removed = removed
+        self.hidden = frozenset(removed | products.keys())
+        self.delta = PrefixIndex(products, {}, max_bytes, groups=False)
+
+    def __len__(self):
+        return len(self.hidden)
+
+    def lookup(self, text, limit=MAX_RESULTS):
+        found = self.base.lookup(text, limit, hidden=self.hidden) + self.delta.lookup(text, limit)
+        return heapq.nsmallest(limit, found, key=Suggestion.order)
+
+
+# -----------------------------
+# DB-დან ჩატვირთვა
+# -----------------------------
+def load_popularity(product_ids=None):
+    """{product_id: გაყიდული ერთეულები} გაუქმებული შეკვეთების გარეშე."""
+    from orders.models import OrderItem
+
+    qs = OrderItem.objects.exclude(order__status="canceled")
+    if product_ids is not None:
+        qs = qs.filter(product_id__in=product_ids)
+    return dict(qs.values("product_id").annotate(n=Sum("quantity")).values_list("product_id", "n"))
+
+
+def load_products(qs, popularity):
+    return {
+        pk: (name, slug, color, category_id, popularity.get(pk, 0))
+        for pk, name, slug, color, category_id in qs.values_list("pk", "name", "slug", "color", "category_id")
+    }
+
+
+def load_categories():
+    return {pk: (name, slug) for pk, name, slug in Category.objects.values_list("pk", "name", "slug")}
+
+
+def record_change(product_id, deleted=False):
+    """core/signals.py-დან: ჟურნალის სტრიქონი იმავე ტრანზაქციაში, თაობა — commit-ზე."""
+    SuggestionChange.objects.create(product_id=product_id, deleted=deleted)
+    bump_on_commit(SUGGESTIONS)
+
+
+class Snapshot:
+    """worker-ის მიმდინარე ინდექსი და ის, რის მიხედვითაც აიგო."""
+
+    def __init__(self, index, generations, built_at, popular_at):
+        self.index = index
+        self.generations = generations
+        self.built_at = built_at
+        self.popular_at = popular_at
+
+    def lookup(self, text, limit=MAX_RESULTS):
+        return self.index.lookup(text, limit)
+
+
+def build_index():
+    """სრული აგება -> PrefixIndex; ჟურნალის ძველი სტრიქონები იშლება."""
+    now = timezone.now()
+    SuggestionChange.objects.filter(created_at__lt=now - CHANGE_TTL).delete()
+    products = load_products(Product.objects.all(), load_popularity())
+    return PrefixIndex(products, load_categories(), settings.AUTOCOMPLETE_MAX_BYTES)
+
+
+def build_snapshot():
+    generations = get_generations(SUGGESTIONS, CATEGORIES)
+    now = timezone.now()
+    return Snapshot(build_index(), generations, now, time.monotonic())
+
+
+def refresh_snapshot(old):
+    """
+    მხოლოდ ჟურნალის ახალი სტრიქონები: შეცვლილები ხელახლა იტვირთება pk-ით,
+    წაშლილები იმალება. popularity ძველი რჩება (ახლები — მიმდინარით).
+    """
+    generations = get_generations(SUGGESTIONS, CATEGORIES)
+    now = timezone.now()
+    base, products, removed = old.index, {}, set()
+    if isinstance(base, PatchedIndex):
+        base, products, removed = base.base, dict(base.products), set(base.removed)
+
+    changes = SuggestionChange.objects.filter(created_at__gte=old.built_at - CHANGE_SKEW)
+    deleted, changed = set(), set()
+    for product_id, is_deleted in changes.values_list("product_id", "deleted"):
+        (deleted if is_deleted else changed).add(product_id)
+    changed -= deleted
+    fresh = load_products(Product.objects.filter(pk__in=changed), load_popularity(changed)) if changed else {}
+    # ჟურნალში შეცვლილი, მაგრამ უკვე აღარ არსებობს — tombstone ჯერ არ ჩანს
+    removed |= deleted | (changed - fresh.keys())
+    removed -= fresh.keys()
+    products.update(fresh)
+    for pk in removed:
+        products.pop(pk, None)
+    index = PatchedIndex(base, products, removed, settings.AUTOCOMPLETE_MAX_BYTES)
+    return Snapshot(index, generations, now, old.popular_at)
+
+
+# -----------------------------
+# პროცესის ინდექსი
+# -----------------------------
+class IndexHolder:
+    """მიმდინარე snapshot + ფონური (single-flight) აგება/განახლება."""
+
+    def __init__(self):
+        self.snapshot = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        self._busy = False
+
+    def get(self):
+        snapshot = self.snapshot
+        now = time.monotonic()
+        if snapshot is None:
+            self._spawn()
+        elif now - self.checked_at > CHECK_INTERVAL:
+            self.checked_at = now
+            if now - snapshot.popular_at > FULL_REBUILD_INTERVAL or (
+                get_generations(SUGGESTIONS, CATEGORIES) != snapshot.generations
+            ):
+                self._spawn()
+        return snapshot
+
+    def _spawn(self):
+        with self._lock:
+            if self._busy:
+                return
+            self._busy = True
+        threading.Thread(target=self._run, name="autocomplete-index", daemon=True).start()
+
+    def _run(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("autocomplete index build failed")
+        finally:
+            # thread-ის საკუთარი კავშირი — thread-თან ერთად უნდა დაიხუროს
+            connections.close_all()
+            with self._lock:
+                self._busy = False
+
+    def rebuild(self):
+        """სინქრონულად (bench / shell / ტესტები); ჩვეულებრივ _spawn-იდან."""
+        old = self.snapshot
+        if (
+            old is None
+            or time.monotonic() - old.popular_at > FULL_REBUILD_INTERVAL
+            or get_generations(CATEGORIES)[CATEGORIES] != old.generations[CATEGORIES]
+            or (isinstance(old.index, PatchedIndex) and len(old.index) > PATCH_LIMIT)
+        ):
+            self.snapshot = build_snapshot()
+        else:
+            self.snapshot = refresh_snapshot(old)
+        self.checked_at = time.monotonic()
+        return self.snapshot
+
+
+holder = IndexHolder()
+
+
+def warm_up():
+    """პროცესის სტარტზე: ინდექსის აგება ფონურად."""
+    holder.get()
+
+
+def suggest(text, limit=MAX_RESULTS):
+    snapshot = holder.get()
+    if snapshot is None:
+        return []
+    return snapshot.lookup(text, min(limit, MAX_RESULTS))
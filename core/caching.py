@@ -0,0 +1,274 @@
+# core/caching.py
+"""
+ქეშის ფენა.
+
+1) "თაობის" მრიცხველები ზუსტი ინვალიდაციისთვის: ყოველ ქეშირებულ მნიშვნელობას
+   გასაღებში მიყვება შესაბამისი მრიცხველი (catalog / categories / sizes /
+   product:<id>). ცვლილებისას მრიცხველი იზრდება (core/signals.py), ძველი
+   გასაღებები აღარავის სჭირდება და TTL-ით ქრება — ამიტომ TTL შეიძლება დიდი იყოს.
+
+2) ორსაფეხურიანი ქეში (`tiered`): პროცესის შიგნით შეზღუდული LRU, მის უკან
+   საერთო backend (settings.CACHES["shared"]), რომელსაც ყველა gunicorn worker
+   ხედავს. stale-while-revalidate + single-flight: ვადაგასულ მნიშვნელობას
+   ერთი მოთხოვნა ითვლის თავიდან, დანარჩენები ძველს აბრუნებენ. TTL-ებს
+   jitter აქვს, რომ ერთდროულად ჩაწერილი გასაღებები ერთად არ გაქრეს.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+CATALOG = "catalog"
+CATEGORIES = "categories"
+SIZES = "sizes"
+PRODUCT = "product"
+# გაყიდვები (core/popularity.py) — "popular" სორტი და მთავარი გვერდის featured
+POPULARITY = "popularity"
+# typeahead-ის ჟურნალი (core/autocomplete.py) — მარაგის/ფოტოების ცვლილებაზე არ იზრდება
+SUGGESTIONS = "suggestions"
+
+
+def shared_cache():
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+def _gen_key(name, obj_id=None):
+    return f"core:gen:{name}" if obj_id is None else f"core:gen:{name}:{obj_id}"
+
+
+def _initial():
+    # მრიცხველი ქეშიდან თუ გაქრა, ახალი ათვლა 1-დან ძველ გასაღებს დაემთხვეოდა;
+    # მილიწამები ყოველთვის წინ მიდის.
+    return int(time.time() * 1000)
+
+
+def get_generation(name, obj_id=None):
+    cache = shared_cache()
+    key = _gen_key(name, obj_id)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _initial(), None)
+        value = cache.get(key)
+    return value
+
+
+def get_generations(*names):
+    """რამდენიმე მრიცხველი ერთი get_many-ით -> {name: value}."""
+    keys = {name: _gen_key(name) for name in names}
+    found = shared_cache().get_many(keys.values())
+    return {name: found.get(key) or get_generation(name) for name, key in keys.items()}
+
+
+def get_object_generations(name, ids):
+    """ბევრი ობიექტის მრიცხველი (მაგ. product:<id>) ერთი get_many-ით -> {id: value}."""
+    keys = {obj_id: _gen_key(name, obj_id) for obj_id in ids}
+    found = shared_cache().get_many(keys.values())
+    return {obj_id: found.get(key) or get_generation(name, obj_id) for obj_id, key in keys.items()}
+
+
+def bump(name, obj_id=None):
+    cache = shared_cache()
+    key = _gen_key(name, obj_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial(), None)
+
+
+def bump_on_commit(*names, product_ids=()):
+    """
+    commit-ის შემდეგ: თუ ადრე გავზრდით, პარალელური მოთხოვნა ძველ მონაცემს
+    ახალი თაობის გასაღებით ჩაწერს ქეშში.
+    """
+    product_ids = set(product_ids)
+
+    def _bump():
+        for name in names:
+            bump(name)
+        for pk in product_ids:
+            bump(PRODUCT, pk)
+
+    transaction.on_commit(_bump)
+
+
+def versioned_key(base, *names):
+    """მაგ. versioned_key("core:categories", CATEGORIES) -> "core:categories:g1723...\""""
+    gens = get_generations(*names)
+    return base + ":" + ":".join(f"g{gens[n]}" for n in names)
+
+
+# -----------------------------
+# Two-tier cache
+# -----------------------------
+def jittered(ttl, spread=0.1):
+    return max(1, int(ttl * random.uniform(1 - spread, 1 + spread)))
+
+
+class LocalLRU:
+    """პროცესის შიგნით, ზომით შეზღუდული; ჩანაწერი = (value, fresh_until, expires_at)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TwoTierCache:
+    """
+    shared backend-ში ინახება (value, fresh_until); backend-ის timeout = ttl + stale_ttl,
+    ანუ fresh_until-ის შემდეგ კიდევ stale_ttl წამი შეიძლება ძველის დაბრუნება.
+    local tier მაქსიმუმ local_ttl წამს ინახავს, რომ სხვა worker-ის ჩაწერა დაინახოს.
+    """
+
+    def __init__(self, local_maxsize=2048, local_ttl=30, lock_ttl=30, wait_timeout=2.0):
+        self.local = LocalLRU(local_maxsize)
+        self.local_ttl = local_ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+
+    @property
+    def shared(self):
+        return shared_cache()
+
+    def _remember(self, key, value, fresh_until, now):
+        self.local.set(key, (value, fresh_until, min(fresh_until, now + self.local_ttl)))
+
+    def _store(self, key, value, ttl, stale_ttl):
+        now = time.time()
+        ttl = jittered(ttl)
+        fresh_until = now + ttl
+        self.shared.set(key, (value, fresh_until), ttl + stale_ttl)
+        self._remember(key, value, fresh_until, now)
+
+    def get(self, key, default=None):
+        now = time.time()
+        entry = self.local.get(key, now)
+        if entry is not None:
+            return entry[0]
+        stored = self.shared.get(key)
+        if stored is None:
+            return default
+        value, fresh_until = stored
+        self._remember(key, value, fresh_until, now)
+        return value
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        self._store(key, value, ttl, stale_ttl)
+
+    def get_many(self, keys):
+        now = time.time()
+        found, missing = {}, []
+        for key in keys:
+            entry = self.local.get(key, now)
+            if entry is not None:
+                found[key] = entry[0]
+            else:
+                missing.append(key)
+        if missing:
+            for key, (value, fresh_until) in self.shared.get_many(missing).items():
+                self._remember(key, value, fresh_until, now)
+                found[key] = value
+        return found
+
+    def set_many(self, mapping, ttl, stale_ttl=60):
+        now = time.time()
+        payload = {}
+        for key, value in mapping.items():
+            fresh_until = now + jittered(ttl)
+            payload[key] = (value, fresh_until)
+            self._remember(key, value, fresh_until, now)
+        # jitter-ის ზედა ზღვარი + stale ფანჯარა
+        self.shared.set_many(payload, int(ttl * 1.1) + stale_ttl)
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def get_or_set(self, key, producer, ttl, stale_ttl=60):
+        """
+        - ახალი მნიშვნელობა (local ან shared) -> დაბრუნება;
+        - ვადაგასული: lock-ის მფლობელი ითვლის თავიდან, სხვები ძველს აბრუნებენ;
+        - საერთოდ არ არის: lock-ის მფლობელი ითვლის, სხვები wait_timeout-მდე ელოდებიან.
+        """
+        now = time.time()
+        entry = self.local.get(key, now)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        stored = self.shared.get(key)
+        if stored is not None:
+            value, fresh_until = stored
+            if fresh_until > now:
+                self._remember(key, value, fresh_until, now)
+                return value
+            if not self._acquire(key):
+                return value  # stale-while-revalidate
+            return self._recompute(key, producer, ttl, stale_ttl)
+
+        if self._acquire(key):
+            # lock შეიძლება წინა მფლობელმა ახლახან გაათავისუფლა — ხელახლა ვამოწმებთ
+            stored = self.shared.get(key)
+            if stored is not None:
+                self.shared.delete(f"{key}:lock")
+                self._remember(key, stored[0], stored[1], now)
+                return stored[0]
+            return self._recompute(key, producer, ttl, stale_ttl)
+
+        # სხვა worker უკვე ითვლის — ცოტა ხანს ველოდებით მის შედეგს
+        deadline = now + self.wait_timeout
+        while time.time() < deadline:
+            time.sleep(0.05)
+            stored = self.shared.get(key)
+            if stored is not None:
+                self._remember(key, stored[0], stored[1], time.time())
+                return stored[0]
+        value = producer()
+        self._store(key, value, ttl, stale_ttl)
+        return value
+
+    def _acquire(self, key):
+        return self.shared.add(f"{key}:lock", 1, self.lock_ttl)
+
+    def _recompute(self, key, producer, ttl, stale_ttl):
+        try:
+            value = producer()
+            self._store(key, value, ttl, stale_ttl)
+            return value
+        finally:
+            self.shared.delete(f"{key}:lock")
+
+
+tiered = TwoTierCache(
+    local_maxsize=settings.LOCAL_CACHE_MAX_ENTRIES,
+    local_ttl=settings.LOCAL_CACHE_TTL,
+)
@@ -0,0 +1,82 @@
+# core/cards.py
+"""
+ProductCard read model-ის სინქრონიზაცია.
+
+ერთი INSERT ... SELECT ... ON CONFLICT აგროვებს ყველაფერს ბაზაში (კატეგორია,
+მარაგი, ზომები, სურათი) — Python-ში არაფერი იტვირთება.
+"""
+from django.db import connection, transaction
+
+CARD_COLUMNS = (
+    "product_id, name, slug, category_id, category_slug, color, price, "
+    "main_image, main_image_width, main_image_height, main_image_renditions, "
+    "in_stock, total_stock, sizes, size_keys, created_at, updated_at, popularity"
+)
+
+CARD_SELECT = """
+SELECT p.id, p.name, p.slug, p.category_id, c.slug, p.color, p.price,
+       COALESCE(img.image, ''), img.width, img.height, COALESCE(img.renditions, '{}'::jsonb),
+       COALESCE(st.total, 0) > 0, COALESCE(st.total, 0),
+       COALESCE(st.sizes, '{}'), COALESCE(st.size_keys, '{}'),
+       p.created_at, p.updated_at, p.popularity
+  FROM core_product p
+  JOIN core_category c ON c.id = p.category_id
+  LEFT JOIN LATERAL (
+      (SELECT p.main_image AS image, p.main_image_width AS width,
+              p.main_image_height AS height, p.main_image_renditions AS renditions
+        WHERE p.main_image <> '')
+      UNION ALL
+      (SELECT pi.image, pi.width, pi.height, pi.renditions
+         FROM core_productimage pi
+        WHERE pi.product_id = p.id
+        ORDER BY pi.id LIMIT 1)
+      LIMIT 1
+  ) img ON true
+  LEFT JOIN LATERAL (
+      SELECT SUM(ps.stock) AS total,
+             array_agg(s.name ORDER BY s.name) FILTER (WHERE ps.stock > 0) AS sizes,
+             array_agg(lower(s.name) ORDER BY s.name) FILTER (WHERE ps.stock > 0) AS size_keys
+        FROM core_productsize ps
+        JOIN core_size s ON s.id = ps.size_id
+       WHERE ps.product_id = p.id
+  ) st ON true
+"""
+
+CARD_UPSERT = f"""
+INSERT INTO core_productcard ({CARD_COLUMNS})
+{CARD_SELECT}
+ WHERE {{where}}
+ON CONFLICT (product_id) DO UPDATE SET
+    name = EXCLUDED.name, slug = EXCLUDED.slug,
+    category_id = EXCLUDED.category_id, category_slug = EXCLUDED.category_slug,
+    color = EXCLUDED.color, price = EXCLUDED.price, main_image = EXCLUDED.main_image,
+    main_image_width = EXCLUDED.main_image_width, main_image_height = EXCLUDED.main_image_height,
+    main_image_renditions = EXCLUDED.main_image_renditions,
+    in_stock = EXCLUDED.in_stock, total_stock = EXCLUDED.total_stock,
+    sizes = EXCLUDED.sizes, size_keys = EXCLUDED.size_keys,
+    created_at = EXCLUDED.created_at, updated_at = EXCLUDED.updated_at,
+    popularity = EXCLUDED.popularity
+"""
+
+
+def refresh_cards(product_ids):
+    ids = sorted({int(pk) for pk in product_ids if pk is not None})
+    if not ids:
+        return
+    with connection.cursor() as cur:
+        cur.execute(CARD_UPSERT.replace("{where}", "p.id = ANY(%s)"), [ids])
+
+
+def rebuild_all_cards():
+    with connection.cursor() as cur:
+        cur.execute(CARD_UPSERT.replace("{where}", "true"))
+
+
+def schedule_refresh(product_ids):
+    """
+    commit-ის შემდეგ: admin inline-ები ერთ ტრანზაქციაში ბევრ ProductSize-ს ინახავს,
+    ხოლო პროდუქტის წაშლისას ProductSize-ის post_delete პროდუქტის წაშლამდე მოდის —
+    commit-ის შემდეგ წაშლილი პროდუქტი SELECT-ში აღარ მოხვდება.
+    """
+    ids = set(product_ids)
+    transaction.on_commit(lambda: refresh_cards(ids))
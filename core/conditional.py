@@ -0,0 +1,96 @@
+# core/conditional.py
+"""
+Conditional GET (ETag / If-None-Match) გვერდებისთვის.
+
+ვალიდატორი ითვლება მძიმე query-ებამდე და render-მდე: გვერდის მონაცემების
+ვერსია (Product.updated_at, თაობის მრიცხველები) + ყველაფერი, რაც base.html-ში
+პერსონალურია (მომხმარებელი, კალათის მრიცხველი, csrf cookie, messages) +
+HTMX header-ები, რადგან ერთ URL-ზე სხვადასხვა ფრაგმენტი ბრუნდება.
+"""
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+VARY_HEADERS = ("HX-Request", "HX-Boosted", "Cookie")
+
+
+def personal_parts(request):
+    """base.html-ის პერსონალური ნაწილი; None, თუ გვერდი ერთჯერად მონაცემს აჩვენებს."""
+    if len(get_messages(request)):
+        return None  # messages render-ისას იხარჯება — 304 მათ დაკარგავდა
+    user = request.user
+    cart = getattr(request, "cart", None)
+    return [
+        user.pk if user.is_authenticated else 0,
+        user.first_name if user.is_authenticated else "",
+        cart.total_items if cart is not None else 0,
+        # {% csrf_token %} ფორმებში — cookie-ს შეცვლისას ძველი გვერდი აღარ ვარგა
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        request.headers.get("HX-Request", ""),
+        request.headers.get("HX-Boosted", ""),
+    ]
+
+
+def make_etag(parts):
+    raw = json.dumps(parts, default=str, separators=(",", ":"))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    get_validator_parts() -> list იაფი მნიშვნელობების, ან None (conditional GET-ის გარეშე).
+    ემთხვევა If-None-Match-ს -> 304 view-ის გაშვების გარეშე.
+    """
+
+    def get_validator_parts(self):
+        return []
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, not_modified = self._precondition(request)
+        if not_modified is not None:
+            return self._finalize(not_modified)
+        return self._complete(super().dispatch(request, *args, **kwargs), etag)
+
+    def _precondition(self, request):
+        """-> (etag ან None, 304 პასუხი ან None)"""
+        parts = self.get_validator_parts()
+        personal = personal_parts(request) if parts is not None else None
+        if personal is None:
+            return None, None
+        etag = make_etag([type(self).__name__, *parts, *personal])
+        return etag, get_conditional_response(request, etag=etag)
+
+    def _complete(self, response, etag):
+        if etag and response.status_code == 200 and not response.has_header("ETag"):
+            response.headers["ETag"] = etag
+        return self._finalize(response)
+
+    def _finalize(self, response):
+        patch_vary_headers(response, VARY_HEADERS)
+        # ბრაუზერმა შეინახოს, მაგრამ ყოველ ჯერზე გადაამოწმოს (If-None-Match)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    იგივე async view-ებისთვის (core/async_views.py): ვალიდატორი და personal_parts
+    (სესია, მომხმარებელი, კალათა) sync-ია — ერთი sync_to_async გადასვლით.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await super(ConditionalGetMixin, self).dispatch(request, *args, **kwargs)
+
+        etag, not_modified = await sync_to_async(self._precondition)(request)
+        if not_modified is not None:
+            return self._finalize(not_modified)
+        return self._complete(await super(ConditionalGetMixin, self).dispatch(request, *args, **kwargs), etag)
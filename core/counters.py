@@ -0,0 +1,153 @@
+# core/counters.py
+"""
+Write-behind მთვლელები: პროდუქტის ნახვები და ძებნის impression-ები.
+
+ყოველ ნახვაზე Product-ის UPDATE ერთსა და იმავე სტრიქონს ბლოკავდა და
+ცხრილს dead tuple-ებით ავსებდა. ამის ნაცვლად სამი საფეხური:
+
+1) მოთხოვნა: პროცესის შიგნით Counter-ის გაზრდა (ბაზა/ქეში არა).
+2) PUSH_INTERVAL-ში ერთხელ (შემდეგი მოთხოვნიდან, ან პროცესის გამორთვისას)
+   მთელი buffer ერთ CounterBatch სტრიქონად იწერება — ერთი INSERT, სხვა
+   worker-ებთან საერთო სტრიქონის გარეშე. ქეშის incr (slot-ის ნომერი)
+   FileBasedCache-ზე ატომარული არ იყო და blob-ები ერთმანეთს გადაეწერებოდა.
+3) flush_counters (cron / jobs): ერთ ტრანზაქციაში batch-ები FOR UPDATE SKIP
+   LOCKED-ით, ერთი multi-row INSERT ... ON CONFLICT DO UPDATE ProductDailyStats-ში
+   და batch-ების წაშლა — ან ყველაფერი, ან არაფერი.
+
+დანაკარგი: მხოლოდ worker-ის ავარიისას — მისი buffer (მაქს. PUSH_INTERVAL).
+ორჯერ დათვლა არ ხდება: batch-ი upsert-თან ერთად იშლება. პარალელური
+flusher-ები SKIP LOCKED-ით სხვადასხვა batch-ებს იღებენ.
+"""
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import CounterBatch
+
+VIEWS = "views"
+IMPRESSIONS = "impressions"
+
+PUSH_INTERVAL = 10
+# flush_counters --loop-ის ჩვეული ინტერვალი
+FLUSH_INTERVAL = 60
+# ერთ ტრანზაქციაში ამდენი batch-ი — დიდი backlog-ი ნაწილ-ნაწილ
+FLUSH_BATCHES = 1000
+
+
+class CounterBuffer:
+    """{(kind, product_id, day): n} — პროცესის შიგნით, lock-ით (thread-ები)."""
+
+    def __init__(self, push_interval=PUSH_INTERVAL):
+        self.push_interval = push_interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._pushed_at = time.monotonic()
+
+    def add(self, kind, product_ids):
+        day = timezone.localdate().isoformat()
+        with self._lock:
+            for pk in product_ids:
+                self._counts[(kind, pk, day)] += 1
+            due = time.monotonic() - self._pushed_at >= self.push_interval
+        if due:
+            self.push()
+
+    def push(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pushed_at = time.monotonic()
+        if not counts:
+            return
+        # სიების სია — tuple გასაღებები JSON-ში არ ინახება.
+        # savepoint: ATOMIC_REQUESTS-ის ტრანზაქცია ჩავარდნილმა INSERT-მა არ უნდა გააფუჭოს
+        try:
+            with transaction.atomic():
+                CounterBatch.objects.create(counts=[[k, pk, day, n] for (k, pk, day), n in counts.items()])
+        except DatabaseError:
+            pass  # ბაზა მიუწვდომელია — მთვლელები იკარგება, მოთხოვნა არა
+
+
+buffer = CounterBuffer()
+atexit.register(buffer.push)
+
+
+def record_view(product_id):
+    buffer.add(VIEWS, (product_id,))
+
+
+def record_impressions(product_ids):
+    buffer.add(IMPRESSIONS, product_ids)
+
+
+# -----------------------------
+# Flush
+# -----------------------------
+UPSERT_SQL = """
+INSERT INTO core_productdailystats (product_id, day, views, impressions)
+SELECT u.product_id, u.day, u.views, u.impressions
+  FROM unnest(%s::bigint[], %s::date[], %s::int[], %s::int[]) AS u(product_id, day, views, impressions)
+  JOIN core_product p ON p.id = u.product_id
+ON CONFLICT (product_id, day) DO UPDATE SET
+    views = core_productdailystats.views + EXCLUDED.views,
+    impressions = core_productdailystats.impressions + EXCLUDED.impressions
+"""
+
+
+def collect(batches):
+    """[[kind, product_id, day, n], ...]-ების სია -> Counter."""
+    totals = Counter()
+    for counts in batches:
+        for kind, pk, day, count in counts:
+            totals[(kind, pk, day)] += count
+    return totals
+
+
+def upsert(totals):
+    rows = {}
+    for (kind, pk, day), count in totals.items():
+        row = rows.setdefault((pk, day), [0, 0])
+        row[0 if kind == VIEWS else 1] += count
+    if not rows:
+        return 0
+    keys = sorted(rows)  # ერთნაირი რიგი — პარალელურ upsert-ებს deadlock არ ემართებათ
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(
+            UPSERT_SQL,
+            [
+                [pk for pk, _ in keys],
+                [day for _, day in keys],
+                [rows[k][0] for k in keys],
+                [rows[k][1] for k in keys],
+            ],
+        )
+        # წაშლილი პროდუქტების სტრიქონებს JOIN ტოვებს
+        return cur.rowcount
+
+
+def flush_batch():
+    """ერთი ტრანზაქცია: batch-ები -> upsert -> წაშლა. -> (batch-ები, სტრიქონები)."""
+    with transaction.atomic():
+        batches = list(
+            CounterBatch.objects.select_for_update(skip_locked=True)
+            .order_by("pk")
+            .values_list("pk", "counts")[:FLUSH_BATCHES]
+        )
+        if not batches:
+            return 0, 0
+        written = upsert(collect(counts for _, counts in batches))
+        CounterBatch.objects.filter(pk__in=[pk for pk, _ in batches]).delete()
+    return len(batches), written
+
+
+def flush_counters():
+    """CounterBatch-ები -> ProductDailyStats; აბრუნებს ჩაწერილი (product, day) სტრიქონების რაოდენობას."""
+    total = 0
+    while True:
+        batches, written = flush_batch()
+        total += written
+        if batches < FLUSH_BATCHES:
+            return total
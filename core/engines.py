@@ -0,0 +1,18 @@
+# core/engines.py
+"""
+გვერდების თანდათანობითი გადაყვანა Jinja2-ზე: settings.JINJA2_VIEWS-ში
+ჩამოთვლილი view-ები Jinja2 ძრავით რენდერდება, დანარჩენი — Django-ით.
+
+    return TemplateResponse(request, template, context, using=engine_for("catalog"))
+"""
+from django.conf import settings
+
+# view-ები, რომელთა შაბლონებს Jinja2 ვერსიაც აქვს
+JINJA2_READY = {"index", "catalog", "search", "cart_modal"}
+
+
+def engine_for(view_name):
+    """"jinja2" ან None (= პირველი ძრავა, Django)."""
+    if view_name in JINJA2_READY and view_name in settings.JINJA2_VIEWS:
+        return "jinja2"
+    return None
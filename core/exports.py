@@ -0,0 +1,204 @@
+# core/exports.py
+"""
+sitemap.xml და shopping feed (Google Merchant RSS 2.0) — წინასწარ აგებულ ფაილებად.
+
+პროდუქტები pk-ის დიაპაზონებით იყოფა shard-ებად (SHARD_SIZE); თითო shard —
+sitemaps/products-NNNN.xml.gz და feeds/products-NNNN.xml.gz. სტრიქონები
+.iterator(chunk_size=...)-ით პირდაპირ gzip-ში იწერება — მთელი კატალოგი
+მეხსიერებაში არასდროს დგას. ჯერ დროებითი ფაილი, შემდეგ os.replace, ანუ
+მკითხველი ნახევრად ჩაწერილ ფაილს ვერ ხედავს.
+
+ინკრემენტულობა: ერთი GROUP BY query თითო shard-ის ანაბეჭდს ითვლის —
+(პროდუქტების რაოდენობა, max(updated_at), მარაგიანი პროდუქტების pk-ების ჯამი)
+— და manifest.json-ში შენახულს ადარებს. თავიდან იწერება მხოლოდ shard-ები,
+სადაც პროდუქტი შეიცვალა, დაემატა ან წაიშალა, ან მარაგი გაუჩნდა/გაუქრა
+(ProductSize-ის ცვლილება updated_at-ს არ ეხება). კატეგორიების sitemap და
+sitemap.xml ინდექსი პატარაა — ყოველ ჯერზე.
+
+    python manage.py build_exports [--full]
+    /sitemap.xml, /sitemaps/<file>, /feeds/<file>   (core/views.py: export_file)
+"""
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Count, Exists, F, Max, OuterRef, Q, Sum
+from django.urls import reverse
+
+from .models import Category, Product, ProductSize
+
+# sitemap-ის ლიმიტი 50 000 URL / 50 MB (გაუშლელი)
+SHARD_SIZE = 10_000
+CHUNK_SIZE = 2_000
+# ფორმატის შეცვლისას გაზარდე — ყველა shard თავიდან დაიწერება
+FORMAT_VERSION = 1
+FEED_TITLE = "Modern Shop"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+GOOGLE_NS = "http://base.google.com/ns/1.0"
+
+# XML 1.0-ში დაუშვებელი საკონტროლო სიმბოლოები (აღწერებში ხვდება)
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _text(value):
+    return escape(_CONTROL_RE.sub("", str(value)))
+
+
+def _in_stock():
+    return Exists(ProductSize.objects.filter(product=OuterRef("pk"), stock__gt=0))
+
+
+def shard_name(shard):
+    return f"products-{shard:04d}.xml.gz"
+
+
+def fingerprints(shard_size=SHARD_SIZE):
+    """{shard: [n, max(updated_at), Σ pk მარაგიანების]} — ერთი query მთელ ცხრილზე."""
+    rows = (
+        Product.objects.annotate(shard=F("pk") / shard_size, stocked=_in_stock())
+        .values("shard")
+        .annotate(n=Count("pk"), updated=Max("updated_at"), stocked_pks=Sum("pk", filter=Q(stocked=True)))
+        .order_by()
+    )
+    return {row["shard"]: [row["n"], row["updated"].isoformat(), int(row["stocked_pks"] or 0)] for row in rows}
+
+
+def _write(path, lines, compress=True):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    opener = gzip.open if compress else open
+    try:
+        with opener(tmp, "wt", encoding="utf-8") as fh:
+            fh.writelines(lines)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# -----------------------------
+# XML
+# -----------------------------
+class Exporter:
+    def __init__(self, root, site, currency, shard_size=SHARD_SIZE):
+        self.root = Path(root)
+        self.site = site.rstrip("/")
+        self.currency = currency
+        self.shard_size = shard_size
+        # reverse() ერთხელ, არა ყოველ სტრიქონზე
+        self.product_url = self.site + reverse("core:product_detail", args=["-"])[:-2]
+
+    def absolute(self, url):
+        return url if "://" in url else self.site + url
+
+    def shard_rows(self, shard, *fields):
+        start = shard * self.shard_size
+        return (
+            Product.objects.filter(pk__gte=start, pk__lt=start + self.shard_size)
+            .annotate(stocked=_in_stock())
+            .order_by("pk")
+            .values_list(*fields)
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+
+    def sitemap_lines(self, shard):
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+        for slug, updated_at in self.shard_rows(shard, "slug", "updated_at"):
+            yield (
+                f"<url><loc>{_text(self.product_url + slug)}/</loc>"
+                f"<lastmod>{updated_at.isoformat(timespec='seconds')}</lastmod></url>\n"
+            )
+        yield "</urlset>\n"
+
+    def feed_lines(self, shard):
+        yield (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" xmlns:g="{GOOGLE_NS}"><channel>\n'
+            f"<title>{_text(FEED_TITLE)}</title><link>{_text(self.site)}/</link>\n"
+        )
+        rows = self.shard_rows(
+            shard, "pk", "name", "slug", "description", "color", "price", "main_image", "category__name", "stocked"
+        )
+        for pk, name, slug, description, color, price, image, category, stocked in rows:
+            image_link = (
+                f"<g:image_link>{_text(self.absolute(default_storage.url(image)))}</g:image_link>" if image else ""
+            )
+            yield (
+                f"<item><g:id>{pk}</g:id><g:title>{_text(name)}</g:title>"
+                f"<g:description>{_text(description or name)}</g:description>"
+                f"<g:link>{_text(self.product_url + slug)}/</g:link>{image_link}"
+                f"<g:price>{price} {self.currency}</g:price>"
+                f"<g:availability>{'in_stock' if stocked else 'out_of_stock'}</g:availability>"
+                f"<g:condition>new</g:condition><g:color>{_text(color)}</g:color>"
+                f"<g:product_type>{_text(category)}</g:product_type></item>\n"
+            )
+        yield "</channel></rss>\n"
+
+    def categories_lines(self):
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+        yield f"<url><loc>{_text(self.absolute(reverse('core:index')))}</loc></url>\n"
+        yield f"<url><loc>{_text(self.absolute(reverse('core:catalog_all')))}</loc></url>\n"
+        for slug in Category.objects.order_by("pk").values_list("slug", flat=True).iterator(chunk_size=CHUNK_SIZE):
+            yield f"<url><loc>{_text(self.absolute(reverse('core:catalog_category', args=[slug])))}</loc></url>\n"
+        yield "</urlset>\n"
+
+    def index_lines(self, prints):
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n'
+        categories = self.absolute(reverse("core:sitemap_file", args=["categories.xml.gz"]))
+        yield f"<sitemap><loc>{_text(categories)}</loc></sitemap>\n"
+        for shard, (_n, updated, _stocked) in sorted(prints.items()):
+            loc = self.absolute(reverse("core:sitemap_file", args=[shard_name(shard)]))
+            yield f"<sitemap><loc>{_text(loc)}</loc><lastmod>{updated}</lastmod></sitemap>\n"
+        yield "</sitemapindex>\n"
+
+    # -----------------------------
+    # აგება
+    # -----------------------------
+    def load_manifest(self):
+        try:
+            return json.loads((self.root / "manifest.json").read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def build(self, full=False):
+        """აბრუნებს {"written", "skipped", "removed"} — shard-ების რაოდენობებს."""
+        manifest = self.load_manifest()
+        params = [FORMAT_VERSION, self.shard_size, self.site, self.currency]
+        # ანაბეჭდი json-იდან: გასაღებები სტრიქონებია
+        known = manifest.get("shards", {}) if not full and manifest.get("params") == params else {}
+
+        prints = fingerprints(self.shard_size)
+        stats = {"written": 0, "skipped": 0, "removed": 0}
+        for shard, fingerprint in sorted(prints.items()):
+            if known.get(str(shard)) == fingerprint:
+                stats["skipped"] += 1
+                continue
+            _write(self.root / "sitemaps" / shard_name(shard), self.sitemap_lines(shard))
+            _write(self.root / "feeds" / shard_name(shard), self.feed_lines(shard))
+            stats["written"] += 1
+
+        # ცარიელი დარჩენილი shard-ები (ან shard_size-ის შეცვლის ნარჩენები)
+        alive = {shard_name(shard) for shard in prints}
+        for path in (self.root / "sitemaps").glob("products-*.xml.gz"):
+            if path.name not in alive:
+                path.unlink()
+                (self.root / "feeds" / path.name).unlink(missing_ok=True)
+                stats["removed"] += 1
+
+        _write(self.root / "sitemaps" / "categories.xml.gz", self.categories_lines())
+        _write(self.root / "sitemap.xml", self.index_lines(prints), compress=False)
+        # manifest ბოლოს — შუაში შეწყვეტისას შემდეგი გაშვება დაუმთავრებელს გაიმეორებს
+        _write(
+            self.root / "manifest.json",
+            [json.dumps({"params": params, "shards": {str(k): v for k, v in prints.items()}})],
+            compress=False,
+        )
+        return stats
+
+
+def build_exports(full=False, root=None, shard_size=SHARD_SIZE):
+    exporter = Exporter(root or settings.EXPORTS_ROOT, settings.SITE_URL, settings.FEED_CURRENCY, shard_size)
+    return exporter.build(full=full)
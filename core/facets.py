@@ -0,0 +1,134 @@
+# core/facets.py
+"""
+ფასეტები (category / size / color / price bucket) მიმდინარე ფილტრის შედეგზე.
+
+ყველაფერი ერთ SQL-შია: პროდუქტის ველები GROUPING SETS-ით, ზომები
+(მხოლოდ stock > 0) UNION ALL-ით. ფერი lower()-ით ჯგუფდება, როგორც ფილტრი
+(color__iexact) — "Black" და "black" ერთი ფასეტია. category / color / size
+ფასეტი საკუთარი ფილტრის გარეშე ითვლება (COUNT ... FILTER, იმავე გავლაში).
+თითოეული ფასეტი ცალკე იქეშება FilterSpec-ის გასაღებით (core/filters.py).
+"""
+from dataclasses import replace
+from decimal import Decimal
+
+from django.db import connection
+
+from .caching import CATALOG, get_generation, tiered
+
+# catalog თაობა გასაღებშია — ნებისმიერი ცვლილება მაშინვე აძველებს
+FACETS_TTL = 60 * 60
+FACET_NAMES = ("categories", "sizes", "colors", "prices", "price_range")
+
+# ფასის ზღვრები: [0, 25), [25, 50), ... [500, ∞)
+PRICE_EDGES = (25, 50, 100, 200, 500)
+
+
+def _price_buckets():
+    lows = (0,) + PRICE_EDGES
+    highs = PRICE_EDGES + (None,)
+    return [{"min": lo, "max": hi} for lo, hi in zip(lows, highs)]
+
+
+FACETS_SQL = """
+WITH f AS (
+    SELECT p.id, p.category_id, lower(p.color) AS color, p.color AS label, p.price,
+           width_bucket(p.price, %s::numeric[]) AS bucket,
+           {category_ok} AS category_ok, {color_ok} AS color_ok, {size_ok} AS size_ok
+      FROM core_product p
+     WHERE p.id IN ({ids})
+)
+SELECT GROUPING(category_id, color, bucket), category_id, color, MIN(label), bucket, NULL,
+       COUNT(*) FILTER (WHERE color_ok AND size_ok),
+       COUNT(*) FILTER (WHERE category_ok AND size_ok),
+       COUNT(*) FILTER (WHERE category_ok AND color_ok AND size_ok),
+       MIN(price) FILTER (WHERE category_ok AND color_ok AND size_ok),
+       MAX(price) FILTER (WHERE category_ok AND color_ok AND size_ok)
+  FROM f
+ GROUP BY GROUPING SETS ((category_id), (color), (bucket), ())
+UNION ALL
+SELECT -1, NULL, NULL, NULL, NULL, s.name, NULL, NULL, COUNT(DISTINCT ps.product_id), NULL, NULL
+  FROM core_productsize ps
+  JOIN f ON f.id = ps.product_id
+  JOIN core_size s ON s.id = ps.size_id
+ WHERE ps.stock > 0 AND f.category_ok AND f.color_ok
+ GROUP BY s.name
+"""
+
+# ფასეტის საკუთარი განზომილების პირობა — სხვა ფასეტების რაოდენობებში მონაწილეობს
+CATEGORY_OK = "p.category_id = (SELECT id FROM core_category WHERE slug = %s)"
+COLOR_OK = "lower(p.color) = %s"
+# როგორც FilterSpec.apply(): მხოლოდ მარაგში არსებული ზომა
+SIZE_OK = """EXISTS (
+               SELECT 1 FROM core_productsize sp JOIN core_size sz ON sz.id = sp.size_id
+                WHERE sp.product_id = p.id AND sp.stock > 0 AND lower(sz.name) = %s)"""
+
+
+def _dimension(sql, value):
+    return (sql, [value]) if value else ("true", [])
+
+
+def compute_facets(base, spec, categories=(), sizes=()):
+    """
+    base — listing_queryset() ფილტრების გარეშე (სორტირებას/პაგინაციას არ ვიყენებთ).
+    category / color / size ფასეტი საკუთარ ფილტრს არ ითვალისწინებს (სხვებს — კი),
+    რომ არჩეულის გარდა დანარჩენი ვარიანტებიც ჩანდეს; ფასი — სრული ფილტრით.
+    categories/sizes — სრული სიები, რომ 0-იანი მნიშვნელობებიც ჩანდეს.
+    """
+    relaxed = replace(spec, category="", color="", size="").apply(base)
+    ids_sql, ids_params = (
+        relaxed.order_by().values("pk").query.get_compiler(connection=connection).as_sql()
+    )
+    category_ok, category_params = _dimension(CATEGORY_OK, spec.category)
+    color_ok, color_params = _dimension(COLOR_OK, spec.color)
+    size_ok, size_params = _dimension(SIZE_OK, spec.size)
+    edges = [Decimal(e) for e in PRICE_EDGES]
+    sql = FACETS_SQL.format(ids=ids_sql, category_ok=category_ok, color_ok=color_ok, size_ok=size_ok)
+    params = (edges, *category_params, *color_params, *size_params, *ids_params)
+
+    cat_counts, color_counts, bucket_counts, size_counts = {}, {}, {}, {}
+    price_range = {"lo": None, "hi": None}
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        for g, cat_id, color, label, bucket, size_name, n_category, n_color, count, lo, hi in cur.fetchall():
+            if g == -1:
+                size_counts[size_name] = count
+            # GROUPING bitmask: 1 = bucket აგრეგირებულია, 2 = color, 4 = category
+            elif g == 0b011:
+                cat_counts[cat_id] = n_category
+            elif g == 0b101:
+                # წარწერა — ჯგუფის ერთ-ერთი ორიგინალი ჩანაწერი
+                if n_color:
+                    color_counts[color] = (label, n_color)
+            elif g == 0b110:
+                bucket_counts[bucket] = count
+            elif g == 0b111:
+                price_range = {"lo": lo, "hi": hi}
+
+    buckets = _price_buckets()
+    for i, b in enumerate(buckets):
+        # width_bucket: < 25 -> 0, [25, 50) -> 1, ...
+        b["count"] = bucket_counts.get(i, 0)
+
+    return {
+        "categories": [
+            {"slug": c.slug, "name": c.name, "count": cat_counts.get(c.id, 0)} for c in categories
+        ],
+        "sizes": [{"name": s.name, "count": size_counts.get(s.name, 0)} for s in sizes],
+        "colors": [{"name": label, "count": n} for color, (label, n) in sorted(color_counts.items()) if color],
+        "prices": buckets,
+        "price_range": price_range,
+    }
+
+
+def get_facets(base, spec, categories=(), sizes=()):
+    """ქეშიდან (ერთი get_many); ერთი ფასეტიც რომ აკლდეს — ერთი SQL ყველასთვის."""
+    key = spec.key()
+    gen = get_generation(CATALOG)
+    keys = {name: f"core:facets:{name}:{key}:g{gen}" for name in FACET_NAMES}
+    cached = tiered.get_many(keys.values())
+    if len(cached) == len(keys):
+        return {name: cached[k] for name, k in keys.items()}
+
+    facets = compute_facets(base, spec, categories, sizes)
+    tiered.set_many({keys[name]: facets[name] for name in FACET_NAMES}, FACETS_TTL)
+    return facets
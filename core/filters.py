@@ -0,0 +1,113 @@
+# core/filters.py
+"""
+ფილტრების "კომპილატორი": ProductFilterForm-ის cleaned_data -> FilterSpec.
+
+FilterSpec კანონიკურია (რეგისტრი, ზედმეტი space-ები, 50 / 50.00 ერთნაირად)
+და hashable, ამიტომ ერთი და იგივე ფილტრი ყოველთვის ერთსა და იმავე ქეშის
+გასაღებს იძლევა (key()). SQL-საც ის აგებს (apply()): ზომა და "მხოლოდ
+მარაგში" Product-ზე correlated EXISTS-ია join + DISTINCT-ის ნაცვლად —
+პროდუქტი არ მრავლდება და planner-ს semi-join შეუძლია; ProductCard-ზე
+იგივე პირობები დენორმალიზებული სვეტებიდან მოდის.
+
+    spec = FilterSpec.from_cleaned(form.cleaned_data, category=slug)
+    products = spec.apply(listing_queryset())
+    page = paginate(products, spec.ordering(), cursor)
+"""
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+
+from django.db.models import Exists, OuterRef, Subquery
+
+from .models import Category, ProductCard, ProductSize, Size
+from .pagination import ordering_for
+from .search import build_query, search_products
+
+
+def _text(value):
+    return " ".join(str(value or "").split()).lower()
+
+
+def _price(value):
+    if value is None:
+        return None
+    # Decimal("50.00") -> "50"; 1E+2 არ გამოვიდეს
+    return format(Decimal(value).normalize(), "f")
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    q: str = ""
+    category: str = ""
+    name: str = ""
+    color: str = ""
+    size: str = ""
+    min_price: str | None = None
+    max_price: str | None = None
+    in_stock: bool = False
+    sort: str = ""
+
+    @classmethod
+    def from_cleaned(cls, cleaned, category="", q=""):
+        return cls(
+            q=_text(q),
+            category=(category or cleaned.get("category") or "").strip(),
+            name=_text(cleaned.get("name")),
+            color=_text(cleaned.get("color")),
+            size=_text(cleaned.get("size")),
+            min_price=_price(cleaned.get("min_price")),
+            max_price=_price(cleaned.get("max_price")),
+            in_stock=bool(cleaned.get("in_stock")),
+            sort=cleaned.get("sort") or "",
+        )
+
+    def key(self):
+        """შედეგების სიმრავლის გასაღები — sort მას არ ცვლის."""
+        data = {k: v for k, v in asdict(self).items() if k != "sort" and v not in ("", None, False)}
+        raw = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def search_query(self):
+        return build_query(self.q)
+
+    def ordering(self):
+        # ცარიელი sort ძებნისას = relevance (rank)
+        sort = self.sort or ("relevance" if self.search_query() is not None else "")
+        return ordering_for(sort)
+
+    def apply(self, qs):
+        """qs — Product ან ProductCard queryset; სორტირებას paginate აკეთებს."""
+        card = qs.model is ProductCard
+
+        query = self.search_query()
+        if query is not None:
+            qs = search_products(qs, query)
+        if self.category:
+            # scalar subquery: category_id-ის ინდექსები რჩება, join არ ემატება
+            qs = qs.filter(
+                category_id=Subquery(Category.objects.filter(slug=self.category).values("id")[:1])
+            )
+        if self.name:
+            qs = qs.filter(name__icontains=self.name)
+        if self.color:
+            qs = qs.filter(color__iexact=self.color)
+        if self.min_price is not None:
+            qs = qs.filter(price__gte=Decimal(self.min_price))
+        if self.max_price is not None:
+            qs = qs.filter(price__lte=Decimal(self.max_price))
+
+        if card:
+            # ბარათზე ზომები/მარაგი უკვე დენორმალიზებულია (GIN ინდექსი size_keys-ზე)
+            if self.size:
+                qs = qs.filter(size_keys__contains=[self.size])
+            if self.in_stock:
+                qs = qs.filter(in_stock=True)
+            return qs
+
+        if self.size or self.in_stock:
+            stock = ProductSize.objects.filter(product_id=OuterRef("pk"), stock__gt=0)
+            if self.size:
+                stock = stock.filter(size_id__in=Size.objects.filter(name__iexact=self.size).values("id"))
+            qs = qs.filter(Exists(stock))
+        return qs
@@ -8,7 +8,8 @@ class ProductFilterForm(forms.Form):
     size       = forms.CharField(required=False)
     min_price  = forms.DecimalField(required=False, min_value=0)
     max_price  = forms.DecimalField(required=False, min_value=0)
+    in_stock   = forms.BooleanField(required=False)
     sort       = forms.ChoiceField(
         required=False,
-        choices=[("price_asc","Price ↑"),("price_desc","Price ↓"),("newest","Newest")]
+        choices=[("price_asc","Price ↑"),("price_desc","Price ↓"),("newest","Newest"),("popular","Popular")]
     )
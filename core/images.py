@@ -0,0 +1,152 @@
+# core/images.py
+"""
+სურათების დერივატივები (Pillow).
+
+ორიგინალიდან ვამზადებთ რამდენიმე სიგანის WebP + JPEG ვერსიას და პატარა
+blur placeholder-ს (data URI). მეტამონაცემები JSON-ად ინახება მოდელზე
+(Product.main_image_renditions / ProductImage.renditions):
+
+    {"source": "products/main/x.jpg", "width": 1200, "height": 1500,
+     "webp": [[240, "products/main/renditions/x-240.webp"], ...],
+     "jpeg": [[240, "products/main/renditions/x-240.jpg"], ...],
+     "placeholder": "data:image/webp;base64,..."}
+
+შაბლონებში: {% product_image p %} / {% responsive_image ... %} (core/templatetags/image_tags.py).
+"""
+import base64
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+RENDITION_WIDTHS = (240, 480, 960)
+FORMATS = {
+    # format -> (Pillow format, გაფართოება, save() პარამეტრები)
+    "webp": ("WEBP", "webp", {"quality": 78, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+PLACEHOLDER_WIDTH = 16
+# დაზიანებული / უცნობი / ზედმეტად დიდი ფაილი — Pillow-ის შეცდომები, არა მხოლოდ OSError
+IMAGE_ERRORS = (OSError, ValueError, SyntaxError, Image.DecompressionBombError)
+
+
+def rendition_name(source, width, ext):
+    head, tail = posixpath.split(source)
+    stem = posixpath.splitext(tail)[0]
+    return posixpath.join(head, "renditions", f"{stem}-{width}.{ext}")
+
+
+def _open(source, storage):
+    with storage.open(source, "rb") as fh:
+        img = Image.open(fh)
+        img.load()
+    # EXIF ორიენტაცია (ტელეფონის ფოტოები) + JPEG-ს ალფა არ აქვს
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    return img
+
+
+def _encode(img, fmt):
+    pil_format, _, options = FORMATS[fmt]
+    if pil_format == "JPEG" and img.mode != "RGB":
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A") if img.mode == "RGBA" else None)
+        img = background
+    buf = BytesIO()
+    img.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+def _resize(img, width):
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def _placeholder(img):
+    small = _resize(img, PLACEHOLDER_WIDTH)
+    data = _encode(small, "webp")
+    return "data:image/webp;base64," + base64.b64encode(data).decode()
+
+
+def build_renditions(source, storage=None):
+    """
+    source — storage-ის სახელი (FieldFile.name). აბრუნებს მეტამონაცემების dict-ს.
+    ორიგინალზე ფართო ვერსია არ კეთდება. არსებულ ფაილებს არ ეხება — სახელი
+    დაკავებულია, storage ახალს არჩევს; ძველების წაშლა გამომძახებლისაა,
+    მეტამონაცემების შეცვლის შემდეგ (replace_renditions). შეცდომისას უკვე
+    ჩაწერილი ფაილები იშლება.
+    """
+    storage = storage or default_storage
+    img = _open(source, storage)
+    widths = [w for w in RENDITION_WIDTHS if w < img.width] or [img.width]
+
+    meta = {"source": source, "width": img.width, "height": img.height}
+    try:
+        for fmt, (_, ext, _) in FORMATS.items():
+            meta[fmt] = []
+            for width in widths:
+                saved = storage.save(rendition_name(source, width, ext), ContentFile(_encode(_resize(img, width), fmt)))
+                meta[fmt].append([width, saved])
+        meta["placeholder"] = _placeholder(img)
+    except BaseException:
+        delete_renditions(meta, storage)
+        raise
+    return meta
+
+
+def rendition_names(meta):
+    return {name for fmt in FORMATS for _, name in (meta or {}).get(fmt, ())}
+
+
+def delete_renditions(meta, storage=None, keep=()):
+    """keep — სახელები, რომლებიც ახალ მეტამონაცემებშიც არის."""
+    storage = storage or default_storage
+    for name in rendition_names(meta) - set(keep):
+        storage.delete(name)
+
+
+def replace_renditions(old_meta, new_meta, storage=None):
+    """ახალი მეტამონაცემები უკვე შენახულია — ძველი ვერსიების ფაილები აღარ სჭირდება."""
+    delete_renditions(old_meta, storage, keep=rendition_names(new_meta))
+
+
+def is_current(field_file, meta):
+    """მეტამონაცემები ამ ფაილისაა? (ატვირთვისას სახელი იცვლება)"""
+    return bool(field_file) and (meta or {}).get("source") == field_file.name
+
+
+# -----------------------------
+# მოდელებზე მიბმა
+# -----------------------------
+# model label -> (ფაილის ველი, renditions ველი, width ველი, height ველი)
+IMAGE_FIELDS = {
+    "core.product": ("main_image", "main_image_renditions", "main_image_width", "main_image_height"),
+    "core.productimage": ("image", "renditions", "width", "height"),
+}
+
+
+def image_fields(model):
+    return IMAGE_FIELDS[model._meta.label_lower]
+
+
+def process_instance(instance):
+    """
+    ამზადებს ვერსიებს, თუ ფაილი შეიცვალა. update() — save() სიგნალებს თავიდან
+    არ გაუშვებს. ჯერ აგება, შემდეგ მეტამონაცემები, ბოლოს ძველი ფაილების წაშლა —
+    ჩავარდნილი აგება ძველ ვერსიებს ადგილზე ტოვებს. აბრუნებს True-ს, თუ რამე განახლდა.
+    """
+    file_field, meta_field, w_field, h_field = image_fields(type(instance))
+    field_file = getattr(instance, file_field)
+    meta = getattr(instance, meta_field) or {}
+    if is_current(field_file, meta) or (not field_file and not meta):
+        return False
+    new_meta = build_renditions(field_file.name) if field_file else {}
+    type(instance).objects.filter(pk=instance.pk).update(
+        **{meta_field: new_meta, w_field: new_meta.get("width"), h_field: new_meta.get("height")}
+    )
+    transaction.on_commit(lambda: replace_renditions(meta, new_meta))
+    return True
@@ -0,0 +1,64 @@
+# core/jinja_env.py
+"""
+Jinja2 გარემო ცხელი storefront შაბლონებისთვის (core/jinja2/, cart/jinja2/).
+
+Django-ის tag-ები/ფილტრები აქ ფუნქციებადაა: {% url 'x' a %} -> {{ url('x', a) }},
+{% querystring k=v %} -> {{ querystring(request, k=v) }}, {% product_card p %} ->
+{{ product_card(p) }} და ა.შ. რომელი გვერდი რომელი ძრავით — core/engines.py.
+"""
+from django.template.defaultfilters import floatformat, pluralize
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils import timezone
+from jinja2 import Environment, pass_context
+
+from cart.templatetags.cart_tags import get_cart_count, multiply
+from core.templatetags.image_tags import product_image, responsive_image
+from core.templatetags.card_tags import product_card
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args or None, kwargs=kwargs or None)
+
+
+def querystring(request, **kwargs):
+    """Django-ის {% querystring %}: None შლის გასაღებს, დანარჩენი GET რჩება."""
+    params = request.GET.copy()
+    for key, value in kwargs.items():
+        if value is None:
+            params.pop(key, None)
+        elif isinstance(value, (list, tuple)):
+            params.setlist(key, value)
+        else:
+            params[key] = value
+    if not params and not request.GET:
+        return ""
+    return "?" + params.urlencode()
+
+
+def jinja_product_card(product, variant="tile", headline=""):
+    return product_card(product, variant, headline, using="jinja2")
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update(
+        {
+            "url": url,
+            "static": static,
+            "querystring": querystring,
+            "now": timezone.localtime,
+            "product_image": product_image,
+            "responsive_image": responsive_image,
+            "product_card": jinja_product_card,
+            "get_cart_count": pass_context(get_cart_count),
+        }
+    )
+    env.filters.update(
+        {
+            "floatformat": floatformat,
+            "pluralize": pluralize,
+            "multiply": multiply,
+        }
+    )
+    return env
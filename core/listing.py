@@ -0,0 +1,95 @@
+# core/listing.py
+"""
+სიის გვერდების ორსაფეხურიანი ქეში (კატალოგი / ძებნა).
+
+1) ID-ების სია: FilterSpec + სორტი + cursor -> გვერდის pk-ები, has_next,
+   next_cursor (და ძებნისას headline-ები). გასაღებში იგივე თაობებია, რაც
+   გვერდის ETag-ში (CatalogVersionMixin): catalog / categories / sizes და
+   "popular" სორტზე popularity — ახალი ETag ყოველთვის ახალ სიას ნიშნავს.
+
+2) ბარათები: თითო პროდუქტი ცალკე გასაღებით product:<id> თაობით, ერთი
+   get_many-ით; ქეშში არმყოფები — ერთი `pk__in` values_list query-ით
+   (ProductRow, core/rows.py). პროდუქტის რედაქტირება მხოლოდ მის ჩანაწერს
+   აძველებს.
+"""
+import copy
+import hashlib
+import json
+
+from .caching import CATALOG, CATEGORIES, POPULARITY, PRODUCT, SIZES, get_object_generations, tiered, versioned_key
+from .pagination import KeysetPage, paginate
+from .rows import fetch_rows
+from .search import get_headlines
+
+IDS_TTL = 60
+IDS_STALE_TTL = 30
+# თაობით ინვალიდირდება, TTL მხოლოდ ნაგვის გასაწმენდად
+CARD_TTL = 60 * 60 * 24
+
+
+def _source(qs):
+    return qs.model._meta.label_lower
+
+
+def ids_key(base, spec, cursor):
+    ordering = spec.ordering()
+    raw = json.dumps([spec.key(), ordering, cursor or ""], separators=(",", ":"))
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    gens = [CATALOG, CATEGORIES, SIZES]
+    if any(f.lstrip("-") == "popularity" for f in ordering):
+        gens.append(POPULARITY)
+    return versioned_key(f"core:ids:{_source(base)}:{digest}", *gens)
+
+
+def _id_page(base, spec, cursor):
+    """პირველი საფეხური: მხოლოდ სორტირების ველები, მოდელის სრული სტრიქონის გარეშე."""
+    ordering = spec.ordering()
+    fields = [f.lstrip("-") for f in ordering if f.lstrip("-") not in ("pk", "rank")]
+    qs = spec.apply(base).select_related(None).only(base.model._meta.pk.name, *fields)
+    page = paginate(qs, ordering, cursor)
+    ids = [obj.pk for obj in page.items]
+    query = spec.search_query()
+    return {
+        "ids": ids,
+        "has_next": page.has_next,
+        "next_cursor": page.next_cursor,
+        "headlines": get_headlines(ids, query) if query is not None else {},
+    }
+
+
+def hydrate(base, ids):
+    """
+    pk-ები -> ProductRow-ები იმავე რიგით. ქეშიდან ასლები ბრუნდება — გვერდი მათ
+    ატრიბუტებს ამატებს (headline) და LRU-ში მყოფი ობიექტი არ უნდა შეიცვალოს.
+    """
+    if not ids:
+        return []
+    source = _source(base)
+    gens = get_object_generations(PRODUCT, ids)
+    keys = {pk: f"core:row:{source}:{pk}:g{gens[pk]}" for pk in ids}
+    cached = tiered.get_many(keys.values())
+    found = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    missing = [pk for pk in ids if pk not in found]
+    if missing:
+        fresh = {row.pk: row for row in fetch_rows(base.filter(pk__in=missing))}
+        tiered.set_many({keys[pk]: obj for pk, obj in fresh.items()}, CARD_TTL)
+        found.update(fresh)
+    # სიაში მოხვედრის შემდეგ წაშლილი პროდუქტი უბრალოდ გამოტოვდება
+    return [copy.copy(found[pk]) for pk in ids if pk in found]
+
+
+def listing_page(base, spec, cursor=None):
+    """base — listing_queryset() ფილტრების გარეშე; აბრუნებს KeysetPage-ს."""
+    entry = tiered.get_or_set(
+        ids_key(base, spec, cursor),
+        lambda: _id_page(base, spec, cursor),
+        IDS_TTL,
+        stale_ttl=IDS_STALE_TTL,
+    )
+    items = hydrate(base, entry["ids"])
+    headlines = entry["headlines"]
+    if headlines:
+        for item in items:
+            item.headline = headlines.get(item.pk, "")
+    return KeysetPage(items=items, has_next=entry["has_next"], next_cursor=entry["next_cursor"])
@@ -0,0 +1,104 @@
+# core/management/commands/backfill_images.py
+"""
+python manage.py backfill_images [--workers 8] [--force]
+
+არსებული სურათების ვერსიები (core/images.py). Pillow CPU-ზეა დამოკიდებული,
+ამიტომ ProcessPoolExecutor: worker-ები მხოლოდ ახალ ფაილებს ამზადებენ, ბაზაში
+წერს მთავარი პროცესი (bulk_update) და მხოლოდ ამის შემდეგ შლის ძველ ვერსიებს;
+ბოლოს ბარათები და თაობები ახლდება.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from core.caching import CATALOG, PRODUCT, bump
+from core.cards import refresh_cards
+from core.images import IMAGE_ERRORS, build_renditions, image_fields, is_current, replace_renditions
+from core.models import Product, ProductImage
+
+
+def _build(source):
+    """
+    worker პროცესში: (meta, None) ან (None, შეცდომის ტექსტი). ძველ ფაილებს არ
+    ეხება — მათ მთავარი პროცესი შლის, ახალი მეტამონაცემების ჩაწერის შემდეგ.
+    """
+    try:
+        return build_renditions(source), None
+    except IMAGE_ERRORS as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+class Command(BaseCommand):
+    help = "Generates WebP/JPEG renditions and placeholders for existing product images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--force", action="store_true", help="rebuild even up-to-date images")
+
+    def handle(self, *args, **options):
+        touched = set()
+        for model in (Product, ProductImage):
+            touched |= self.backfill(model, options)
+
+        if touched:
+            # bulk_update updated_at-ს არ ცვლის — ის ბარათის HTML-ის ქეშის გასაღებშია
+            Product.objects.filter(pk__in=touched).update(updated_at=timezone.now())
+            refresh_cards(touched)
+            bump(CATALOG)
+            for pk in touched:
+                bump(PRODUCT, pk)
+        self.stdout.write(self.style.SUCCESS(f"{len(touched)} products updated"))
+
+    def backfill(self, model, options):
+        file_field, meta_field, w_field, h_field = image_fields(model)
+        product_attr = "pk" if model is Product else "product_id"
+        rows = (
+            model.objects.exclude(**{file_field: ""})
+            .only("id", file_field, meta_field, *(["product_id"] if model is ProductImage else []))
+            .order_by("pk")
+        )
+        todo = [
+            obj for obj in rows.iterator()
+            if options["force"] or not is_current(getattr(obj, file_field), getattr(obj, meta_field))
+        ]
+        self.stdout.write(f"{model.__name__}: {len(todo)} to process")
+        if not todo:
+            return set()
+
+        # fork-ის წინ: შვილ პროცესებს მშობლის ბაზის კავშირი არ უნდა გაჰყვეს
+        connections.close_all()
+        done, ok, failed, touched = [], 0, 0, set()
+        old_meta = {obj.pk: getattr(obj, meta_field) for obj in todo}
+
+        def save(batch):
+            model.objects.bulk_update(batch, [meta_field, w_field, h_field])
+            for obj in batch:
+                replace_renditions(old_meta[obj.pk], getattr(obj, meta_field))
+
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            futures = {pool.submit(_build, getattr(obj, file_field).name): obj for obj in todo}
+            for future in as_completed(futures):
+                obj = futures[future]
+                meta, error = future.result()
+                if error:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} {obj.pk}: {error}")
+                    continue
+                setattr(obj, meta_field, meta)
+                setattr(obj, w_field, meta["width"])
+                setattr(obj, h_field, meta["height"])
+                done.append(obj)
+                ok += 1
+                touched.add(getattr(obj, product_attr))
+                if len(done) >= options["batch_size"]:
+                    save(done)
+                    done = []
+        if done:
+            save(done)
+
+        self.stdout.write(f"{model.__name__}: {ok} ok, {failed} failed")
+        return touched
@@ -0,0 +1,223 @@
+# core/management/commands/bench.py
+"""
+python manage.py bench search --products 100000
+python manage.py bench render
+python manage.py bench rows
+python manage.py bench autocomplete
+python manage.py bench exports
+
+სინთეტიკურ კატალოგს თესავს ტრანზაქციაში, ზომავს და ბოლოს rollback-ს აკეთებს.
+"""
+import pickle
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.template import Context, Template
+from django.test import override_settings
+
+from core.autocomplete import build_index
+from core.caching import tiered
+from core.exports import Exporter
+from core.models import Product
+from core.pagination import PAGE_SIZE, ordering_for, paginate
+from core.rows import fetch_rows
+from core.search import build_query, search_products
+from core.seeding import seed_catalog
+from core.templatetags.card_tags import card_key
+from core.views import listing_queryset
+
+SEARCH_TERMS = ["wool", "leather jacket", "blue", "vintage denim jeans", "cashmere scarf", "zzz"]
+
+
+def timed(fn, repeat, setup=None):
+    """
+    მედიანა მილიწამებში (+ პირველი, "ცივი" გაშვება ცალკე არ ითვლება).
+    setup — ყოველი გაზომვის წინ, დროში არ ითვლება.
+    """
+    fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_search(q):
+    """ძველი SearchView: icontains OR ყველა სიტყვაზე + distinct."""
+    qs = Product.objects.select_related("category").only(
+        "id", "name", "slug", "price", "color", "main_image", "created_at", "category_id"
+    )
+    for term in q.split():
+        qs = qs.filter(
+            Q(name__icontains=term)
+            | Q(description__icontains=term)
+            | Q(category__name__icontains=term)
+            | Q(color__icontains=term)
+        )
+    return qs.distinct()
+
+
+def bench_search(cmd, options):
+    base = Product.objects.select_related("category").only(
+        "id", "name", "slug", "price", "color", "main_image", "created_at", "category_id"
+    )
+    cmd.stdout.write(f"{'query':<24}{'matches':>9}{'legacy all':>12}{'legacy page':>13}{'fts page':>10}")
+    for q in SEARCH_TERMS:
+        query = build_query(q)
+        matches = search_products(base, query).count()
+        legacy_all = timed(lambda: list(legacy_search(q)), options["repeat"])
+        legacy_page = timed(lambda: list(legacy_search(q).order_by("-created_at")[:PAGE_SIZE]), options["repeat"])
+        fts_page = timed(
+            lambda: paginate(search_products(base, query), ordering_for("relevance")), options["repeat"]
+        )
+        cmd.stdout.write(
+            f"{q:<24}{matches:>9}{legacy_all:>10.1f}ms{legacy_page:>11.1f}ms{fts_page:>8.1f}ms"
+        )
+
+
+RENDER_GRID = 48
+
+
+def bench_render(cmd, options):
+    """48 ბარათიანი ბადე: inline include (ძველი) vs {% product_card %} ცივი/თბილი ქეშით."""
+    products = list(listing_queryset().order_by("-created_at", "-pk")[:RENDER_GRID])
+    keys = [card_key(p, "catalog") for p in products]
+    ctx = {"products": products}
+    inline = Template(
+        '{% for p in products %}{% include "core/includes/cards/catalog.html" %}{% endfor %}'
+    )
+    tagged = Template('{% load card_tags %}{% for p in products %}{% product_card p "catalog" %}{% endfor %}')
+
+    def evict_all():
+        tiered.local.clear()
+        tiered.shared.delete_many(keys)
+
+    rows = [
+        ("inline (no cache)", timed(lambda: inline.render(Context(ctx)), options["repeat"])),
+        ("tag, cold", timed(lambda: tagged.render(Context(ctx)), options["repeat"], setup=evict_all)),
+        ("tag, shared hit", timed(lambda: tagged.render(Context(ctx)), options["repeat"], setup=tiered.local.clear)),
+        ("tag, local hit", timed(lambda: tagged.render(Context(ctx)), options["repeat"])),
+    ]
+    cmd.stdout.write(f"{len(products)} cards")
+    for label, ms in rows:
+        cmd.stdout.write(f"{label:<20}{ms:>8.2f}ms")
+
+
+def allocated(fn):
+    """fn()-ის შედეგის მიერ დაკავებული მეხსიერება (KiB) და ალოკაციების პიკი."""
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024, peak / 1024
+
+
+ROW_PAGE_SIZES = (PAGE_SIZE, 96, 500)
+
+
+def bench_rows(cmd, options):
+    """სიის გვერდი: .only() მოდელის instance-ები vs values_list -> ProductRow."""
+    cmd.stdout.write(
+        f"{'source':<9}{'rows':>6}{'':>4}{'time':>10}{'retained':>12}{'peak':>12}{'pickled':>11}"
+    )
+    for read_model in (True, False):
+        source = "card" if read_model else "product"
+        with override_settings(CATALOG_READ_MODEL=read_model):
+            qs = listing_queryset().order_by("-created_at", "-pk")
+            for n in ROW_PAGE_SIZES:
+                for label, fn in (("only", lambda: list(qs[:n])), ("rows", lambda: fetch_rows(qs[:n]))):
+                    ms = timed(fn, options["repeat"])
+                    retained, peak = allocated(fn)
+                    pickled = len(pickle.dumps(fn(), pickle.HIGHEST_PROTOCOL)) / 1024
+                    cmd.stdout.write(
+                        f"{source:<9}{n:>6}  {label:<4}{ms:>8.2f}ms{retained:>9.0f}KiB{peak:>9.0f}KiB"
+                        f"{pickled:>8.0f}KiB"
+                    )
+
+
+AUTOCOMPLETE_PREFIXES = ["w", "wo", "woo", "wool", "item 1", "item 12", "leather j", "bla", "zzz"]
+
+
+def bench_autocomplete(cmd, options):
+    """ინდექსის აგება და lookup-ის დაყოვნება (მიკროწამები, 1000 გამეორების მედიანა)."""
+    t0 = time.perf_counter()
+    index = build_index()
+    cmd.stdout.write(
+        f"build {(time.perf_counter() - t0) * 1000:.0f}ms, {len(index.suggestions)} entries, "
+        f"~{index.bytes / 1024 / 1024:.1f}MiB, {index.dropped} dropped by budget"
+    )
+    for prefix in AUTOCOMPLETE_PREFIXES:
+        samples = []
+        for _ in range(1000):
+            t0 = time.perf_counter()
+            results = index.lookup(prefix)
+            samples.append((time.perf_counter() - t0) * 1_000_000)
+        cmd.stdout.write(f"{prefix!r:<14}{len(results):>3} results{statistics.median(samples):>9.1f}us")
+
+
+def bench_exports(cmd, options):
+    """sitemap/feed: სრული აგება, ცვლილებების გარეშე და ერთ shard-ში შეცვლილი პროდუქტით."""
+    def dir_size(root):
+        return sum(p.stat().st_size for p in root.rglob("*") if p.is_file()) / 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = Exporter(tmp, "https://shop.example", "GEL")
+        last = Product.objects.order_by("-pk").values_list("pk", flat=True).first()
+
+        def touch_one():
+            Product.objects.filter(pk=last).update(updated_at=timezone.now())
+            return exporter.build()
+
+        steps = (
+            ("full", lambda: exporter.build(full=True)),
+            ("unchanged", exporter.build),
+            ("1 shard touched", touch_one),
+        )
+        for label, fn in steps:
+            t0 = time.perf_counter()
+            stats = fn()
+            ms = (time.perf_counter() - t0) * 1000
+            # tracemalloc ნელია — მეხსიერება ცალკე, განმეორებით გაშვებაზე
+            _, peak = allocated(fn)
+            cmd.stdout.write(
+                f"{label:<17}{ms:>9.0f}ms  peak {peak:>6.0f}KiB  "
+                f"written {stats['written']}, unchanged {stats['skipped']}, files {dir_size(exporter.root):.0f}KiB"
+            )
+
+
+BENCHMARKS = {
+    "search": bench_search,
+    "render": bench_render,
+    "rows": bench_rows,
+    "autocomplete": bench_autocomplete,
+    "exports": bench_exports,
+}
+
+
+class Command(BaseCommand):
+    help = "Runs a benchmark against a seeded (and rolled back) synthetic catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(BENCHMARKS))
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            t0 = time.perf_counter()
+            seed_catalog(options["products"])
+            with connection.cursor() as cur:
+                cur.execute("ANALYZE core_product")
+            self.stdout.write(f"seeded {options['products']} products in {time.perf_counter() - t0:.1f}s")
+            BENCHMARKS[options["name"]](self, options)
+            transaction.set_rollback(True)
@@ -0,0 +1,260 @@
+# core/management/commands/bench_http.py
+"""
+python manage.py bench_http [--budget 512] [--concurrency 1,8,32] [--duration 10]
+                             [--warmup 10] [--path /catalog/ ...]
+
+gunicorn (WSGI, sync view-ები) vs uvicorn (ASGI, core/async_views.py + psycopg
+pool) — ერთნაირი მეხსიერების ბიუჯეტით. worker-ების რაოდენობა თითოეულისთვის
+ბიუჯეტიდან ითვლება: სერვერი ჯერ 1 და 2 worker-ით ეშვება, სხვაობა = ერთი
+worker-ის PSS (/proc/<pid>/smaps_rollup), დანარჩენი — master-ის.
+
+დატვირთვა — asyncio-ს keep-alive HTTP/1.1 კლიენტი (gunicorn sync worker
+კავშირს ხურავს — ხელახლა ერთდება), ქუქიების გარეშე: ყოველი მოთხოვნა ახალი
+ვიზიტორია. მიმდინარე ბაზაზე მუშაობს (seed-ი ცალკე პროცესებს არ ჩანს);
+DEBUG=0-ზე ჯერ `collectstatic`. კლიენტიც იმავე მანქანაზეა — CPU-ს იყოფს.
+"""
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.models import Product
+
+SERVERS = {
+    "wsgi": (
+        [sys.executable, "-m", "gunicorn", "config.wsgi:application", "--bind", "127.0.0.1:{port}",
+         "--workers", "{workers}", "--log-level", "warning"],
+        {"ASYNC_VIEWS": "0", "DB_POOL": "0"},
+    ),
+    "asgi": (
+        [sys.executable, "-m", "uvicorn", "config.asgi:application", "--host", "127.0.0.1", "--port", "{port}",
+         "--workers", "{workers}", "--log-level", "warning", "--no-access-log"],
+        {"ASYNC_VIEWS": "1", "DB_POOL": "1"},
+    ),
+}
+BOOT_TIMEOUT = 60
+
+
+# -----------------------------
+# მეხსიერება
+# -----------------------------
+def _children():
+    tree = {}
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            try:
+                with open(f"/proc/{name}/stat") as fh:
+                    ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                continue
+            tree.setdefault(ppid, []).append(int(name))
+    return tree
+
+
+def _pss_kib(pid):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as fh:
+            for line in fh:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def tree_memory_mb(pid):
+    """პროცესისა და ყველა შთამომავლის PSS (fork-ის გაზიარებული გვერდები ერთხელ)."""
+    tree, stack, total = _children(), [pid], 0
+    while stack:
+        current = stack.pop()
+        total += _pss_kib(current)
+        stack.extend(tree.get(current, ()))
+    return total / 1024
+
+
+# -----------------------------
+# HTTP კლიენტი
+# -----------------------------
+async def read_response(reader):
+    """-> (status, keep_alive)"""
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split()[1])
+    headers = dict((k.strip().lower(), v.strip()) for k, v in (line.split(":", 1) for line in head[1:] if line))
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def client(port, paths, deadline, offset, latencies, errors):
+    # X-Forwarded-Proto: SECURE_SSL_REDIRECT-ის 301-ის გარეშე (SECURE_PROXY_SSL_HEADER)
+    requests = [
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nX-Forwarded-Proto: https\r\n\r\n".encode() for path in paths
+    ]
+    writer = None
+    i = offset
+    while time.perf_counter() < deadline:
+        request = requests[i % len(requests)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            errors.append(None)
+            keep_alive, status = False, None
+        else:
+            if status == 200:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors.append(status)
+        if not keep_alive and writer is not None:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, paths, deadline, n, latencies, errors) for n in range(concurrency)))
+    return latencies, errors
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000 if len(samples) > 1 else 0.0
+
+
+# -----------------------------
+# სერვერი
+# -----------------------------
+class Server:
+    def __init__(self, kind, port, workers, log):
+        argv, env = SERVERS[kind]
+        self.port = port
+        self.proc = subprocess.Popen(
+            [arg.format(port=port, workers=workers) for arg in argv],
+            env={**os.environ, **env},
+            cwd=settings.BASE_DIR,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    def wait_ready(self, path):
+        deadline = time.monotonic() + BOOT_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise CommandError(f"server exited with {self.proc.returncode}")
+            try:
+                latencies, errors = asyncio.run(load(self.port, [path], 1, 0.001))
+            except OSError:
+                latencies, errors = [], [None]
+            if latencies:
+                return
+            if any(errors):
+                raise CommandError(f"{path} -> HTTP {errors[0]} (DEBUG=0: collectstatic?)")
+            time.sleep(0.5)
+        raise CommandError("server did not start")
+
+    def stop(self):
+        if self.proc.poll() is None:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            try:
+                self.proc.wait(15)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+                self.proc.wait()
+
+
+class Command(BaseCommand):
+    help = "Compares gunicorn (sync) and uvicorn (async views) throughput at an equal memory budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", type=int, default=512, help="MB (PSS) per server")
+        parser.add_argument("--concurrency", default="1,8,32")
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument("--warmup", type=float, default=10.0)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--path", action="append", dest="paths")
+        parser.add_argument("--servers", default="wsgi,asgi")
+
+    def default_paths(self):
+        slug = Product.objects.order_by("pk").values_list("slug", flat=True).first()
+        paths = [reverse("core:index"), reverse("core:catalog_all"), reverse("core:search") + "?q=shirt"]
+        if slug:
+            paths.append(reverse("core:product_detail", args=[slug]))
+        return paths
+
+    def run_server(self, kind, workers, log, paths):
+        server = Server(kind, self.port, workers, log)
+        try:
+            server.wait_ready(paths[0])
+            # ყოველი worker-ის ლოკალური ქეში (tiered.local) უნდა გათბეს
+            asyncio.run(load(self.port, paths, max(self.levels), self.warmup))
+            return server, tree_memory_mb(server.proc.pid)
+        except BaseException:
+            server.stop()
+            raise
+
+    def size_workers(self, kind, log, paths):
+        """ბიუჯეტში ჩატეული worker-ები: 1 და 2 worker-ის მეხსიერების სხვაობით."""
+        measured = []
+        for workers in (1, 2):
+            server, memory = self.run_server(kind, workers, log, paths)
+            server.stop()
+            measured.append(memory)
+        per_worker = max(measured[1] - measured[0], 1.0)
+        base = max(measured[0] - per_worker, 0.0)
+        return max(1, int((self.budget - base) // per_worker)), per_worker
+
+    def handle(self, *args, **options):
+        self.levels = [int(c) for c in options["concurrency"].split(",")]
+        self.budget = options["budget"]
+        self.port = options["port"]
+        self.warmup = options["warmup"]
+        paths = options["paths"] or self.default_paths()
+        self.stdout.write(f"paths: {' '.join(paths)}; budget {self.budget}MB")
+
+        with tempfile.TemporaryFile("w+") as log:
+            try:
+                for kind in options["servers"].split(","):
+                    workers, per_worker = self.size_workers(kind, log, paths)
+                    server, memory = self.run_server(kind, workers, log, paths)
+                    try:
+                        self.stdout.write(
+                            f"\n{kind}: {workers} workers (~{per_worker:.0f}MB each), {memory:.0f}MB after warm-up"
+                        )
+                        for concurrency in self.levels:
+                            latencies, errors = asyncio.run(load(self.port, paths, concurrency, options["duration"]))
+                            self.stdout.write(
+                                f"  c={concurrency:<4}{len(latencies) / options['duration']:>8.1f} rps"
+                                f"  p50 {percentile(latencies, 50):>7.1f}ms  p99 {percentile(latencies, 99):>7.1f}ms"
+                                f"  errors {len(errors)}"
+                            )
+                        self.stdout.write(f"  memory after load: {tree_memory_mb(server.proc.pid):.0f}MB")
+                    finally:
+                        server.stop()
+            except CommandError:
+                log.seek(0)
+                self.stderr.write(log.read()[-4000:])
+                raise
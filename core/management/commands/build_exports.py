@@ -0,0 +1,35 @@
+# core/management/commands/build_exports.py
+"""
+python manage.py build_exports [--full] [--enqueue]
+
+sitemap.xml და shopping feed-ის shard-ები settings.EXPORTS_ROOT-ში (core/exports.py).
+ჩვეულებრივ მხოლოდ შეცვლილი shard-ები იწერება; --full — ყველა.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.exports import build_exports
+from jobs.registry import enqueue
+
+
+class Command(BaseCommand):
+    help = "Builds gzipped, sharded sitemap and product feed files (only changed shards unless --full)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="rewrite every shard")
+        parser.add_argument("--enqueue", action="store_true", help="run in the jobs worker instead")
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            enqueue("core.build_exports", full=options["full"])
+            self.stdout.write(self.style.SUCCESS("core.build_exports enqueued"))
+            return
+        t0 = time.perf_counter()
+        stats = build_exports(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['written']} shards written, {stats['skipped']} unchanged, {stats['removed']} removed "
+                f"in {time.perf_counter() - t0:.1f}s"
+            )
+        )
@@ -0,0 +1,37 @@
+# core/management/commands/build_related.py
+"""
+python manage.py build_related [--top 8] [--days 365] [--min-support 2] [--enqueue]
+
+RelatedProduct-ის გადათვლა შეკვეთების ისტორიიდან (core/related.py) — cron-იდან,
+ან --enqueue-ით jobs worker-ში.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.related import LOOKBACK_DAYS, MIN_SUPPORT, TOP_N, build_related
+from jobs.registry import enqueue
+
+
+class Command(BaseCommand):
+    help = "Rebuilds co-purchase related products from order history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=TOP_N)
+        parser.add_argument("--days", type=int, default=LOOKBACK_DAYS, help="0 = all history")
+        parser.add_argument("--min-support", type=int, default=MIN_SUPPORT)
+        parser.add_argument("--enqueue", action="store_true", help="run in the jobs worker instead")
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            enqueue(
+                "core.build_related",
+                top_n=options["top"], days=options["days"], min_support=options["min_support"],
+            )
+            self.stdout.write(self.style.SUCCESS("core.build_related enqueued"))
+            return
+        t0 = time.perf_counter()
+        products, links = build_related(options["top"], options["days"], options["min_support"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{links} related links for {products} products in {time.perf_counter() - t0:.1f}s")
+        )
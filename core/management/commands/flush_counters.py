@@ -0,0 +1,29 @@
+# core/management/commands/flush_counters.py
+"""
+python manage.py flush_counters [--loop 60]
+
+ნახვების / ძებნის impression-ების ჩაწერა ProductDailyStats-ში (core/counters.py).
+cron-იდან ყოველ წუთს, ან --loop N — N წამიანი ინტერვალით, გაჩერებამდე.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.counters import FLUSH_INTERVAL, flush_counters
+
+
+class Command(BaseCommand):
+    help = "Flushes buffered product view / search impression counters into ProductDailyStats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", type=int, default=0, metavar="SECONDS", help=f"repeat (e.g. {FLUSH_INTERVAL})")
+
+    def handle(self, *args, **options):
+        while True:
+            rows = flush_counters()
+            self.stdout.write(f"{rows} product/day rows upserted")
+            if not options["loop"]:
+                break
+            close_old_connections()
+            time.sleep(options["loop"])
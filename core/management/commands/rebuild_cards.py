@@ -0,0 +1,13 @@
+# core/management/commands/rebuild_cards.py
+from django.core.management.base import BaseCommand
+
+from core.cards import rebuild_all_cards
+from core.models import ProductCard
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the ProductCard read model from Product/ProductSize/ProductImage."
+
+    def handle(self, *args, **options):
+        rebuild_all_cards()
+        self.stdout.write(self.style.SUCCESS(f"{ProductCard.objects.count()} product cards rebuilt"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Product
+from core.popularity import rebuild_popularity
+
+
+class Command(BaseCommand):
+    help = "Recomputes the time-decayed popularity score from the whole order history (initial backfill)."
+
+    def handle(self, *args, **options):
+        rebuild_popularity()
+        ranked = Product.objects.filter(popularity__gt=0).count()
+        self.stdout.write(self.style.SUCCESS(f"popularity rebuilt, {ranked} products with sales"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# არსებული პროდუქტების ვექტორი ერთ UPDATE-ში (იგივე წონები, რაც core/search.py-ში)
+BACKFILL_SQL = """
+UPDATE core_product AS p SET search_vector =
+    setweight(to_tsvector('english', COALESCE(p.name, '')), 'A')
+    || setweight(to_tsvector('english', COALESCE(c.name, '')), 'B')
+    || setweight(to_tsvector('english', COALESCE(p.color, '')), 'B')
+    || setweight(to_tsvector('english', COALESCE(p.description, '')), 'C')
+FROM core_category AS c
+WHERE c.id = p.category_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_productsize_product'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_product_search_gin'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:34
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# არსებული პროდუქტების ბარათები (იგივე SELECT, რაც core/cards.py-ში)
+BACKFILL_SQL = """
+INSERT INTO core_productcard (product_id, name, slug, category_id, category_slug, color, price, main_image,
+                              in_stock, total_stock, sizes, size_keys, created_at, updated_at)
+SELECT p.id, p.name, p.slug, p.category_id, c.slug, p.color, p.price,
+       COALESCE(
+           NULLIF(p.main_image, ''),
+           (SELECT pi.image FROM core_productimage pi WHERE pi.product_id = p.id ORDER BY pi.id LIMIT 1),
+           ''
+       ),
+       COALESCE(st.total, 0) > 0, COALESCE(st.total, 0),
+       COALESCE(st.sizes, '{}'), COALESCE(st.size_keys, '{}'),
+       p.created_at, p.updated_at
+  FROM core_product p
+  JOIN core_category c ON c.id = p.category_id
+  LEFT JOIN LATERAL (
+      SELECT SUM(ps.stock) AS total,
+             array_agg(s.name ORDER BY s.name) FILTER (WHERE ps.stock > 0) AS sizes,
+             array_agg(lower(s.name) ORDER BY s.name) FILTER (WHERE ps.stock > 0) AS size_keys
+        FROM core_productsize ps
+        JOIN core_size s ON s.id = ps.size_id
+       WHERE ps.product_id = p.id
+  ) st ON true;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCard',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='core.product')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('category_slug', models.SlugField(max_length=100)),
+                ('color', models.CharField(max_length=100)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('main_image', models.ImageField(blank=True, upload_to='products/main/')),
+                ('in_stock', models.BooleanField(default=False)),
+                ('total_stock', models.PositiveIntegerField(default=0)),
+                ('sizes', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=20), blank=True, default=list, size=None)),
+                ('size_keys', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=20), blank=True, default=list, size=None)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cards', to='core.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', '-created_at'], name='core_card_cat_created_idx'), models.Index(fields=['-created_at', '-product'], name='core_card_created_idx'), models.Index(fields=['price', 'product'], name='core_card_price_idx'), django.contrib.postgres.indexes.GinIndex(fields=['size_keys'], name='core_card_size_keys_gin')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:44
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY — ცხრილი ჩაწერაზე არ იბლოკება; ტრანზაქციის გარეთ სრულდება
+    atomic = False
+
+
+    dependencies = [
+        ('core', '0005_image_renditions'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='core_product_cat_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='core_product_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['price', 'id'], name='core_product_price_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(django.db.models.functions.text.Upper('color'), name='core_product_color_upper_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='productcard',
+            index=models.Index(django.db.models.functions.text.Upper('color'), name='core_card_color_upper_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='productsize',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['size', 'product'], name='core_ps_instock_size_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('impressions', models.PositiveIntegerField(default=0)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='core.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='core_daily_stats_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'day'), name='core_daily_stats_product_day_uniq')],
+            },
+        ),
+    ]
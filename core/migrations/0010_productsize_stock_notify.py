@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:10
+
+from django.db import migrations
+
+
+# მარაგის ცვლილება -> NOTIFY core_stock (core/stock_stream.py); მიიწოდება commit-ზე,
+# ერთი ტრანზაქციის იდენტური payload-ები ერთდება
+NOTIFY_SQL = """
+CREATE OR REPLACE FUNCTION core_productsize_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('core_stock', json_build_object('product', OLD.product_id, 'id', OLD.id, 'stock', 0)::text);
+        RETURN OLD;
+    END IF;
+    IF TG_OP = 'INSERT' OR NEW.stock IS DISTINCT FROM OLD.stock THEN
+        PERFORM pg_notify('core_stock', json_build_object('product', NEW.product_id, 'id', NEW.id, 'stock', NEW.stock)::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_productsize_notify
+AFTER INSERT OR UPDATE OF stock OR DELETE ON core_productsize
+FOR EACH ROW EXECUTE FUNCTION core_productsize_notify();
+"""
+
+DROP_SQL = """
+DROP TRIGGER IF EXISTS core_productsize_notify ON core_productsize;
+DROP FUNCTION IF EXISTS core_productsize_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_product_daily_stats'),
+    ]
+
+    operations = [
+        migrations.RunSQL(NOTIFY_SQL, reverse_sql=DROP_SQL),
+    ]
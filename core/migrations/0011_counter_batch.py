@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_productsize_stock_notify'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('counts', models.JSONField()),
+            ],
+        ),
+    ]
@@ -1,4 +1,8 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.text import slugify
 
@@ -25,6 +29,16 @@ class ProductSize(models.Model):
     size = models.ForeignKey(Size, on_delete=models.CASCADE)
     stock = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            # ზომის ფილტრი / ფასეტები: მხოლოდ მარაგში არსებული ზომები
+            models.Index(
+                fields=['size', 'product'],
+                name='core_ps_instock_size_idx',
+                condition=models.Q(stock__gt=0),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.size.name} ({self.stock} in stock) for {self.product.name}" 
 
@@ -36,8 +50,28 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField(blank=True)
     main_image = models.ImageField(upload_to='products/main/')
+    # WebP/JPEG ვერსიები + placeholder (core/images.py), ივსება სიგნალიდან
+    main_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    main_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    main_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # full-text ძებნისთვის (core/search.py), ახლდება სიგნალებიდან
+    search_vector = SearchVectorField(null=True, editable=False)
+    # დროში მილეული გაყიდვები (core/popularity.py), ახლდება გადახდისას
+    popularity = models.FloatField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="core_product_search_gin"),
+            # სიები: კატეგორია + ახლები, ახლები, ფასით (pk — keyset tie-breaker)
+            models.Index(fields=["category", "-created_at", "-id"], name="core_product_cat_created_idx"),
+            models.Index(fields=["-created_at", "-id"], name="core_product_created_idx"),
+            models.Index(fields=["price", "id"], name="core_product_price_idx"),
+            models.Index(fields=["-popularity", "-id"], name="core_product_popular_idx"),
+            # color__iexact -> UPPER(color) = UPPER(%s)
+            models.Index(Upper("color"), name="core_product_color_upper_idx"),
+        ]
 
     def get_absolute_url(self):
         return reverse("core:product_detail", kwargs={"slug": self.slug})
@@ -52,4 +86,121 @@ class Product(models.Model):
     
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='products/extra/')
\ No newline at end of file
+    image = models.ImageField(upload_to='products/extra/')
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+
+
+class ProductCard(models.Model):
+    """
+    Listing გვერდების წასაკითხი (denormalized) ცხრილი — ერთი ჩანაწერი თითო პროდუქტზე.
+    ივსება core/cards.py-დან სიგნალებით; ხელით არ იცვლება.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='cards')
+    category_slug = models.SlugField(max_length=100)
+    color = models.CharField(max_length=100)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    # main_image, ან თუ არ აქვს — პირველი ProductImage
+    main_image = models.ImageField(upload_to='products/main/', blank=True)
+    main_image_width = models.PositiveIntegerField(null=True, blank=True)
+    main_image_height = models.PositiveIntegerField(null=True, blank=True)
+    main_image_renditions = models.JSONField(default=dict, blank=True)
+    in_stock = models.BooleanField(default=False)
+    total_stock = models.PositiveIntegerField(default=0)
+    # მარაგში არსებული ზომები: sizes ჩვენებისთვის, size_keys (lower) ფილტრისთვის
+    sizes = ArrayField(models.CharField(max_length=20), default=list, blank=True)
+    size_keys = ArrayField(models.CharField(max_length=20), default=list, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    popularity = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', '-created_at'], name='core_card_cat_created_idx'),
+            models.Index(fields=['-created_at', '-product'], name='core_card_created_idx'),
+            models.Index(fields=['price', 'product'], name='core_card_price_idx'),
+            models.Index(fields=['-popularity', '-product'], name='core_card_popular_idx'),
+            GinIndex(fields=['size_keys'], name='core_card_size_keys_gin'),
+            models.Index(Upper('color'), name='core_card_color_upper_idx'),
+        ]
+
+    def get_absolute_url(self):
+        return reverse("core:product_detail", kwargs={"slug": self.slug})
+
+    def __str__(self):
+        return self.name
+
+
+class RelatedProduct(models.Model):
+    """
+    "ერთად ყიდულობენ": თითო პროდუქტზე top-N მეზობელი შეკვეთების ისტორიიდან
+    (co-purchase cosine). ივსება core/related.py-ის batch-ით; ხელით არ იცვლება.
+    """
+    # (product, rank) unique ინდექსი product_id-ის ძებნასაც ფარავს
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='related_links', db_index=False)
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'rank'], name='core_related_product_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class ProductDailyStats(models.Model):
+    """
+    დღიური ნახვები / ძებნის impression-ები merchandising-ისთვის. მთვლელები
+    CounterBatch-ებში გროვდება და flush_counters-ით ერთი upsert-ით იწერება
+    (core/counters.py).
+    """
+    # (product, day) unique ინდექსი product_id-ის ძებნასაც ფარავს
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_stats', db_index=False)
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    impressions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'day'], name='core_daily_stats_product_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='core_daily_stats_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.day}: {self.views} views, {self.impressions} impressions"
+
+
+class CounterBatch(models.Model):
+    """
+    ერთი worker-ის buffer-ის push-ი: [[kind, product_id, day, n], ...].
+    flush_counters კრებს ProductDailyStats-ში და იმავე ტრანზაქციაში შლის.
+    """
+    created_at = models.DateTimeField(auto_now_add=True)
+    counts = models.JSONField()
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M:%S}: {len(self.counts)} counters"
+
+
+class SuggestionChange(models.Model):
+    """
+    typeahead-ის ცვლილებების ჟურნალი (core/autocomplete.py): პროდუქტის სახელის /
+    slug-ის / ფერის / კატეგორიის ცვლილება ან წაშლა (tombstone). worker-ები
+    ინდექსს მხოლოდ ამ სტრიქონებით ასწორებენ; სრული აგებისას ძველები იშლება.
+    """
+    # FK არა — tombstone წაშლილ პროდუქტზე მიუთითებს
+    product_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.product_id} {'deleted' if self.deleted else 'changed'} at {self.created_at:%Y-%m-%d %H:%M:%S}"
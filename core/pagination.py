@@ -0,0 +1,100 @@
+# core/pagination.py
+"""
+Keyset (cursor) პაგინაცია სიის გვერდებისთვის.
+
+OFFSET/COUNT(*)-ის ნაცვლად ვიმახსოვრებთ ბოლო ჩანაწერის სორტირების
+მნიშვნელობებს (მაგ. created_at + id) და შემდეგ გვერდს ვიღებთ
+`WHERE (created_at, id) < (...)` პირობით — ინდექსზე პირდაპირი სვლა.
+"შემდეგი გვერდი არის?" — ვიღებთ limit+1 ჩანაწერს.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PAGE_SIZE = 24
+
+# sort -> ordering. ბოლო ველი ყოველთვის pk-ა (tie-breaker), რომ რიგი ერთმნიშვნელოვანი იყოს;
+# pk და არა id — ProductCard-ის pk არის product_id.
+SORT_ORDERINGS = {
+    "": ("-created_at", "-pk"),
+    "newest": ("-created_at", "-pk"),
+    "price_asc": ("price", "pk"),
+    "price_desc": ("-price", "-pk"),
+    # დროში მილეული გაყიდვები (core/popularity.py)
+    "popular": ("-popularity", "-pk"),
+    # ძებნის შედეგები (core/search.py ანოტირებს rank-ს)
+    "relevance": ("-rank", "-pk"),
+}
+
+
+def ordering_for(sort):
+    return SORT_ORDERINGS.get((sort or "").strip(), SORT_ORDERINGS[""])
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """დეკოდირებული მნიშვნელობები ან None, თუ cursor დაზიანებულია."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    if not all(isinstance(v, str) for v in values):
+        return None
+    return values
+
+
+def after_q(ordering, values):
+    """
+    (f1, f2, ...) > (v1, v2, ...) — ყოველ ველს საკუთარი მიმართულებით:
+    f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...
+    """
+    q = Q()
+    equal = {}
+    for spec, value in zip(ordering, values):
+        name = spec.lstrip("-")
+        op = "lt" if spec.startswith("-") else "gt"
+        q |= Q(**equal, **{f"{name}__{op}": value})
+        equal[name] = value
+    return q
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    has_next: bool = False
+    next_cursor: str = ""
+
+
+def paginate(qs, ordering, cursor=None, per_page=PAGE_SIZE):
+    """
+    აბრუნებს KeysetPage-ს. COUNT(*) არ სრულდება — ვიღებთ per_page+1 ჩანაწერს.
+    """
+    qs = qs.order_by(*ordering)
+    values = decode_cursor(cursor, len(ordering))
+    if values is not None:
+        try:
+            qs = qs.filter(after_q(ordering, values))
+        except (ValidationError, ValueError, TypeError):
+            pass  # ხელით შეცვლილი cursor -> პირველი გვერდი
+
+    rows = list(qs[: per_page + 1])
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = ""
+    if has_next and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, spec.lstrip("-")) for spec in ordering])
+    return KeysetPage(items=rows, has_next=has_next, next_cursor=next_cursor)
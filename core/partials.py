@@ -0,0 +1,51 @@
+# core/partials.py
+"""
+HTMX ფრაგმენტები, რომლებიც თავიანთ კონტექსტს აცხადებენ.
+
+ერთ URL-ზე რამდენიმე პასუხი ბრუნდება (სრული გვერდი, ფილტრების panel,
+"load more" გვერდი). view აცხადებს, რომელ ფრაგმენტს კონტექსტის რომელი
+ნაწილები სჭირდება, get_context_data კი მხოლოდ self.needs-ში ჩამოთვლილებს ითვლის:
+
+    partials = {"filters": Partial("core/includes/catalog_filters.html", {"facets"})}
+    page_needs = {"listing", "heading", "facets"}
+
+    def get_partial(self):
+        return "filters" if self.request.GET.get("show_filter") else None
+"""
+from collections import namedtuple
+
+from django.template.response import TemplateResponse
+
+from .engines import engine_for
+
+Partial = namedtuple("Partial", "template needs")
+
+
+class PartialsMixin:
+    """get_partial() -> partials-ის გასაღები ან None (სრული გვერდი, page_needs)."""
+
+    partials = {}
+    page_needs = frozenset()
+    # engine_for()-ის სახელი (core/engines.py)
+    engine_name = None
+
+    def get_partial(self):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        partial = self.partials.get(self.get_partial())
+        self.needs = partial.needs if partial else self.page_needs
+        context = self.get_context_data(**kwargs)
+        template = partial.template if partial else self.template_name
+        return TemplateResponse(request, template, context, using=engine_for(self.engine_name))
+
+
+class AsyncPartialsMixin(PartialsMixin):
+    """იგივე, async get_context_data-ით (aget_context_data, core/async_views.py)."""
+
+    async def get(self, request, *args, **kwargs):
+        partial = self.partials.get(self.get_partial())
+        self.needs = partial.needs if partial else self.page_needs
+        context = await self.aget_context_data(**kwargs)
+        template = partial.template if partial else self.template_name
+        return TemplateResponse(request, template, context, using=engine_for(self.engine_name))
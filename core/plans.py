@@ -0,0 +1,200 @@
+# core/plans.py
+"""
+Query plan-ების baseline (core/plan_baseline.json).
+
+სინთეტიკური კატალოგი (core/seeding.py) + კალათები, გვერდები Client-ით, ყოველ
+SELECT-ზე EXPLAIN (FORMAT JSON) -> {"<label>[<წყარო>]": {fingerprint: შეჯამება}}.
+შეჯამება — Seq Scan-იანი ცხრილები და Sort კვანძების რაოდენობა.
+
+შემოწმება ტესტშია (core.tests.QueryPlanTests) — სატესტო ბაზაზე, რომ dev
+ბაზის მონაცემები plan-ებს არ ცვლიდეს. შეცდომაა მხოლოდ რეგრესია: Seq Scan
+ცხრილზე ან Sort, რომელიც baseline-ში არ იყო. გამქრალი query, ახალი query
+baseline-ის scan-ებით და გაუმჯობესება — არა. seed-ი დიდია (~1 წთ), ამიტომ
+ტესტი ჩვეულებრივ `manage.py test`-ში არ ეშვება — მხოლოდ RUN_PLAN_TESTS=1-ით
+(CI) ან baseline-ის განახლებისას. baseline შეგნებულად ახლდება (ახალი index /
+query) და მისი diff-ი commit-ში ჩანს:
+
+    RUN_PLAN_TESTS=1 python manage.py test core.tests.QueryPlanTests
+    UPDATE_PLAN_BASELINE=1 python manage.py test core.tests.QueryPlanTests
+"""
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cart.models import Cart, CartItem
+
+from .caching import CATALOG, CATEGORIES, SIZES, bump
+from .models import ProductSize
+from .seeding import COLORS, seed_catalog
+
+# baseline ამ ზომაზეა ჩაწერილი — სხვა ზომაზე plan-ები სხვაა
+PRODUCTS = 50_000
+CARTS = 5_000
+SEEDED_TABLES = (
+    "core_category", "core_size", "core_product", "core_productcard", "core_productsize",
+    "cart_cart", "cart_cartitem",
+)
+BASELINE = Path(__file__).resolve().parent / "plan_baseline.json"
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def normalize(sql):
+    """ლიტერალების გარეშე — ერთი და იგივე query სხვა id-ებით/ფილტრით ერთნაირად გამოიყურება."""
+    return " ".join(_LIST_RE.sub("(?)", _LITERAL_RE.sub("?", sql)).split())
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize(sql).encode()).hexdigest()[:12]
+
+
+def summarize(plan):
+    """plan-ის ხე -> {"seq_scans": [ცხრილები], "sorts": Sort კვანძების რაოდენობა}."""
+    seq_scans, sorts = set(), 0
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+        elif node["Node Type"] == "Sort":
+            sorts += 1
+        stack.extend(node.get("Plans", ()))
+    return {"seq_scans": sorted(seq_scans), "sorts": sorts}
+
+
+def explain(sql):
+    with connection.cursor() as cur:
+        cur.execute("EXPLAIN (FORMAT JSON) " + sql)
+        raw = cur.fetchone()[0]
+    data = json.loads(raw) if isinstance(raw, str) else raw
+    return summarize(data[0]["Plan"])
+
+
+def vacuum():
+    """
+    rollback-ის შემდეგ (წინა ტესტები) ცხრილებში dead tuple-ები რჩება და
+    plan-ებს ცვლის — ტრანზაქციის გარეთ, seed-ამდე.
+    """
+    with connection.cursor() as cur:
+        cur.execute("VACUUM " + ", ".join(SEEDED_TABLES))
+
+
+def seed_carts(n_carts, products, seed=42):
+    rng = random.Random(seed)
+    carts = Cart.objects.bulk_create(Cart(session_key=f"bench-{i}") for i in range(n_carts))
+    sizes = dict(ProductSize.objects.filter(product__in=products).values_list("product_id", "id"))
+    items = []
+    for cart in carts:
+        for p in rng.sample(products, 3):
+            items.append(CartItem(cart=cart, product=p, product_size_id=sizes[p.pk], quantity=1))
+    CartItem.objects.bulk_create(items, batch_size=5000)
+
+
+def seed(n_products=PRODUCTS, n_carts=CARTS):
+    """ტრანზაქციაში (ბოლოს rollback): კატალოგი, კალათები, სრული სტატისტიკა."""
+    products = seed_catalog(n_products)
+    seed_carts(n_carts, products)
+    with connection.cursor() as cur:
+        # ANALYZE 300 * target სტრიქონს იღებს შემთხვევით — სრული ნიმუში = სტაბილური plan-ები
+        cur.execute("SET LOCAL default_statistics_target = 1000")
+        cur.execute("ANALYZE " + ", ".join(SEEDED_TABLES))
+    return products
+
+
+def scenarios(category_slug, product_slug):
+    """(label, url) — ყოველი view და მისი ძირითადი ფილტრები."""
+    return [
+        ("home", "/"),
+        ("catalog", "/catalog/"),
+        ("catalog_category", f"/catalog/{category_slug}/"),
+        ("catalog_price", "/catalog/?min_price=50&max_price=120&sort=price_asc"),
+        ("catalog_color", f"/catalog/?color={COLORS[0].lower()}"),
+        ("catalog_size", "/catalog/?size=M&sort=price_desc"),
+        ("catalog_popular", "/catalog/?sort=popular"),
+        ("search", "/search/?q=wool"),
+        ("search_filtered", "/search/?q=leather&color=Black&sort=price_asc"),
+        ("product", f"/product/{product_slug}/"),
+        ("cart", "/cart/"),
+    ]
+
+
+def collect(products):
+    """{"<label>[<წყარო>]": {fingerprint: {"sql": ..., "seq_scans": ..., "sorts": ...}}}"""
+    product = products[len(products) // 2]
+    client = Client()
+    results = {}
+    # ორივე წყარო: ProductCard read model და ძველი Product query-ები
+    for read_model in (True, False):
+        source = "card" if read_model else "product"
+        with override_settings(CATALOG_READ_MODEL=read_model, ALLOWED_HOSTS=["testserver"]):
+            # სესია + კალათა პირველი "add to cart"-ით იქმნება (cart/middleware.py)
+            if "cart_key" not in client.session:
+                seed_items = products[:5]
+                sizes = dict(ProductSize.objects.filter(product__in=seed_items).values_list("product_id", "id"))
+                for p in seed_items:
+                    client.post(reverse("cart:add_to_cart", args=[p.slug]), {"size_id": sizes[p.pk]}, secure=True)
+            for label, url in scenarios(product.category.slug, product.slug):
+                # ქეშის გვერდის ავლით — ყველა query რეალურად უნდა შესრულდეს
+                bump(CATALOG)
+                bump(CATEGORIES)
+                bump(SIZES)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(url, secure=True)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url}: HTTP {response.status_code}")
+                plans = {}
+                for query in ctx.captured_queries:
+                    sql = query["sql"]
+                    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                        continue
+                    plans[fingerprint(sql)] = {"sql": normalize(sql)[:160], **explain(sql)}
+                results[f"{label}[{source}]"] = plans
+    return results
+
+
+def load_baseline():
+    return json.loads(BASELINE.read_text())
+
+
+def write_baseline(results):
+    BASELINE.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def _regressions(plan, seq_scans, sorts):
+    """რა აქვს plan-ს baseline-ზე მეტი: ახალი Seq Scan ცხრილები და Sort-ები."""
+    found = []
+    new_scans = sorted(set(plan["seq_scans"]) - set(seq_scans))
+    if new_scans:
+        found.append(f"Seq Scan on {new_scans}")
+    if plan["sorts"] > sorts:
+        found.append(f"{plan['sorts']} Sort node(s), baseline {sorts}")
+    return found
+
+
+def compare(baseline, results):
+    """
+    რეგრესიების სია. query baseline-ს fingerprint-ით ედარება; ახალი query
+    (fingerprint baseline-ში არაა) — იმავე view-ის baseline-ის ყველა Seq Scan
+    ცხრილს და მის მაქსიმალურ Sort-ების რაოდენობას.
+    """
+    failures = []
+    for view, plans in sorted(results.items()):
+        base_plans = baseline.get(view, {})
+        view_scans = {t for p in base_plans.values() for t in p["seq_scans"]}
+        view_sorts = max((p["sorts"] for p in base_plans.values()), default=0)
+        for fp, plan in sorted(plans.items()):
+            base = base_plans.get(fp)
+            if base is not None:
+                found = _regressions(plan, base["seq_scans"], base["sorts"])
+            else:
+                found = _regressions(plan, view_scans, view_sorts)
+            failures.extend(f"{view} {fp}: {problem}: {plan['sql'][:100]}" for problem in found)
+    return failures
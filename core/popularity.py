@@ -0,0 +1,77 @@
+# core/popularity.py
+"""
+პოპულარობა: დროში ექსპონენციალურად მილეული გაყიდული ერთეულები.
+
+score(t) = Σ quantity · e^(-λ·(t - tᵢ)), λ = ln 2 / HALF_LIFE. ყველა
+პროდუქტის score ერთი და იგივე e^(-λ·t) მამრავლით ილევა, ამიტომ რიგისთვის
+საკმარისია ინახებოდეს Σ quantity · e^(λ·(tᵢ - EPOCH)) — ძველი ჩანაწერები
+არასდროს გადაითვლება, ახალი გაყიდვა კი ერთი `F() + w` UPDATE-ია
+(Product.popularity და ProductCard.popularity, ინდექსით -popularity, -pk).
+w ყოველ HALF_LIFE-ში ორმაგდება: 14 დღეზე float8 ~39 წელს ჰყოფნის.
+
+    record_sales([(product_id, quantity), ...])   # payment/views.py: stripe_webhook, გადახდისას
+    python manage.py rebuild_popularity           # ერთჯერადად ისტორიიდან
+"""
+import math
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .caching import POPULARITY, bump_on_commit
+from .models import Product, ProductCard
+
+HALF_LIFE = timedelta(days=14)
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+DECAY = math.log(2) / HALF_LIFE.total_seconds()
+# შეკვეთის სტატუსები, რომლებიც გაყიდვად ითვლება (გადახდილი)
+PAID_STATUSES = ("processing", "shipped", "delivered")
+
+
+def weight(at):
+    return math.exp(DECAY * (at - EPOCH).total_seconds())
+
+
+def current_score(stored, now=None):
+    """შენახული მნიშვნელობა -> "ამჟამინდელი" მილეული ერთეულები (ჩვენებისთვის)."""
+    return stored / weight(now or timezone.now())
+
+
+def record_sales(items, at=None):
+    """items — (product_id, quantity); იმავე ტრანზაქციაში, სადაც შეკვეთა გადახდილად მოინიშნა."""
+    w = weight(at or timezone.now())
+    totals = Counter()
+    for product_id, quantity in items:
+        totals[product_id] += quantity
+    # pk-ის რიგით — პარალელური შეკვეთები სტრიქონებს ერთნაირი რიგით ბლოკავენ
+    for product_id in sorted(totals):
+        delta = totals[product_id] * w
+        Product.objects.filter(pk=product_id).update(popularity=F("popularity") + delta)
+        ProductCard.objects.filter(pk=product_id).update(popularity=F("popularity") + delta)
+    if totals:
+        bump_on_commit(POPULARITY)
+
+
+REBUILD_SQL = """
+UPDATE core_product p
+   SET popularity = COALESCE((
+       SELECT SUM(oi.quantity * exp(%(decay)s * extract(epoch FROM o.created_at - %(epoch)s)::float8))
+         FROM orders_orderitem oi
+         JOIN orders_order o ON o.id = oi.order_id
+        WHERE oi.product_id = p.id AND o.status = ANY(%(statuses)s)
+   ), 0)
+"""
+
+
+@transaction.atomic
+def rebuild_popularity():
+    """სრული გადათვლა ისტორიიდან (შეკვეთის created_at-ით) — მხოლოდ საწყისი შევსებისთვის."""
+    with connection.cursor() as cur:
+        cur.execute(REBUILD_SQL, {"decay": DECAY, "epoch": EPOCH, "statuses": list(PAID_STATUSES)})
+        cur.execute(
+            "UPDATE core_productcard c SET popularity = p.popularity"
+            "  FROM core_product p WHERE p.id = c.product_id AND c.popularity <> p.popularity"
+        )
+    bump_on_commit(POPULARITY)
@@ -0,0 +1,97 @@
+# core/related.py
+"""
+"Related products" შეკვეთების ისტორიიდან (offline batch).
+
+X — შეკვეთა × პროდუქტი ბინარული sparse მატრიცა (orders.OrderItem-იდან),
+C = Xᵀ·X — რამდენ შეკვეთაში შეხვდა ორი პროდუქტი ერთად, მსგავსება კი
+cosine: C[i, j] / sqrt(n_i · n_j), სადაც n_i — პროდუქტის შეკვეთების რიცხვი.
+ყოველი სტრიქონიდან top-N (argpartition) იწერება RelatedProduct-ში;
+პროდუქტის გვერდი მათ ერთი ინდექსური query-ით კითხულობს (core/views.py),
+ისტორიის არქონისას კი იმავე კატეგორიის პროდუქტებს აჩვენებს.
+
+    python manage.py build_related --top 8 --days 365
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from .caching import CATALOG, bump_on_commit
+from .models import RelatedProduct
+
+TOP_N = 8
+# რამდენ შეკვეთაში მაინც უნდა შეხვდნენ ერთად — ერთჯერადი დამთხვევა ხმაურია
+MIN_SUPPORT = 2
+LOOKBACK_DAYS = 365
+
+
+def load_pairs(days=LOOKBACK_DAYS):
+    """(order_ids, product_ids) int64 მასივები; გაუქმებული შეკვეთების გარეშე."""
+    from orders.models import OrderItem
+
+    qs = OrderItem.objects.exclude(order__status="canceled")
+    if days:
+        qs = qs.filter(order__created_at__gte=timezone.now() - timedelta(days=days))
+    rows = np.fromiter(
+        (v for pair in qs.values_list("order_id", "product_id").iterator(chunk_size=10_000) for v in pair),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    return rows[:, 0], rows[:, 1]
+
+
+def similarity(order_ids, product_ids, min_support=MIN_SUPPORT):
+    """-> (products, S): products[i] — S-ის i-ე სტრიქონის/სვეტის product_id, S — CSR cosine."""
+    orders, row = np.unique(order_ids, return_inverse=True)
+    products, col = np.unique(product_ids, return_inverse=True)
+    x = sparse.csr_matrix((np.ones(len(row)), (row, col)), shape=(len(orders), len(products)))
+    # ერთი პროდუქტი ერთ შეკვეთაში რამდენჯერმე (სხვა ზომა) -> 1
+    x.data[:] = 1
+    co = (x.T @ x).tocsr()
+    counts = co.diagonal()
+    co.setdiag(0)
+    if min_support > 1:
+        co.data[co.data < min_support] = 0
+    co.eliminate_zeros()
+    norm = sparse.diags(1 / np.sqrt(np.maximum(counts, 1)))
+    return products, (norm @ co @ norm).tocsr()
+
+
+def top_neighbours(products, s, top_n=TOP_N):
+    """S-ის ყოველი სტრიქონიდან top_n -> [(product_id, related_id, rank, score)]."""
+    result = []
+    for i in range(s.shape[0]):
+        start, end = s.indptr[i], s.indptr[i + 1]
+        if start == end:
+            continue
+        scores = s.data[start:end]
+        cols = s.indices[start:end]
+        k = min(top_n, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        # თანაბარ score-ზე პატარა id პირველი — შედეგი დეტერმინისტულია
+        best = best[np.lexsort((products[cols[best]], -scores[best]))]
+        result.extend(
+            (int(products[i]), int(products[cols[j]]), rank, float(scores[j]))
+            for rank, j in enumerate(best)
+        )
+    return result
+
+
+@transaction.atomic
+def build_related(top_n=TOP_N, days=LOOKBACK_DAYS, min_support=MIN_SUPPORT):
+    """ცხრილის სრული ჩანაცვლება ერთ ტრანზაქციაში; აბრუნებს (პროდუქტები, ჩანაწერები)."""
+    order_ids, product_ids = load_pairs(days)
+    links = []
+    if len(order_ids):
+        products, s = similarity(order_ids, product_ids, min_support)
+        links = top_neighbours(products, s, top_n)
+
+    RelatedProduct.objects.all().delete()
+    RelatedProduct.objects.bulk_create(
+        (RelatedProduct(product_id=p, related_id=r, rank=rank, score=score) for p, r, rank, score in links),
+        batch_size=5000,
+    )
+    # პროდუქტის გვერდის ETag catalog თაობას შეიცავს
+    bump_on_commit(CATALOG)
+    return len({link[0] for link in links}), len(links)
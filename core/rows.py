@@ -0,0 +1,79 @@
+# core/rows.py
+"""
+სიის ბარათების მსუბუქი ჩანაწერები: values_list -> __slots__ ობიექტი მოდელის
+instance-ის ნაცვლად. არც Model.__init__, არც _state / __dict__, არც
+select_related-ის Category — მხოლოდ ის ველები, რასაც ბარათის შაბლონები
+(core/includes/cards/) და product_card ქეშის გასაღები კითხულობენ.
+
+    rows = fetch_rows(listing_queryset().filter(pk__in=ids))
+"""
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+# Product-სა და ProductCard-ზე ერთნაირი სახელებით
+ROW_FIELDS = (
+    "pk", "name", "slug", "price", "color", "main_image", "main_image_renditions",
+    "created_at", "updated_at", "category_id",
+)
+
+
+class ImageRef:
+    """FieldFile-ის ის ნაწილი, რასაც შაბლონები იყენებს: name, url, bool()."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name or ""
+
+    def __bool__(self):
+        return bool(self.name)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+
+class ProductRow:
+    """ბარათის მონაცემები; headline — ძებნის ფრაგმენტი (core/listing.py ავსებს)."""
+
+    __slots__ = (*ROW_FIELDS, "headline")
+
+    def __init__(self, pk, name, slug, price, color, main_image, main_image_renditions,
+                 created_at, updated_at, category_id):
+        self.pk = pk
+        self.name = name
+        self.slug = slug
+        self.price = price
+        self.color = color
+        self.main_image = ImageRef(main_image)
+        self.main_image_renditions = main_image_renditions
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.category_id = category_id
+        self.headline = ""
+
+    @property
+    def id(self):
+        return self.pk
+
+    def get_absolute_url(self):
+        return reverse("core:product_detail", kwargs={"slug": self.slug})
+
+    def __repr__(self):
+        return f"<ProductRow {self.pk}: {self.name}>"
+
+    def __str__(self):
+        return self.name
+
+
+def fetch_rows(qs):
+    """Product / ProductCard queryset (დაჭრილიც) -> [ProductRow] იმავე რიგით."""
+    return [ProductRow(*row) for row in qs.values_list(*ROW_FIELDS)]
+
+
+async def afetch_rows(qs):
+    """fetch_rows async ORM-ით (core/async_views.py)."""
+    return [ProductRow(*row) async for row in qs.values_list(*ROW_FIELDS)]
@@ -0,0 +1,102 @@
+# core/search.py
+"""
+PostgreSQL full-text ძებნა პროდუქტებზე.
+
+Product.search_vector ინახავს წონიან tsvector-ს (name=A, category/color=B,
+description=C) და GIN ინდექსით იძებნება. ვექტორი ახლდება სიგნალებიდან
+(core/signals.py) მხოლოდ შეცვლილი პროდუქტებისთვის.
+"""
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Product
+
+SEARCH_CONFIG = "english"
+
+# ts_headline-ის მარკერები — HTML-ს თვითონ ვაწყობთ escape-ის შემდეგ
+_HL_START, _HL_STOP = "\x02", "\x03"
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def product_vector():
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("category__name", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("color", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(qs):
+    """
+    ერთი UPDATE-ით გადაითვლის ვექტორს qs-ის პროდუქტებისთვის.
+    category__name join-ი subquery-შია, რადგან UPDATE join-ს არ უშვებს.
+    """
+    vector = (
+        Product.objects.filter(pk=OuterRef("pk"))
+        .annotate(v=product_vector())
+        .values("v")[:1]
+    )
+    return qs.update(search_vector=Subquery(vector))
+
+
+def build_query(text):
+    """
+    ყოველი სიტყვა prefix-ით და AND-ით (როგორც ძველი icontains-ის ჯაჭვი),
+    მაგ. "wool jack" -> wool:* & jack:*. None, თუ საძიებო სიტყვა არ დარჩა.
+    """
+    terms = _TERM_RE.findall(text or "")
+    if not terms:
+        return None
+    raw = " & ".join(f"{term}:*" for term in terms)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def search_products(qs, query):
+    """
+    ფილტრავს და ანოტირებს `rank`-ით. Cast float8-ზე საჭიროა keyset cursor-ისთვის:
+    ts_rank float4-ს აბრუნებს და ტექსტად დაბრუნებისას სიზუსტე იკარგება.
+    ProductCard-ზე ვექტორი product-ის join-ით (pk = product_id) მოდის.
+    """
+    field = "search_vector" if qs.model is Product else "product__search_vector"
+    return qs.filter(**{field: query}).annotate(
+        rank=Cast(SearchRank(F(field), query), FloatField())
+    )
+
+
+def get_headlines(ids, query):
+    """
+    ts_headline მხოლოდ მოცემულ პროდუქტებზე (ერთი query) -> {pk: უსაფრთხო HTML <mark>-ებით}.
+    """
+    if not ids:
+        return {}
+    rows = (
+        Product.objects.filter(pk__in=ids)
+        .annotate(
+            hl=SearchHeadline(
+                "description",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=_HL_START,
+                stop_sel=_HL_STOP,
+                max_words=25,
+                min_words=10,
+            )
+        )
+        .values_list("pk", "hl")
+    )
+    return {
+        pk: mark_safe(escape(text or "").replace(_HL_START, "<mark>").replace(_HL_STOP, "</mark>"))
+        for pk, text in rows
+    }
+
@@ -0,0 +1,51 @@
+# core/seeding.py
+"""
+სინთეტიკური კატალოგი ბენჩმარკებისთვის (manage.py bench ...).
+გამოიძახეთ transaction.atomic()-ში და ბოლოს rollback — რეალურ მონაცემებს არ ეხება.
+"""
+import random
+from decimal import Decimal
+
+from .cards import rebuild_all_cards
+from .models import Category, Product, ProductSize, Size
+from .search import update_search_vectors
+
+ADJECTIVES = ["classic", "slim", "oversized", "vintage", "waterproof", "soft", "summer", "winter", "light", "warm"]
+MATERIALS = ["wool", "cotton", "leather", "denim", "linen", "silk", "suede", "fleece", "nylon", "cashmere"]
+ITEMS = ["jacket", "shirt", "sneaker", "boot", "hat", "scarf", "dress", "jeans", "hoodie", "bag", "coat", "skirt"]
+COLORS = ["Black", "White", "Red", "Blue", "Green", "Beige", "Grey", "Navy", "Brown", "Pink"]
+CATEGORIES = ["Jackets", "Shirts", "Shoes", "Accessories", "Dresses", "Trousers", "Knitwear", "Bags"]
+SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+
+
+def seed_catalog(n_products, seed=42, batch_size=5000):
+    rng = random.Random(seed)
+    cats = [Category.objects.get_or_create(name=f"Bench {c}", slug=f"bench-{c.lower()}")[0] for c in CATEGORIES]
+    sizes = [Size.objects.get_or_create(name=s)[0] for s in SIZES]
+
+    products = []
+    for i in range(n_products):
+        adj, mat, item = rng.choice(ADJECTIVES), rng.choice(MATERIALS), rng.choice(ITEMS)
+        products.append(
+            Product(
+                name=f"{adj.title()} {mat} {item}",
+                slug=f"bench-{i}",
+                category=rng.choice(cats),
+                color=rng.choice(COLORS),
+                price=Decimal(rng.randint(500, 50000)) / 100,
+                description=f"A {adj} {item} made from {mat}. " * rng.randint(1, 4),
+                main_image=f"products/main/bench-{i}.jpg",
+            )
+        )
+    products = Product.objects.bulk_create(products, batch_size=batch_size)
+
+    sizes_rows = []
+    for p in products:
+        for s in rng.sample(sizes, rng.randint(1, 4)):
+            sizes_rows.append(ProductSize(product=p, size=s, stock=rng.choice([0, 0, 1, 5, 20])))
+    ProductSize.objects.bulk_create(sizes_rows, batch_size=batch_size)
+
+    # bulk_create სიგნალებს არ უშვებს
+    update_search_vectors(Product.objects.filter(slug__startswith="bench-"))
+    rebuild_all_cards()
+    return products
@@ -0,0 +1,124 @@
+# core/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from jobs.registry import enqueue
+
+from .autocomplete import record_change
+from .caching import CATALOG, CATEGORIES, SIZES, bump_on_commit
+from .cards import schedule_refresh
+from .images import image_fields, is_current
+from .models import Category, Product, ProductImage, ProductSize, Size
+from .search import update_search_vectors
+
+SEARCH_FIELDS = {"name", "color", "description", "category", "category_id"}
+# typeahead-ში მხოლოდ ესენი ჩანს (core/autocomplete.py)
+SUGGEST_FIELDS = {"name", "slug", "color", "category", "category_id"}
+
+
+# -----------------------------
+# Full-text search vector
+# -----------------------------
+@receiver(post_save, sender=Product)
+def product_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category)
+def category_search_vector(sender, instance, created, **kwargs):
+    # ახალ კატეგორიას პროდუქტები ჯერ არ აქვს
+    if not created:
+        update_search_vectors(Product.objects.filter(category_id=instance.pk))
+
+
+# -----------------------------
+# Typeahead journal
+# -----------------------------
+@receiver(post_save, sender=Product)
+def product_suggestions(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SUGGEST_FIELDS.intersection(update_fields):
+        return
+    record_change(instance.pk)
+
+
+@receiver(post_delete, sender=Product)
+def product_suggestions_tombstone(sender, instance, **kwargs):
+    record_change(instance.pk, deleted=True)
+
+
+# -----------------------------
+# ProductCard read model
+# -----------------------------
+@receiver(post_save, sender=Product)
+def product_card(sender, instance, **kwargs):
+    schedule_refresh([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ProductSize)
+@receiver([post_save, post_delete], sender=ProductImage)
+def product_child_card(sender, instance, **kwargs):
+    schedule_refresh([instance.product_id])
+
+
+@receiver(post_save, sender=Category)
+def category_cards(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(Product.objects.filter(category_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Size)
+def size_cards(sender, instance, created, **kwargs):
+    if not created:
+        schedule_refresh(
+            ProductSize.objects.filter(size_id=instance.pk).values_list("product_id", flat=True)
+        )
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def product_image_touch(sender, instance, **kwargs):
+    # ბარათზე პირველი ფოტო შეიძლება ProductImage-იდან მოდიოდეს, HTML კი
+    # product-ის updated_at-ით იქეშება (core/templatetags/card_tags.py)
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+
+
+# -----------------------------
+# Image renditions
+# -----------------------------
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductImage)
+def image_renditions(sender, instance, update_fields=None, **kwargs):
+    file_field, meta_field, _, _ = image_fields(sender)
+    if update_fields is not None and file_field not in update_fields:
+        return
+    field_file, meta = getattr(instance, file_field), getattr(instance, meta_field)
+    if is_current(field_file, meta) or (not field_file and not meta):
+        return
+    # Pillow-ს სამუშაო worker-ში (core/tasks.py); Job იმავე ტრანზაქციაშია
+    enqueue("core.image_renditions", model=sender._meta.label_lower, pk=instance.pk)
+
+
+# -----------------------------
+# Cache generations
+# -----------------------------
+@receiver([post_save, post_delete], sender=Category)
+def category_generation(sender, **kwargs):
+    bump_on_commit(CATEGORIES, CATALOG)
+
+
+@receiver([post_save, post_delete], sender=Size)
+def size_generation(sender, **kwargs):
+    bump_on_commit(SIZES, CATALOG)
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_generation(sender, instance, **kwargs):
+    bump_on_commit(CATALOG, product_ids=[instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ProductSize)
+@receiver([post_save, post_delete], sender=ProductImage)
+def product_child_generation(sender, instance, **kwargs):
+    bump_on_commit(CATALOG, product_ids=[instance.product_id])
@@ -0,0 +1,184 @@
+# core/stock_stream.py
+"""
+პროდუქტის გვერდზე მარაგის live განახლება (Server-Sent Events, ASGI).
+
+- წყარო: ProductSize-ის trigger (migrations/0010) -> NOTIFY core_stock
+  {"product", "id", "stock"}. პროცესში ერთი LISTEN კავშირია (StockHub),
+  რომელიც ცვლილებას ამ პროდუქტის ყველა გახსნილ stream-ს ურიგებს.
+- fallback: STOCK_STREAM_BACKEND="poll" (ან LISTEN-ის ჩავარდნისას) — ერთი
+  query POLL_INTERVAL-ში, მხოლოდ იმ პროდუქტებზე, რომლებსაც ვინმე უყურებს.
+- კლიენტი ნელა კითხულობს? Subscription ცვლილებებს აერთებს ({ps_id: stock}),
+  რიგი არ იზრდება და ბოლო მნიშვნელობა არ იკარგება.
+
+    GET /product/<pk>/stock/  ->  event: stock / data: {"<ProductSize.id>": stock, ...}
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import weakref
+
+import psycopg
+from django.conf import settings
+from django.db import connection
+from psycopg.conninfo import make_conninfo
+
+from .models import ProductSize
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "core_stock"
+POLL_INTERVAL = 2.0
+RETRY_DELAY = 5.0
+# კომენტარი-ping: proxy-ები უმოქმედო კავშირს არ წყვეტენ, გაწყვეტილი კლიენტიც ჩნდება
+HEARTBEAT = 20.0
+# EventSource-ის ხელახალი მიერთება (ms)
+CLIENT_RETRY = 5000
+
+
+def conninfo():
+    db = settings.DATABASES["default"]
+    params = {
+        "dbname": db.get("NAME"),
+        "user": db.get("USER"),
+        "password": db.get("PASSWORD"),
+        "host": db.get("HOST"),
+        "port": db.get("PORT"),
+        "sslmode": db.get("OPTIONS", {}).get("sslmode"),
+    }
+    return make_conninfo(**{k: v for k, v in params.items() if v})
+
+
+async def load_stock(product_ids):
+    """{product_id: {ps_id: stock}}"""
+    result = {pk: {} for pk in product_ids}
+    qs = ProductSize.objects.filter(product_id__in=product_ids).values_list("product_id", "id", "stock")
+    async for product_id, ps_id, stock in qs:
+        result[product_id][ps_id] = stock
+    return result
+
+
+class Subscription:
+    __slots__ = ("product_id", "pending", "ready", "__weakref__")
+
+    def __init__(self, product_id):
+        self.product_id = product_id
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, changes):
+        self.pending.update(changes)
+        self.ready.set()
+
+    async def next(self, timeout):
+        """დაგროვილი ცვლილებები; TimeoutError, თუ timeout-ში არაფერი მოვიდა."""
+        await asyncio.wait_for(self.ready.wait(), timeout)
+        self.ready.clear()
+        changes, self.pending = self.pending, {}
+        return changes
+
+
+class StockHub:
+    """ერთი upstream (LISTEN ან polling) event loop-ზე -> ყველა Subscription."""
+
+    def __init__(self):
+        # WeakSet: stream, რომელიც დაწყებამდე გაწყდა, თავისით ქრება
+        self.subscribers = {}
+        self._task = None
+        self._loop = None
+
+    def subscribe(self, product_id):
+        self._ensure_running()
+        subscription = Subscription(product_id)
+        self.subscribers.setdefault(product_id, weakref.WeakSet()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subs = self.subscribers.get(subscription.product_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self.subscribers[subscription.product_id]
+
+    def watched(self):
+        return [pk for pk, subs in list(self.subscribers.items()) if subs]
+
+    def publish(self, product_id, changes):
+        for subscription in list(self.subscribers.get(product_id, ())):
+            subscription.push(changes)
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            # ცარიელი context: მოთხოვნის contextvars-ში asgiref-ის executor-ია, რომელიც
+            # მოთხოვნასთან ერთად კვდება — ORM query-ები მერე ვეღარ გაეშვებოდა
+            self._task = loop.create_task(self._run(), name="stock-stream", context=contextvars.Context())
+
+    async def _run(self):
+        backend = settings.STOCK_STREAM_BACKEND if connection.vendor == "postgresql" else "poll"
+        while True:
+            try:
+                if backend == "listen":
+                    await self._listen()
+                else:
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # LISTEN ვერ მუშაობს (მაგ. pgbouncer transaction pooling) — polling-ზე გადავდივართ
+                logger.exception("stock stream upstream (%s) failed", backend)
+                backend = "poll"
+                await asyncio.sleep(RETRY_DELAY)
+
+    async def _resync(self):
+        """(ხელახალი) მიერთებისას: გამოტოვებული ცვლილებების ნაცვლად მიმდინარე მარაგი."""
+        ids = self.watched()
+        if ids:
+            for product_id, sizes in (await load_stock(ids)).items():
+                self.publish(product_id, sizes)
+
+    async def _listen(self):
+        async with await psycopg.AsyncConnection.connect(conninfo(), autocommit=True) as conn:
+            await conn.execute(f"LISTEN {CHANNEL}")
+            await self._resync()
+            async for notify in conn.notifies():
+                data = json.loads(notify.payload)
+                self.publish(data["product"], {data["id"]: data["stock"]})
+
+    async def _poll(self):
+        last = {}
+        while True:
+            ids = self.watched()
+            current = await load_stock(ids) if ids else {}
+            for product_id, sizes in current.items():
+                before = last.get(product_id, {})
+                changes = {ps_id: stock for ps_id, stock in sizes.items() if before.get(ps_id) != stock}
+                # წაშლილი ზომა = მარაგი 0
+                changes.update({ps_id: 0 for ps_id in before.keys() - sizes.keys()})
+                if changes:
+                    self.publish(product_id, changes)
+            last = current
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+hub = StockHub()
+
+
+def _event(changes):
+    return f"event: stock\ndata: {json.dumps({str(k): v for k, v in changes.items()})}\n\n"
+
+
+async def stock_events(subscription, snapshot):
+    """SSE სტრიქონები: ჯერ მიმდინარე მარაგი, შემდეგ ცვლილებები; ping HEARTBEAT-ში ერთხელ."""
+    try:
+        yield f"retry: {CLIENT_RETRY}\n" + _event(snapshot)
+        while True:
+            try:
+                changes = await subscription.next(HEARTBEAT)
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield _event(changes)
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,49 @@
+# core/tasks.py
+"""ფონური დავალებები (jobs app)."""
+from django.apps import apps
+from django.utils import timezone
+
+from jobs.registry import CACHE, EXPORTS, MEDIA, task
+
+from .caching import CATALOG, PRODUCT, bump
+from .cards import refresh_cards
+from .counters import flush_counters as flush
+from .exports import build_exports as build_export_files
+from .images import process_instance
+from .models import Product
+
+
+@task("core.image_renditions", queue="images", max_attempts=3, shares=(CACHE, MEDIA))
+def image_renditions(model, pk):
+    """model — "core.product" / "core.productimage" (core/signals.py-დან)."""
+    instance = apps.get_model(model).objects.filter(pk=pk).first()
+    if instance is None:
+        return  # ჩანაწერი სანამ worker მივიდოდა, წაიშალა
+    if process_instance(instance):
+        # update() სიგნალებს არ უშვებს — updated_at (ბარათის HTML-ის გასაღები),
+        # ბარათი და თაობები აქ
+        product_id = instance.pk if model == "core.product" else instance.product_id
+        Product.objects.filter(pk=product_id).update(updated_at=timezone.now())
+        refresh_cards([product_id])
+        bump(CATALOG)
+        bump(PRODUCT, product_id)
+
+
+@task("core.build_related", max_attempts=2, shares=(CACHE,))
+def build_related(top_n=8, days=365, min_support=2):
+    """co-purchase მეზობლები (core/related.py); NumPy/SciPy მხოლოდ worker-ში იტვირთება."""
+    from .related import build_related as build
+
+    build(top_n=top_n, days=days, min_support=min_support)
+
+
+@task("core.flush_counters", max_attempts=1)
+def flush_counters():
+    """ნახვები/impression-ები CounterBatch-ებიდან ProductDailyStats-ში (core/counters.py)."""
+    flush()
+
+
+@task("core.build_exports", max_attempts=2, shares=(EXPORTS,))
+def build_exports(full=False):
+    """sitemap / shopping feed shard-ები (core/exports.py)."""
+    build_export_files(full=full)
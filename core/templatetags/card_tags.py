@@ -0,0 +1,89 @@
+import hashlib
+import time
+from functools import cache
+
+from django import template
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import get_template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.caching import tiered
+
+register = template.Library()
+
+CARD_TEMPLATES = {
+    "catalog": "core/includes/cards/catalog.html",
+    "tile": "core/includes/cards/tile.html",
+    "compact": "core/includes/cards/compact.html",
+}
+# გასაღებში შაბლონის ვერსია და updated_at-ია — ცვლილება ახალ გასაღებს იძლევა,
+# TTL მხოლოდ ნაგვისთვის
+CARD_HTML_TTL = 60 * 60 * 24
+# ადგილი მოთხოვნაზე დამოკიდებული ნაწილისთვის (ძებნის headline)
+SLOT = "\x00slot\x00"
+
+
+def _template_version(variant):
+    """ბარათის შაბლონის (ყველა ძრავის) შიგთავსის hash — deploy-ზე შეცვლილი შაბლონი ახალ გასაღებს იძლევა."""
+    digest = hashlib.md5()
+    for engine in engines.all():
+        try:
+            origin = engine.get_template(CARD_TEMPLATES[variant]).origin.name
+        except TemplateDoesNotExist:
+            continue
+        with open(origin, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:8]
+
+
+# შაბლონები პროცესის სიცოცხლეში მხოლოდ DEBUG-ზე (runserver) იცვლება
+_cached_template_version = cache(_template_version)
+
+
+def card_key(product, variant):
+    version = (_template_version if settings.DEBUG else _cached_template_version)(variant)
+    return f"core:cardhtml:{version}:{variant}:{product.pk}:{product.updated_at.timestamp()}"
+
+
+def _cached_parts(key, producer):
+    """
+    FileBasedCache-ის ყოველი set() დირექტორიას კითხულობს (_cull) — ცივ გვერდზე
+    ბარათით ერთხელ; set_many-იც set()-ების ციკლია. ფაილურ backend-ზე ბარათები
+    მხოლოდ პროცესის LRU-შია: გასაღები უცვლელია (updated_at), ხელახლა რენდერი იაფია.
+    """
+    if not isinstance(tiered.shared, FileBasedCache):
+        parts = tiered.get(key)
+        if parts is None:
+            parts = producer()
+            tiered.set(key, parts, CARD_HTML_TTL)
+        return parts
+    now = time.time()
+    entry = tiered.local.get(key, now)
+    if entry is not None:
+        return entry[0]
+    parts = producer()
+    tiered.local.set(key, (parts, now + CARD_HTML_TTL, now + CARD_HTML_TTL))
+    return parts
+
+
+def render_card(product, variant, using=None):
+    """ქეშის გარეშე -> (HTML slot-მდე, HTML slot-ის შემდეგ)."""
+    html = get_template(CARD_TEMPLATES[variant], using=using).render({"p": product, "slot": SLOT})
+    head, _, tail = html.partition(SLOT)
+    return head, tail
+
+
+@register.simple_tag
+def product_card(product, variant="tile", headline="", using=None):
+    """
+    {% product_card p "catalog" %} — ბარათის HTML იქეშება (id + updated_at),
+    გვერდი კი მზა სტრიქონებს აერთებს. headline (ძებნა) ქეშის გარეთ ჩაისმება:
+    {% product_card product "tile" product.headline %}. using — შაბლონის ძრავა
+    (Jinja2 გვერდები, core/jinja_env.py); HTML ორივეში ერთნაირია, ქეშიც საერთოა.
+    """
+    head, tail = _cached_parts(card_key(product, variant), lambda: render_card(product, variant, using))
+    slot = format_html('<p class="text-sm muted line-clamp-2">{}</p>', headline) if headline else ""
+    return mark_safe(head + slot + tail)
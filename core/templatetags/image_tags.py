@@ -0,0 +1,68 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from core.images import is_current
+
+register = template.Library()
+
+# სიის ბარათები: მობილურზე 2 სვეტი, დესკტოპზე 4
+CARD_SIZES = "(min-width: 1024px) 25vw, (min-width: 768px) 33vw, 50vw"
+
+
+def _srcset(entries):
+    return ", ".join(f"{default_storage.url(name)} {width}w" for width, name in entries)
+
+
+def _render(file, meta, alt, sizes, css_class, eager):
+    loading = "eager" if eager else "lazy"
+    priority = "high" if eager else "auto"
+    if not file:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            static("img/placeholder.svg"), alt, css_class, loading,
+        )
+    if not is_current(file, meta):
+        # ვერსიები ჯერ არ არის (ან ფაილი შეიცვალა) — ორიგინალი
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            file.url, alt, css_class, loading,
+        )
+
+    jpeg = meta.get("jpeg") or []
+    webp = meta.get("webp") or []
+    sources = format_html('<source type="image/webp" srcset="{}" sizes="{}">', _srcset(webp), sizes) if webp else ""
+    return format_html(
+        "<picture>{}"
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}"'
+        ' loading="{}" fetchpriority="{}" decoding="async"'
+        ' style="background:url({}) center/cover no-repeat"></picture>',
+        sources,
+        default_storage.url(jpeg[-1][1]) if jpeg else file.url,
+        _srcset(jpeg), sizes, meta.get("width") or "", meta.get("height") or "",
+        alt, css_class, loading, priority, meta.get("placeholder") or "",
+    )
+
+
+@register.simple_tag
+def responsive_image(file, meta=None, alt="", sizes="100vw", css_class="", eager=False):
+    """
+    <picture> WebP/JPEG srcset-ით, width/height-ით (CLS) და blur placeholder-ით.
+    file — FieldFile, meta — მისი renditions JSON (core/images.py).
+    eager=True — LCP სურათისთვის (პროდუქტის მთავარი ფოტო).
+    """
+    return _render(file, meta or {}, alt, sizes, css_class, eager)
+
+
+@register.simple_tag
+def product_image(product, sizes=CARD_SIZES, css_class="", eager=False):
+    """Product-ისა და ProductCard-ისთვის (main_image + main_image_renditions)."""
+    return _render(
+        product.main_image,
+        getattr(product, "main_image_renditions", None) or {},
+        product.name,
+        sizes,
+        css_class,
+        eager,
+    )
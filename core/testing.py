@@ -0,0 +1,35 @@
+# core/testing.py
+"""
+ტესტების საერთო საფუძველი (app-ების tests.py).
+
+settings-ის default-ები ტესტებს ერთმანეთზე და dev გარემოზე აბამს: საერთო
+FileBasedCache (.cache/) წინა გაშვების თაობებს და ბარათებს ინახავს, manifest
+static storage-ს collectstatic სჭირდება, SECURE_SSL_REDIRECT ყველაფერს 301-ით
+აბრუნებს. StoreTestCase ამ სამს მეხსიერებით ცვლის და ყოველ ტესტს ცარიელი
+ქეშით იწყებს (tiered.local-ის ჩათვლით).
+"""
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from .caching import tiered
+
+LOCMEM = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": LOCMEM, "LOCATION": "tests-default"},
+        "shared": {"BACKEND": LOCMEM, "LOCATION": "tests-shared"},
+    },
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class StoreTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        for alias in ("default", "shared"):
+            caches[alias].clear()
+        tiered.local.clear()
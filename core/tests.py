@@ -1,3 +1,1168 @@
-from django.test import TestCase
+import base64
+import html
+import io
+import json
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.http import Http404
+from django.test import (
+    AsyncRequestFactory, RequestFactory, SimpleTestCase, TransactionTestCase, override_settings, tag,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+import numpy as np
+import psycopg
+from PIL import Image
+
+from orders.models import Order, OrderItem
+
+from . import (
+    async_views, autocomplete, counters, plans, popularity, related, stock_stream, views,
+)
+from .caching import (
+    CATALOG, CATEGORIES, POPULARITY, PRODUCT, SIZES, bump, get_generation, get_generations, get_object_generations,
+    TwoTierCache, jittered, versioned_key,
+)
+from .cards import refresh_cards
+from .engines import JINJA2_READY
+from .images import build_renditions, rendition_names, replace_renditions
+from .listing import hydrate, ids_key, listing_page
+from .management.commands.backfill_images import _build
+from .facets import compute_facets
+from .filters import FilterSpec
+from .forms import ProductFilterForm
+from .models import Category, CounterBatch, Product, ProductCard, ProductDailyStats, ProductSize, Size
+from .pagination import decode_cursor, encode_cursor, ordering_for, paginate
+from .rows import ImageRef, fetch_rows
+from .search import build_query, get_headlines, search_products
+from .seeding import COLORS, seed_catalog
+from .templatetags.card_tags import CARD_TEMPLATES, card_key, product_card, render_card
+from .testing import StoreTestCase
+from .views import listing_queryset
+
+JINJA2_CONFIGURED = any(t["BACKEND"].endswith(".Jinja2") for t in settings.TEMPLATES)
+
+
+# -----------------------------
+# Keyset პაგინაცია (core/pagination.py)
+# -----------------------------
+class PaginationTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(30)
+
+    def test_cursor_round_trip(self):
+        values = ["2026-01-02 03:04:05.678901+00:00", "12.50", "7"]
+        self.assertEqual(decode_cursor(encode_cursor(values), 3), values)
+        self.assertIsNone(decode_cursor(encode_cursor(values), 2))
+        self.assertIsNone(decode_cursor("not-base64!", 3))
+        for payload in (b"[1,2,3]", b'{"a":"b"}'):
+            self.assertIsNone(decode_cursor(base64.urlsafe_b64encode(payload).decode(), 3))
+
+    def test_pages_cover_the_ordering(self):
+        for sort in ("newest", "price_asc", "price_desc"):
+            ordering = ordering_for(sort)
+            with self.subTest(sort=sort):
+                expected = list(Product.objects.order_by(*ordering).values_list("pk", flat=True))
+                seen, cursor = [], None
+                while True:
+                    page = paginate(Product.objects.all(), ordering, cursor, per_page=7)
+                    seen += [p.pk for p in page.items]
+                    if not page.has_next:
+                        break
+                    cursor = page.next_cursor
+                self.assertEqual(seen, expected)
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        ordering = ordering_for("price_asc")
+        first = paginate(Product.objects.all(), ordering, per_page=5)
+        for cursor in ("garbage", encode_cursor(["not-a-price", "x"])):
+            with self.subTest(cursor=cursor):
+                page = paginate(Product.objects.all(), ordering, cursor, per_page=5)
+                self.assertEqual(page.items, first.items)
+
+
+# -----------------------------
+# ფილტრები და ProductCard read model (core/filters.py, core/cards.py)
+# -----------------------------
+class FilterSpecTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(60)
+
+    def spec(self, **data):
+        form = ProductFilterForm(data)
+        self.assertTrue(form.is_valid(), form.errors)
+        return FilterSpec.from_cleaned(form.cleaned_data)
+
+    def test_key_is_canonical(self):
+        key = self.spec(color=" Black ", size="m", min_price="50").key()
+        self.assertEqual(self.spec(color="black", size=" M", min_price="50.00").key(), key)
+        self.assertEqual(self.spec(color="BLACK", size="M", min_price="50", sort="price_asc").key(), key)
+        self.assertNotEqual(self.spec(color="black", size="m").key(), key)
+
+    def test_card_and_product_paths_agree(self):
+        specs = [
+            self.spec(),
+            self.spec(size="m"),
+            self.spec(in_stock="on"),
+            self.spec(size="XL", in_stock="on", color=COLORS[1]),
+            self.spec(category="bench-shoes", min_price="20", max_price="250"),
+            self.spec(name="wool"),
+        ]
+        for spec in specs:
+            with self.subTest(spec=spec):
+                by_card = set(spec.apply(ProductCard.objects.all()).values_list("pk", flat=True))
+                by_product = set(spec.apply(Product.objects.all()).values_list("pk", flat=True))
+                self.assertEqual(by_card, by_product)
+                self.assertTrue(by_card)
+
+    def test_size_filter_counts_only_stocked_sizes(self):
+        spec = self.spec(size="m")
+        product_size = ProductSize.objects.filter(size__name="M", stock__gt=0).select_related("product").first()
+        product = product_size.product
+        for base in (Product.objects.all(), ProductCard.objects.all()):
+            self.assertTrue(spec.apply(base).filter(pk=product.pk).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product_size.stock = 0
+            product_size.save()
+        for base in (Product.objects.all(), ProductCard.objects.all()):
+            with self.subTest(source=base.model.__name__):
+                self.assertFalse(spec.apply(base).filter(pk=product.pk).exists())
+        card = ProductCard.objects.get(pk=product.pk)
+        self.assertNotIn("m", card.size_keys)
+
+    def test_card_follows_product_edits(self):
+        product = self.products[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = "Renamed coat"
+            product.price = 99
+            product.save()
+        card = ProductCard.objects.get(pk=product.pk)
+        self.assertEqual((card.name, card.price), ("Renamed coat", 99))
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertFalse(ProductCard.objects.filter(pk=product.pk).exists())
+
+
+class FilterCompilerTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalog(40)
+        # ორ ზომაში მარაგიანი პროდუქტი — join-ით ორჯერ გამოჩნდებოდა
+        cls.product = Product.objects.get(slug="bench-0")
+        ProductSize.objects.filter(product=cls.product).delete()
+        for name in ("S", "M"):
+            ProductSize.objects.create(product=cls.product, size=Size.objects.get(name=name), stock=3)
+        refresh_cards([cls.product.pk])
+
+    def test_stock_filters_compile_to_exists(self):
+        for spec in (FilterSpec(size="m"), FilterSpec(in_stock=True), FilterSpec(size="s", in_stock=True)):
+            with self.subTest(spec=spec):
+                sql = str(spec.apply(Product.objects.all()).query)
+                self.assertIn("EXISTS", sql)
+                self.assertNotIn("DISTINCT", sql)
+                self.assertNotIn("JOIN", sql)
+
+    def test_products_are_not_duplicated(self):
+        for spec in (FilterSpec(in_stock=True), FilterSpec(size="m", in_stock=True)):
+            with self.subTest(spec=spec):
+                pks = list(spec.apply(Product.objects.all()).values_list("pk", flat=True))
+                self.assertEqual(len(pks), len(set(pks)))
+                self.assertEqual(pks.count(self.product.pk), 1)
+
+    def test_paging_keeps_order_without_distinct(self):
+        spec = FilterSpec(in_stock=True, sort="price_asc")
+        expected = list(spec.apply(Product.objects.all()).order_by(*spec.ordering()).values_list("pk", flat=True))
+        seen, cursor = [], None
+        while True:
+            page = paginate(spec.apply(Product.objects.all()), spec.ordering(), cursor, per_page=7)
+            seen += [p.pk for p in page.items]
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, expected)
+
+    def test_unknown_category_matches_nothing(self):
+        self.assertFalse(FilterSpec(category="no-such-category").apply(Product.objects.all()).exists())
+        self.assertTrue(FilterSpec(category="bench-shoes").apply(Product.objects.all()).exists())
+
+
+# -----------------------------
+# თაობის მრიცხველები (core/caching.py)
+# -----------------------------
+class GenerationTests(StoreTestCase):
+    def test_bump_changes_versioned_keys(self):
+        key = versioned_key("core:test", CATALOG, SIZES)
+        self.assertEqual(versioned_key("core:test", CATALOG, SIZES), key)
+        before = get_generation(CATALOG)
+        bump(CATALOG)
+        self.assertEqual(get_generation(CATALOG), before + 1)
+        self.assertNotEqual(versioned_key("core:test", CATALOG, SIZES), key)
+
+    def test_lost_counter_restarts_ahead(self):
+        before = get_generation(SIZES)
+        time.sleep(0.005)  # ათვლა მილიწამებშია
+        caches["shared"].clear()
+        self.assertGreater(get_generation(SIZES), before)
+
+    def test_object_generations(self):
+        gens = get_object_generations(PRODUCT, [1, 2])
+        bump(PRODUCT, 2)
+        after = get_object_generations(PRODUCT, [1, 2])
+        self.assertEqual(after[1], gens[1])
+        self.assertEqual(after[2], gens[2] + 1)
+
+    def test_bumps_wait_for_commit(self):
+        category = Category.objects.create(name="Hats", slug="hats")
+        gens = get_generations(CATALOG, CATEGORIES, SIZES)
+        with self.captureOnCommitCallbacks() as callbacks:
+            category.name = "Caps"
+            category.save()
+            self.assertEqual(get_generations(CATALOG, CATEGORIES, SIZES), gens)
+        for callback in callbacks:
+            callback()
+        after = get_generations(CATALOG, CATEGORIES, SIZES)
+        self.assertGreater(after[CATALOG], gens[CATALOG])
+        self.assertGreater(after[CATEGORIES], gens[CATEGORIES])
+        self.assertEqual(after[SIZES], gens[SIZES])
+
+
+# -----------------------------
+# ორსაფეხურიანი ქეში (core/caching.py: TwoTierCache)
+# -----------------------------
+class TwoTierCacheTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = TwoTierCache(local_ttl=30, wait_timeout=0.5)
+        self.calls = []
+
+    def producer(self, value="fresh", delay=0):
+        def produce():
+            self.calls.append(value)
+            time.sleep(delay)
+            return value
+
+        return produce
+
+    def test_jitter_stays_in_range(self):
+        samples = {jittered(100) for _ in range(500)}
+        self.assertTrue(all(90 <= ttl <= 110 for ttl in samples))
+        self.assertGreater(len(samples), 1)
+        self.assertEqual(jittered(0), 1)
+
+    def test_computes_once_then_serves_local(self):
+        self.assertEqual(self.cache.get_or_set("k", self.producer(), 60), "fresh")
+        self.assertEqual(self.cache.get_or_set("k", self.producer("again"), 60), "fresh")
+        self.assertEqual(self.calls, ["fresh"])
+        self.assertIsNone(self.cache.shared.get("k:lock"))
+
+    def test_stale_value_while_another_worker_recomputes(self):
+        self.cache.shared.set("k", ("old", time.time() - 1), 60)
+        self.cache.shared.add("k:lock", 1, 30)
+        self.assertEqual(self.cache.get_or_set("k", self.producer(), 60), "old")
+        self.assertEqual(self.calls, [])
+
+    def test_stale_value_is_recomputed_by_lock_holder(self):
+        self.cache.shared.set("k", ("old", time.time() - 1), 60)
+        self.assertEqual(self.cache.get_or_set("k", self.producer(), 60), "fresh")
+        self.assertEqual(self.calls, ["fresh"])
+        self.assertIsNone(self.cache.shared.get("k:lock"))
+
+    def test_waits_for_the_lock_holder(self):
+        self.cache.shared.add("k:lock", 1, 30)
+        writer = threading.Timer(0.1, lambda: self.cache.shared.set("k", ("theirs", time.time() + 60), 60))
+        writer.start()
+        self.addCleanup(writer.cancel)
+        self.assertEqual(self.cache.get_or_set("k", self.producer(), 60), "theirs")
+        self.assertEqual(self.calls, [])
+
+    def test_gives_up_waiting_after_timeout(self):
+        self.cache.wait_timeout = 0.1
+        self.cache.shared.add("k:lock", 1, 30)
+        self.assertEqual(self.cache.get_or_set("k", self.producer(), 60), "fresh")
+        self.assertEqual(self.calls, ["fresh"])
+
+    def test_single_flight_across_threads(self):
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_set("k", self.producer(delay=0.1), 60)))
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(results, ["fresh"] * 8)
+        self.assertEqual(self.calls, ["fresh"])
+
+    def test_local_tier_expires_after_local_ttl(self):
+        self.cache.local_ttl = 0
+        self.cache.set("k", "v1", 60)
+        self.cache.shared.set("k", ("v2", time.time() + 60), 60)
+        self.assertEqual(self.cache.get("k"), "v2")
+
+    def test_get_many_and_set_many(self):
+        self.cache.set_many({"a": 1, "b": 2}, 60)
+        self.cache.local.clear()
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.cache.delete("a")
+        self.assertEqual(self.cache.get_many(["a", "b"]), {"b": 2})
+
+
+# -----------------------------
+# Full-text ძებნა (core/search.py)
+# -----------------------------
+class SearchTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Coats", slug="coats")
+        cls.coat = Product.objects.create(
+            name="Wool overcoat", slug="wool-overcoat", category=category, color="Grey", price=120,
+            description="A long coat for winter evenings & rainy mornings, lined with soft cotton.",
+        )
+        cls.scarf = Product.objects.create(
+            name="Striped scarf", slug="striped-scarf", category=category, color="Red", price=30,
+            description="Knitted from merino wool, pairs with any coat.",
+        )
+        # ბარათები commit-ის შემდეგ ახლდება (core/cards.py)
+        refresh_cards([cls.coat.pk, cls.scarf.pk])
+
+    def search(self, text):
+        query = build_query(text)
+        return list(search_products(Product.objects.all(), query).order_by("-rank", "-pk"))
+
+    def test_build_query(self):
+        self.assertIsNone(build_query("  !?  "))
+        self.assertIsNone(build_query(None))
+        self.assertIsNotNone(build_query("wool jack"))
+
+    def test_prefix_and_all_terms(self):
+        self.assertEqual({p.pk for p in self.search("woo")}, {self.coat.pk, self.scarf.pk})
+        self.assertEqual(self.search("wool strip"), [self.scarf])
+        self.assertEqual(self.search("wool velvet"), [])
+
+    def test_name_outranks_description(self):
+        self.assertEqual(self.search("wool"), [self.coat, self.scarf])
+
+    def test_vector_follows_edits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scarf.name = "Velvet scarf"
+            self.scarf.save()
+        self.assertEqual(self.search("velvet"), [self.scarf])
+        self.assertEqual(self.search("strip"), [])
+
+    def test_headlines_are_escaped_and_marked(self):
+        headline = get_headlines([self.coat.pk], build_query("winter"))[self.coat.pk]
+        self.assertIn("<mark>winter</mark>", headline)
+        self.assertIn("&amp; rainy", headline)
+        self.assertEqual(get_headlines([], build_query("winter")), {})
+
+    def test_search_page_shows_headlines(self):
+        content = self.client.get("/search/?q=winter").content.decode()
+        self.assertIn("<mark>winter</mark>", content)
+        self.assertIn(self.coat.slug, content)
+        self.assertNotIn(self.scarf.slug, content)
+
+
+# -----------------------------
+# Conditional GET (core/conditional.py)
+# -----------------------------
+class ConditionalGetTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(30)
+
+    def revalidate(self, url, etag, **headers):
+        return self.client.get(url, headers={"If-None-Match": etag, **headers})
+
+    def test_catalog_304_until_catalog_changes(self):
+        response = self.client.get("/catalog/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        etag = response["ETag"]
+        self.assertEqual(self.revalidate("/catalog/", etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[5].price += 1
+            self.products[5].save()
+        changed = self.revalidate("/catalog/", etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_popularity_changes_the_etag(self):
+        etag = self.client.get("/catalog/")["ETag"]
+        bump(POPULARITY)
+        self.assertEqual(self.revalidate("/catalog/", etag).status_code, 200)
+
+    def test_htmx_fragment_has_its_own_etag(self):
+        etag = self.client.get("/catalog/")["ETag"]
+        self.assertEqual(self.revalidate("/catalog/", etag, **{"HX-Request": "true"}).status_code, 200)
+
+    def test_product_page_follows_stock(self):
+        product = self.products[0]
+        url = f"/product/{product.slug}/"
+        # პირველი ნახვა csrf cookie-ს აყენებს, cookie კი ETag-შია
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+        size = ProductSize.objects.filter(product=product).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            size.stock += 3
+            size.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_cart_change_changes_the_etag(self):
+        product = self.products[0]
+        etag = self.client.get("/catalog/")["ETag"]
+        size = ProductSize.objects.filter(product=product).first()
+        self.client.post(reverse("cart:add_to_cart", args=[product.slug]), {"size_id": size.pk})
+        self.assertEqual(self.revalidate("/catalog/", etag).status_code, 200)
+
+    def test_missing_product_is_404(self):
+        self.assertEqual(self.client.get("/product/no-such-product/").status_code, 404)
+
+
+# -----------------------------
+# სიების ქეში (core/listing.py)
+# -----------------------------
+class ListingCacheTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(30)
+
+    def first_slug(self, response):
+        return re.search(r'href="/product/([^/"]+)/"', response.content.decode()).group(1)
+
+    def test_cached_ids_follow_price_changes(self):
+        url = "/catalog/?sort=price_asc"
+        response = self.client.get(url)
+        # ყველაზე იაფი ყველაზე ძვირი ხდება — ქეშირებული id-ების სიაც ახლდება
+        cheapest = Product.objects.get(slug=self.first_slug(response))
+        with self.captureOnCommitCallbacks(execute=True):
+            cheapest.price = 10_000
+            cheapest.save()
+        self.assertNotEqual(self.first_slug(self.client.get(url)), cheapest.slug)
+
+    def test_popularity_versions_only_the_popular_sort(self):
+        base = listing_queryset()
+        newest, popular = FilterSpec(), FilterSpec(sort="popular")
+        before = ids_key(base, newest, None), ids_key(base, popular, None)
+        bump(POPULARITY)
+        self.assertEqual(ids_key(base, newest, None), before[0])
+        self.assertNotEqual(ids_key(base, popular, None), before[1])
+
+    def test_warm_page_skips_the_database(self):
+        base, spec = listing_queryset(), FilterSpec(sort="price_desc")
+        page = listing_page(base, spec)
+        self.assertTrue(page.items)
+        with self.assertNumQueries(0):
+            again = listing_page(base, spec)
+        self.assertEqual([p.pk for p in again.items], [p.pk for p in page.items])
+
+    def test_product_edit_refetches_only_its_row(self):
+        base = listing_queryset()
+        ids = [p.pk for p in self.products[:10]]
+        hydrate(base, ids)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[3].name = "Renamed scarf"
+            self.products[3].save()
+        with CaptureQueriesContext(connection) as ctx:
+            rows = hydrate(base, ids)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn(f"IN ({self.products[3].pk})", ctx.captured_queries[0]["sql"])
+        self.assertEqual([r.pk for r in rows], ids)
+        self.assertEqual(rows[3].name, "Renamed scarf")
+
+
+# -----------------------------
+# HTMX partial-ების კონტექსტი (core/partials.py)
+# -----------------------------
+class PartialContextTests(StoreTestCase):
+    HX = {"HX-Request": "true"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(30)
+
+    def needs(self, response):
+        context = response.context_data
+        return {key for key in ("products", "facets", "current_category_obj") if key in context}
+
+    def test_partials_compute_only_what_they_need(self):
+        page = self.client.get("/catalog/")
+        self.assertEqual(self.needs(page), {"products", "facets", "current_category_obj"})
+
+        filters = self.client.get("/catalog/bench-shoes/?show_filter=1", headers=self.HX)
+        self.assertEqual(filters.status_code, 200)
+        self.assertEqual(self.needs(filters), {"facets"})
+
+        cursor = page.context["page"].next_cursor
+        self.assertTrue(cursor)
+        more = self.client.get(f"/catalog/?cursor={cursor}", headers=self.HX)
+        self.assertEqual(more.status_code, 200)
+        self.assertEqual(self.needs(more), {"products"})
+
+    def test_partials_of_a_missing_category_are_404(self):
+        for url in ("/catalog/no-such/", "/catalog/no-such/?show_filter=1", "/catalog/?category=no-such&cursor=x"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, headers=self.HX).status_code, 404)
+
+    def filters_request(self, slug):
+        request = AsyncRequestFactory().get(f"/catalog/{slug}/?show_filter=1", headers=self.HX)
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        return request
+
+    async def test_async_partial_of_a_missing_category_is_404(self):
+        view = async_views.CatalogView.as_view()
+        response = await view(self.filters_request("bench-shoes"), category_slug="bench-shoes")
+        self.assertEqual(self.needs(response), {"facets"})
+        with self.assertRaises(Http404):
+            await view(self.filters_request("no-such"), category_slug="no-such")
+
+
+# -----------------------------
+# Async view-ები (core/async_views.py)
+# -----------------------------
+class AsyncViewTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(40)
+        popularity.record_sales([(cls.products[3].pk, 2)])
+
+    def build(self, factory, url):
+        request = factory.get(url)
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        return request
+
+    async def contexts(self, name, url, **kwargs):
+        """(sync, async) context_data ერთი და იმავე მოთხოვნაზე."""
+        sync_view = getattr(views, name).as_view()
+        sync_response = await sync_to_async(sync_view)(self.build(RequestFactory(), url), **kwargs)
+        async_response = await getattr(async_views, name).as_view()(self.build(AsyncRequestFactory(), url), **kwargs)
+        self.assertEqual(async_response.status_code, 200)
+        return sync_response.context_data, async_response.context_data
+
+    def pks(self, items):
+        return [p.pk for p in items]
+
+    async def test_pages_match_the_sync_views(self):
+        sync, async_ = await self.contexts("IndexView", "/")
+        for key in ("new_products", "featured_products"):
+            self.assertEqual(self.pks(async_[key]), self.pks(sync[key]))
+        self.assertEqual(self.pks(async_["featured_products"])[:1], [self.products[3].pk])
+
+        for url, kwargs in (("/catalog/bench-bags/?sort=price_asc", {"category_slug": "bench-bags"}),
+                            ("/search/?q=wool", {})):
+            name = "CatalogView" if kwargs else "SearchView"
+            with self.subTest(url=url):
+                sync, async_ = await self.contexts(name, url, **kwargs)
+                self.assertTrue(async_["products"])
+                self.assertEqual(self.pks(async_["products"]), self.pks(sync["products"]))
+                self.assertEqual(async_["facets"], sync["facets"])
+
+        product = self.products[5]
+        sync, async_ = await self.contexts("ProductDetailView", f"/product/{product.slug}/", slug=product.slug)
+        self.assertEqual(async_["product"].pk, product.pk)
+        self.assertEqual(self.pks(async_["related_products"]), self.pks(sync["related_products"]))
+
+
+# -----------------------------
+# Django / Jinja2 შაბლონების თანხვედრა
+# -----------------------------
+_CSRF_RE = re.compile(r'(name="csrfmiddlewaretoken" value=|"X-CSRFToken": ?)"[^"]+"')
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_CURSOR_RE = re.compile(r'href="[^"]*[?&]cursor=([^"&]+)')
+
+
+def normalize(text):
+    """ძრავებს შორის უმნიშვნელო სხვაობები: whitespace, კომენტარები, CSRF, entity-ები (&#39; / &#x27;)."""
+    text = _COMMENT_RE.sub("", _CSRF_RE.sub(r'\1""', text))
+    text = html.unescape(text)
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r">\s*<", ">\n<", text).strip()
+
+
+def parity_scenarios(category_slug):
+    """(label, url, headers) — JINJA2_READY-ის ყველა გვერდი და მისი HTMX ვარიანტები."""
+    hx = {"HX-Request": "true"}
+    return [
+        ("home", "/", {}),
+        ("catalog", "/catalog/", {}),
+        ("catalog_category", f"/catalog/{category_slug}/?sort=price_asc", {}),
+        ("catalog_filtered", f"/catalog/?color={COLORS[0].lower()}&size=M&in_stock=1", {}),
+        ("catalog_filter_sheet", "/catalog/?show_filter=1", hx),
+        ("catalog_boosted", "/catalog/", {**hx, "HX-Boosted": "true"}),
+        ("search", "/search/?q=wool", {}),
+        ("search_empty", "/search/?q=zzzqqq", {}),
+        ("cart_modal", "/cart/modal/", hx),
+    ]
+
+
+@skipUnless(JINJA2_CONFIGURED, "Jinja2 is not installed")
+class TemplateParityTests(StoreTestCase):
+    """
+    JINJA2_READY გვერდები ორივე ძრავით — ნორმალიზებული HTML ერთნაირი უნდა იყოს.
+    ბარათების HTML ქეშიდან მოდის და ძრავებს შორის საერთოა, ამიტომ ბარათის
+    შაბლონები ცალკე, ქეშის გარეშე მოწმდება (render_card).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # load more-ს ერთ გვერდზე მეტი სჭირდება (PAGE_SIZE = 24)
+        cls.products = seed_catalog(60)
+
+    def test_card_templates(self):
+        for variant in CARD_TEMPLATES:
+            for product in self.products[:10]:
+                with self.subTest(variant=variant, product=product.pk):
+                    self.assertEqual(
+                        normalize("".join(render_card(product, variant))),
+                        normalize("".join(render_card(product, variant, using="jinja2"))),
+                    )
+
+    def render_pages(self, views):
+        rendered = {}
+        with override_settings(JINJA2_VIEWS=views):
+            for label, url, headers in parity_scenarios(self.products[0].category.slug):
+                rendered[label] = self.fetch(url, headers)
+            # load more: შემდეგი გვერდის cursor პირველი გვერდიდან
+            match = _CURSOR_RE.search(rendered["catalog"])
+            self.assertIsNotNone(match, "catalog page has no load-more link")
+            url = f"/catalog/?cursor={html.unescape(match.group(1))}"
+            rendered["catalog_load_more"] = self.fetch(url, {"HX-Request": "true"})
+        return rendered
+
+    def fetch(self, url, headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200, url)
+        return normalize(response.content.decode())
+
+    def test_pages(self):
+        # სესია + კალათა პირველი "add to cart"-ით იქმნება (cart/middleware.py)
+        sizes = dict(ProductSize.objects.filter(product__in=self.products[:3]).values_list("product_id", "id"))
+        for product in self.products[:3]:
+            self.client.post(
+                reverse("cart:add_to_cart", args=[product.slug]), {"size_id": sizes[product.pk], "quantity": 2}
+            )
+
+        django_pages = self.render_pages(set())
+        jinja_pages = self.render_pages(JINJA2_READY)
+        for label, django_html in django_pages.items():
+            with self.subTest(page=label):
+                self.assertEqual(django_html, jinja_pages[label])
+
+
+# -----------------------------
+# ფასეტები (core/facets.py)
+# -----------------------------
+class FacetTests(StoreTestCase):
+    def test_each_facet_ignores_its_own_filter(self):
+        seed_catalog(60)
+        spec = FilterSpec(category="bench-jackets", color=COLORS[0].lower(), size="m", in_stock=True)
+        categories = list(Category.objects.order_by("name"))
+        sizes = list(Size.objects.order_by("name"))
+        for base in (Product.objects.all(), ProductCard.objects.all()):
+            with self.subTest(source=base.model.__name__):
+                facets = compute_facets(base, spec, categories, sizes)
+
+                def count(**changes):
+                    return replace(spec, **changes).apply(base).count()
+
+                by_category = {c["slug"]: c["count"] for c in facets["categories"]}
+                self.assertEqual(by_category, {c.slug: count(category=c.slug) for c in categories})
+                self.assertGreater(sum(by_category.values()), by_category["bench-jackets"])
+                by_size = {s["name"]: s["count"] for s in facets["sizes"]}
+                self.assertEqual(by_size, {s.name: count(size=s.name.lower()) for s in sizes})
+                for c in facets["colors"]:
+                    self.assertEqual(c["count"], count(color=c["name"].lower()))
+                self.assertGreater(len(facets["colors"]), 1)
+                self.assertEqual(sum(b["count"] for b in facets["prices"]), count())
+
+    def test_colors_group_like_the_filter(self):
+        products = seed_catalog(6)
+        for product, color in zip(products, ["Black", "black", "BLACK", "Navy", "navy", ""]):
+            product.color = color
+        Product.objects.bulk_update(products, ["color"])
+
+        colors = compute_facets(Product.objects.all(), FilterSpec())["colors"]
+        self.assertEqual([(c["name"].lower(), c["count"]) for c in colors], [("black", 3), ("navy", 2)])
+        for c in colors:
+            self.assertEqual(Product.objects.filter(color__iexact=c["name"]).count(), c["count"])
+
+
+# -----------------------------
+# ბარათების ქეში (core/templatetags/card_tags.py)
+# -----------------------------
+class CardCacheTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = seed_catalog(1)[0]
+
+    def test_locmem_shared_backend_stores_cards(self):
+        html = product_card(self.product, "catalog")
+        self.assertIsNotNone(caches["shared"].get(card_key(self.product, "catalog")))
+        self.assertEqual(product_card(self.product, "catalog"), html)
+
+    def test_file_based_shared_backend_keeps_cards_local(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        file_based = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": tmp.name}
+        with override_settings(CACHES={**settings.CACHES, "shared": file_based}):
+            self.assertIsInstance(caches["shared"], FileBasedCache)
+            html = product_card(self.product, "catalog")
+            self.assertEqual(os.listdir(tmp.name), [])
+            self.assertEqual(product_card(self.product, "catalog"), html)
+
+    def test_template_change_changes_the_key(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, CARD_TEMPLATES["catalog"])
+        os.makedirs(os.path.dirname(path))
+        django_backend = {**settings.TEMPLATES[0], "DIRS": [tmp.name, *settings.TEMPLATES[0]["DIRS"]]}
+        with override_settings(DEBUG=True, TEMPLATES=[django_backend, *settings.TEMPLATES[1:]]):
+            with open(path, "w") as fh:
+                fh.write("<article>{{ p.name }}</article>")
+            key = card_key(self.product, "catalog")
+            self.assertEqual(card_key(self.product, "catalog"), key)
+            with open(path, "w") as fh:
+                fh.write("<article class=\"card\">{{ p.name }}</article>")
+            self.assertNotEqual(card_key(self.product, "catalog"), key)
+
+
+# -----------------------------
+# ProductRow (core/rows.py)
+# -----------------------------
+class ProductRowTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(12)
+
+    def test_rows_match_models_in_order(self):
+        for base in (Product.objects.all(), ProductCard.objects.all()):
+            with self.subTest(source=base.model.__name__):
+                rows = fetch_rows(base.order_by("-price", "pk")[:5])
+                expected = list(Product.objects.order_by("-price", "pk")[:5])
+                self.assertEqual([r.pk for r in rows], [p.pk for p in expected])
+                for row, product in zip(rows, expected):
+                    self.assertEqual(
+                        (row.id, row.name, row.slug, row.price, row.color, row.updated_at, row.category_id),
+                        (product.pk, product.name, product.slug, product.price, product.color,
+                         product.updated_at, product.category_id),
+                    )
+                    self.assertEqual(row.main_image.name, product.main_image.name)
+                    self.assertEqual(row.main_image.url, product.main_image.url)
+                    self.assertEqual(row.get_absolute_url(), product.get_absolute_url())
+
+    def test_cards_render_the_same_as_from_models(self):
+        product = self.products[0]
+        row = fetch_rows(ProductCard.objects.filter(pk=product.pk))[0]
+        for variant in CARD_TEMPLATES:
+            with self.subTest(variant=variant):
+                self.assertEqual(render_card(row, variant), render_card(product, variant))
+
+    def test_rows_are_slotted_and_picklable(self):
+        row = fetch_rows(Product.objects.filter(pk=self.products[0].pk))[0]
+        self.assertFalse(hasattr(row, "__dict__"))
+        row.headline = "<b>wool</b>"
+        clone = pickle.loads(pickle.dumps(row))
+        self.assertEqual((clone.pk, clone.main_image.name, clone.headline), (row.pk, row.main_image.name, row.headline))
+        self.assertFalse(ImageRef(None))
+
+
+# -----------------------------
+# Related products (core/related.py)
+# -----------------------------
+class RelatedTests(SimpleTestCase):
+    # (order_id, product_id); შეკვეთა 1-ში პროდუქტი 1 ორი ზომით
+    PAIRS = [
+        (1, 1), (1, 1), (1, 2), (1, 3),
+        (2, 1), (2, 2),
+        (3, 1), (3, 3),
+        (4, 2), (4, 4),
+        (5, 1), (5, 2),
+    ]
+
+    def neighbours(self, min_support, top_n=8, pairs=PAIRS):
+        order_ids, product_ids = (np.array(col, dtype=np.int64) for col in zip(*pairs))
+        products, s = related.similarity(order_ids, product_ids, min_support)
+        return [(p, r, rank, round(score, 4)) for p, r, rank, score in related.top_neighbours(products, s, top_n)]
+
+    def test_single_co_occurrences_are_dropped_by_default(self):
+        self.assertEqual(related.MIN_SUPPORT, 2)
+        self.assertEqual(
+            self.neighbours(related.MIN_SUPPORT),
+            [(1, 2, 0, 0.75), (1, 3, 1, 0.7071), (2, 1, 0, 0.75), (3, 1, 0, 0.7071)],
+        )
+
+    def test_cosine_over_distinct_orders(self):
+        self.assertEqual(
+            self.neighbours(1),
+            [
+                (1, 2, 0, 0.75), (1, 3, 1, 0.7071),
+                (2, 1, 0, 0.75), (2, 4, 1, 0.5), (2, 3, 2, 0.3536),
+                (3, 1, 0, 0.7071), (3, 2, 1, 0.3536),
+                (4, 2, 0, 0.5),
+            ],
+        )
+
+    def test_ties_prefer_the_smaller_id(self):
+        pairs = [(1, 10), (1, 30), (2, 10), (2, 20)]
+        self.assertEqual(
+            self.neighbours(1, top_n=1, pairs=pairs),
+            [(10, 20, 0, 0.7071), (20, 10, 0, 0.7071), (30, 10, 0, 0.7071)],
+        )
+
+
+# -----------------------------
+# პოპულარობა (core/popularity.py)
+# -----------------------------
+class PopularityTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(6)
+        cls.user = get_user_model().objects.create(email="buyer@example.com", first_name="Buyer", last_name="One")
+
+    def order(self, status, items, days_ago=0):
+        order = Order.objects.create(user=self.user, first_name="B", last_name="O", email="b@example.com",
+                                     total_price=0, status=status)
+        for product, quantity in items:
+            size = ProductSize.objects.filter(product=product).first()
+            OrderItem.objects.create(order=order, product=product, size=size, quantity=quantity, price=product.price)
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return order
+
+    def test_weight_doubles_every_half_life(self):
+        at = popularity.EPOCH + timedelta(days=100)
+        self.assertAlmostEqual(popularity.weight(at + popularity.HALF_LIFE) / popularity.weight(at), 2)
+        # 2 ერთეული ერთი HALF_LIFE-ის წინ = 1 ერთეული ახლა
+        self.assertAlmostEqual(popularity.current_score(2 * popularity.weight(at), at + popularity.HALF_LIFE), 1)
+
+    def test_record_sales_updates_product_and_card(self):
+        first, second = self.products[:2]
+        gen = get_generation(POPULARITY)
+        with self.captureOnCommitCallbacks(execute=True):
+            popularity.record_sales([(first.pk, 1), (second.pk, 2), (first.pk, 2)])
+        self.assertGreater(get_generation(POPULARITY), gen)
+        for model in (Product, ProductCard):
+            scores = dict(model.objects.filter(pk__in=[first.pk, second.pk]).values_list("pk", "popularity"))
+            self.assertAlmostEqual(popularity.current_score(scores[first.pk]), 3, places=3)
+            self.assertAlmostEqual(popularity.current_score(scores[second.pk]), 2, places=3)
+
+    def test_recent_sales_outrank_old_ones(self):
+        old, recent = self.products[:2]
+        popularity.record_sales([(old.pk, 3)], at=timezone.now() - 2 * popularity.HALF_LIFE)
+        popularity.record_sales([(recent.pk, 1)])
+        ranked = list(Product.objects.filter(popularity__gt=0).order_by("-popularity").values_list("pk", flat=True))
+        self.assertEqual(ranked, [recent.pk, old.pk])
+
+    def test_rebuild_matches_recorded_sales(self):
+        a, b, c = self.products[:3]
+        self.order("processing", [(a, 1), (b, 2)], days_ago=20)
+        self.order("delivered", [(a, 1)], days_ago=1)
+        self.order("canceled", [(c, 5)])
+        self.order("pending", [(c, 5)])
+        popularity.rebuild_popularity()
+        scores = dict(Product.objects.values_list("pk", "popularity"))
+        cards = dict(ProductCard.objects.values_list("pk", "popularity"))
+        self.assertEqual(scores, cards)
+        self.assertEqual(scores[c.pk], 0)
+        now = timezone.now()
+        expected = popularity.weight(now - timedelta(days=20)) + popularity.weight(now - timedelta(days=1))
+        self.assertAlmostEqual(scores[a.pk] / expected, 1, places=3)
+
+    def test_popular_sort_lists_bestsellers_first(self):
+        popularity.record_sales([(self.products[4].pk, 5), (self.products[2].pk, 1)])
+        response = self.client.get("/catalog/?sort=popular")
+        slugs = re.findall(r'href="/product/([^/"]+)/"', response.content.decode())
+        self.assertEqual(list(dict.fromkeys(slugs))[:2], [self.products[4].slug, self.products[2].slug])
+
+
+# -----------------------------
+# Typeahead (core/autocomplete.py)
+# -----------------------------
+class AutocompleteRefreshTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(30)
+
+    def setUp(self):
+        super().setUp()
+        self.holder = autocomplete.IndexHolder()
+        self.holder.rebuild()
+
+    def labels(self, text):
+        return [s.label for s in self.holder.snapshot.lookup(text)]
+
+    def test_stock_change_does_not_touch_index(self):
+        size = ProductSize.objects.filter(product=self.products[0]).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            size.stock += 1
+            size.save()
+        generations = self.holder.snapshot.generations
+        self.assertEqual(autocomplete.get_generations(*generations), generations)
+
+    def test_rename_and_delete_are_patched(self):
+        product = self.products[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = "Zebrastripe parka"
+            product.save()
+        snapshot = self.holder.rebuild()
+        self.assertIsInstance(snapshot.index, autocomplete.PatchedIndex)
+        self.assertEqual(self.labels("zebrastripe"), ["Zebrastripe parka"])
+        self.assertEqual(self.labels("parka"), ["Zebrastripe parka"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.holder.rebuild()
+        self.assertEqual(self.labels("zebrastripe"), [])
+
+
+# -----------------------------
+# სურათების ვერსიები (core/images.py)
+# -----------------------------
+class RenditionTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 400), "navy").save(buffer, "JPEG")
+        self.source = default_storage.save("products/main/coat.jpg", ContentFile(buffer.getvalue()))
+
+    def test_rebuild_keeps_old_files_until_swap(self):
+        old = build_renditions(self.source)
+        new = build_renditions(self.source)
+        old_names, new_names = rendition_names(old), rendition_names(new)
+        self.assertFalse(old_names & new_names)
+        self.assertTrue(all(default_storage.exists(name) for name in old_names | new_names))
+
+        replace_renditions(old, new)
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+        self.assertTrue(all(default_storage.exists(name) for name in new_names))
+
+    def test_broken_source_is_reported(self):
+        broken = default_storage.save("products/main/broken.jpg", ContentFile(b"not an image"))
+        meta, error = _build(broken)
+        self.assertIsNone(meta)
+        self.assertIn("UnidentifiedImageError", error)
+
+
+# -----------------------------
+# sitemap / feed ფაილები (core/exports.py)
+# -----------------------------
+class ExportFileTests(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(override_settings(EXPORTS_ROOT=tmp.name))
+        self.root = tmp.name
+        with open(os.path.join(self.root, "sitemap.xml"), "w") as fh:
+            fh.write("<sitemapindex/>")
+
+    def test_validators_and_304(self):
+        response = self.client.get(reverse("core:sitemap"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"<sitemapindex/>")
+        self.assertIn("max-age=", response["Cache-Control"])
+
+        again = self.client.get(reverse("core:sitemap"), headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], response["ETag"])
+
+    def test_replaced_file_gets_new_etag(self):
+        etag = self.client.get(reverse("core:sitemap"))["ETag"]
+        path = os.path.join(self.root, "sitemap.xml")
+        with open(path, "w") as fh:
+            fh.write("<sitemapindex><sitemap/></sitemapindex>")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        response = self.client.get(reverse("core:sitemap"), headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_file(self):
+        self.assertEqual(self.client.get(reverse("core:feed_file", args=["products-0000.xml.gz"])).status_code, 404)
+
+
+# -----------------------------
+# Live მარაგი (core/stock_stream.py)
+# -----------------------------
+class StockSubscriptionTests(SimpleTestCase):
+    def hub(self):
+        hub = stock_stream.StockHub()
+        hub._ensure_running = lambda: None  # upstream-ის (LISTEN / poll) გარეშე
+        return hub
+
+    async def test_slow_reader_gets_coalesced_changes(self):
+        subscription = stock_stream.Subscription(1)
+        subscription.push({10: 5})
+        subscription.push({10: 3, 11: 0})
+        self.assertEqual(await subscription.next(1), {10: 3, 11: 0})
+        with self.assertRaises(TimeoutError):
+            await subscription.next(0.01)
+
+    async def test_hub_routes_by_product(self):
+        hub = self.hub()
+        first, other = hub.subscribe(1), hub.subscribe(2)
+        hub.publish(1, {10: 4})
+        self.assertEqual(await first.next(1), {10: 4})
+        self.assertFalse(other.ready.is_set())
+        hub.unsubscribe(first)
+        self.assertEqual(hub.watched(), [2])
+
+    async def test_events_start_with_snapshot_and_unsubscribe_on_close(self):
+        hub = self.hub()
+        subscription = hub.subscribe(1)
+        with mock.patch.object(stock_stream, "hub", hub):
+            events = stock_stream.stock_events(subscription, {10: 2})
+            first = await anext(events)
+            self.assertTrue(first.startswith(f"retry: {stock_stream.CLIENT_RETRY}\n"))
+            self.assertIn('data: {"10": 2}', first)
+            hub.publish(1, {10: 0})
+            self.assertEqual(await anext(events), 'event: stock\ndata: {"10": 0}\n\n')
+            await events.aclose()
+        self.assertEqual(hub.watched(), [])
+
+
+class StockStreamTests(StoreTestCase):
+    def test_wsgi_gets_204(self):
+        product = seed_catalog(1)[0]
+        response = self.client.get(reverse("core:stock_stream", args=[product.pk]))
+        self.assertEqual(response.status_code, 204)
+
+
+class StockNotifyTests(TransactionTestCase):
+    # NOTIFY commit-ზე მიიწოდება — TestCase-ის ტრანზაქციაში არასდროს
+    def test_stock_change_notifies_listeners(self):
+        category = Category.objects.bulk_create([Category(name="Notify", slug="notify")])[0]
+        product = Product.objects.bulk_create([Product(name="Notify", slug="notify", category=category, price=1)])[0]
+        size = Size.objects.bulk_create([Size(name="M")])[0]
+        product_size = ProductSize.objects.bulk_create([ProductSize(product=product, size=size, stock=1)])[0]
+        with psycopg.connect(stock_stream.conninfo(), autocommit=True) as conn:
+            conn.execute(f"LISTEN {stock_stream.CHANNEL}")
+            ProductSize.objects.filter(pk=product_size.pk).update(stock=7)
+            ProductSize.objects.filter(pk=product_size.pk).update(stock=7)  # უცვლელი — NOTIFY არა
+            with connection.cursor() as cur:
+                cur.execute("DELETE FROM core_productsize WHERE id = %s", [product_size.pk])
+            payloads = [json.loads(n.payload) for n in conn.notifies(timeout=1)]
+        self.assertEqual(
+            payloads,
+            [
+                {"product": product.pk, "id": product_size.pk, "stock": 7},
+                {"product": product.pk, "id": product_size.pk, "stock": 0},
+            ],
+        )
+
+
+# -----------------------------
+# Write-behind მთვლელები (core/counters.py)
+# -----------------------------
+class CounterFlushTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(3)
+
+    def test_flush_sums_batches_once(self):
+        a, b = self.products[0].pk, self.products[1].pk
+        buffer = counters.CounterBuffer()
+        for _ in range(2):
+            buffer.add(counters.VIEWS, [a])
+            buffer.add(counters.IMPRESSIONS, [a, b, 10**9])  # წაშლილი პროდუქტი გამოიტოვება
+            buffer.push()
+        self.assertEqual(CounterBatch.objects.count(), 2)
+
+        self.assertEqual(counters.flush_counters(), 2)
+        self.assertFalse(CounterBatch.objects.exists())
+        stats = {s.product_id: (s.views, s.impressions) for s in ProductDailyStats.objects.all()}
+        self.assertEqual(stats, {a: (2, 2), b: (0, 2)})
+
+        # მეორე flush ახალს უმატებს, ძველს აღარ ითვლის
+        buffer.add(counters.VIEWS, [a])
+        buffer.push()
+        counters.flush_counters()
+        self.assertEqual(ProductDailyStats.objects.get(product_id=a).views, 3)
+        self.assertEqual(counters.flush_counters(), 0)
+
+
+# -----------------------------
+# Query plan-ები (core/plans.py)
+# -----------------------------
+class PlanCompareTests(SimpleTestCase):
+    BASE = {
+        "catalog[card]": {
+            "a": {"sql": "SELECT a", "seq_scans": ["core_category"], "sorts": 1},
+            "b": {"sql": "SELECT b", "seq_scans": [], "sorts": 0},
+        }
+    }
+
+    def plan(self, seq_scans=(), sorts=0):
+        return {"sql": "SELECT x", "seq_scans": list(seq_scans), "sorts": sorts}
+
+    def test_improvements_and_removed_queries_pass(self):
+        results = {"catalog[card]": {"a": self.plan()}, "new_view[card]": {"c": self.plan()}}
+        self.assertEqual(plans.compare(self.BASE, results), [])
+
+    def test_new_seq_scan_or_sort_fails(self):
+        results = {"catalog[card]": {"a": self.plan(["core_category", "core_product"], 1), "b": self.plan(sorts=1)}}
+        failures = plans.compare(self.BASE, results)
+        self.assertEqual(len(failures), 2)
+        self.assertIn("Seq Scan on ['core_product']", failures[0])
+        self.assertIn("1 Sort node(s), baseline 0", failures[1])
+
+    def test_new_fingerprint_is_checked_against_the_view(self):
+        ok = {"catalog[card]": {"c": self.plan(["core_category"], 1)}}
+        self.assertEqual(plans.compare(self.BASE, ok), [])
+        bad = {"catalog[card]": {"c": self.plan(["core_productsize"])}}
+        self.assertEqual(len(plans.compare(self.BASE, bad)), 1)
+
+
+@tag("plans")
+@skipUnless(
+    "1" in (os.getenv("RUN_PLAN_TESTS"), os.getenv("UPDATE_PLAN_BASELINE")),
+    "seeds 50k products: RUN_PLAN_TESTS=1",
+)
+class QueryPlanTests(StoreTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # VACUUM ტრანზაქციაში არ მუშაობს — TestCase-ის atomic-მდე
+        plans.vacuum()
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = plans.seed()
+
+    def test_plans_match_baseline(self):
+        results = plans.collect(self.products)
+        if os.getenv("UPDATE_PLAN_BASELINE") == "1":
+            plans.write_baseline(results)
+            self.skipTest(f"baseline written: {plans.BASELINE}")
+        failures = plans.compare(plans.load_baseline(), results)
+        self.assertFalse(
+            failures,
+            "\n".join([*failures, "intended? UPDATE_PLAN_BASELINE=1 python manage.py test core.tests.QueryPlanTests"]),
+        )
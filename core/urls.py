@@ -1,13 +1,42 @@
 # core/urls.py
+from django.conf import settings
+from django.db import transaction
 from django.urls import path
-from .views import IndexView, CatalogView, ProductDetailView, SearchView
+
+from cart.middleware import cart_exempt
+from . import async_views, views
+from .views import AutocompleteView, export_file, stock_stream
 
 app_name = "core"
 
+# იგივე გვერდები async ORM-ით (ASGI); WSGI-ზე — sync
+pages = async_views if settings.ASYNC_VIEWS else views
+IndexView, CatalogView, ProductDetailView, SearchView = (
+    pages.IndexView, pages.CatalogView, pages.ProductDetailView, pages.SearchView,
+)
+
+export = cart_exempt(transaction.non_atomic_requests(export_file))
+
 urlpatterns = [
     path("", IndexView.as_view(), name="index"),
     path("catalog/", CatalogView.as_view(), name="catalog_all"),
     path("catalog/<slug:category_slug>/", CatalogView.as_view(), name="catalog_category"),
     path("product/<slug:slug>/", ProductDetailView.as_view(), name="product_detail"),
+    # async SSE (ASGI); ATOMIC_REQUESTS async view-ს არ უშვებს
+    path(
+        "product/<int:pk>/stock/",
+        cart_exempt(transaction.non_atomic_requests(stock_stream)),
+        name="stock_stream",
+    ),
     path("search/", SearchView.as_view(), name="search"),
+    # ბაზის გარეშე: არც კალათა/სესია, არც ATOMIC_REQUESTS-ის BEGIN/COMMIT
+    path(
+        "search/suggest/",
+        cart_exempt(transaction.non_atomic_requests(AutocompleteView.as_view())),
+        name="autocomplete",
+    ),
+    # წინასწარ აგებული ფაილები (core/exports.py)
+    path("sitemap.xml", export, {"name": "sitemap.xml"}, name="sitemap"),
+    path("sitemaps/<str:name>", export, {"folder": "sitemaps"}, name="sitemap_file"),
+    path("feeds/<str:name>", export, {"folder": "feeds"}, name="feed_file"),
 ]
@@ -1,14 +1,44 @@
 # core/views.py
-from django.shortcuts import get_object_or_404
+import os
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
+from django.views.decorators.http import require_safe
 from django.views.generic import TemplateView, DetailView
+from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
-from django.db.models import Q, Prefetch, Min, Max
-from django.core.cache import cache
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.db.models import Prefetch
+from django.conf import settings
 
-from .models import Product, Category, Size, ProductImage, ProductSize
+from .models import Product, ProductCard, Category, Size, ProductImage, ProductSize, RelatedProduct
 from .forms import ProductFilterForm
-
-CATS_TTL = 60 * 10
+from .autocomplete import suggest
+from .caching import (
+    CATALOG, CATEGORIES, POPULARITY, PRODUCT, SIZES, get_generation, get_generations, tiered, versioned_key,
+)
+from .conditional import ConditionalGetMixin
+from .counters import record_impressions, record_view
+from .engines import engine_for
+from .facets import get_facets
+from .filters import FilterSpec
+from .listing import hydrate, listing_page
+from .partials import Partial, PartialsMixin
+from .rows import fetch_rows
+from .stock_stream import hub, load_stock, stock_events
+
+# თაობის მრიცხველით ინვალიდირდება (core/caching.py), TTL მხოლოდ ნაგვის გასაწმენდად
+CATS_TTL = 60 * 60 * 24
+SIZES_TTL = 60 * 60 * 24
+RELATED_LIMIT = 4
+# typeahead პასუხი პერსონალური არაა — ბრაუზერს/CDN-ს შეუძლია შეინახოს
+SUGGEST_MAX_AGE = 60
+# sitemap / feed ფაილები build_exports-ით ახლდება (cron)
+EXPORT_MAX_AGE = 60 * 60
 
 
 # -----------------------------
@@ -18,52 +48,103 @@ def get_categories_cached():
     """
     კატეგორიების cache-ვა, რომ header-ში ყოველთვის ხელმისაწვდომი იყოს.
     """
-    key = "core:categories:v1"
-    cats = cache.get(key)
-    if cats is None:
-        cats = list(Category.objects.only("id", "name", "slug").order_by("name"))
-        cache.set(key, cats, CATS_TTL)
-    return cats
+    return tiered.get_or_set(
+        versioned_key("core:categories:v2", CATEGORIES),
+        lambda: list(Category.objects.only("id", "name", "slug").order_by("name")),
+        CATS_TTL,
+    )
+
 
+def get_sizes_cached():
+    return tiered.get_or_set(
+        versioned_key("core:sizes:v1", SIZES),
+        lambda: list(Size.objects.only("id", "name").order_by("name")),
+        SIZES_TTL,
+    )
 
-def apply_filters(qs, cleaned):
+
+def listing_queryset():
     """
-    საერთო ჰელპერი: აპლაიებს ფორმით დავალიდებულ ფილტრებს queryset-ზე.
+    სიის გვერდების წყარო: ProductCard read model (ერთი ცხრილი, join-ების გარეშე),
+    ან CATALOG_READ_MODEL=0-ზე ძველი Product + Category. ბარათებისთვის
+    fetch_rows()-ით იკითხება (core/rows.py), მოდელის instance-ების გარეშე.
     """
-    name = cleaned.get("name") or ""
-    color = cleaned.get("color") or ""
-    size = cleaned.get("size") or ""
-    min_price = cleaned.get("min_price")
-    max_price = cleaned.get("max_price")
-
-    if name:
-        qs = qs.filter(name__icontains=name)
-    if color:
-        qs = qs.filter(color__iexact=color)
-    if size:
-        qs = qs.filter(product_size__size__name__iexact=size).distinct()
-    if min_price is not None:
-        qs = qs.filter(price__gte=min_price)
-    if max_price is not None:
-        qs = qs.filter(price__lte=max_price)
-
-    # sort
-    sort = (cleaned.get("sort") or "").strip()
-    if sort == "price_asc":
-        qs = qs.order_by("price")
-    elif sort == "price_desc":
-        qs = qs.order_by("-price")
-    elif sort == "newest":
-        qs = qs.order_by("-created_at")
-    # default relevance -> როგორცაა
-
-    return qs
+    if settings.CATALOG_READ_MODEL:
+        return ProductCard.objects.defer("sizes", "size_keys")
+    return Product.objects.select_related("category").only(
+        "id", "name", "slug", "price", "color", "main_image", "main_image_renditions",
+        "created_at", "updated_at", "category_id",
+    )
+
+
+def get_related_products(product, limit=RELATED_LIMIT):
+    """
+    "ერთად ყიდულობენ" (core/related.py): id-ები ერთი query-ით (product, rank)
+    ინდექსიდან, ბარათები — listing-ის ქეშიდან. ისტორია თუ არ აქვს — იმავე
+    კატეგორიის ახლები.
+    """
+    ids = list(related_ids(product, limit))
+    if ids:
+        return hydrate(listing_queryset(), ids)
+    return fetch_rows(same_category(product, limit))
+
+
+def related_ids(product, limit):
+    return (
+        RelatedProduct.objects.filter(product_id=product.pk)
+        .order_by("rank")
+        .values_list("related_id", flat=True)[:limit]
+    )
+
+
+def same_category(product, limit):
+    return (
+        listing_queryset().filter(category_id=product.category_id).exclude(pk=product.pk).order_by("-created_at")[:limit]
+    )
+
+
+def home_querysets():
+    """(ახლები, ბესტსელერები — core/popularity.py); ერთმანეთზე დამოუკიდებელი query-ები."""
+    base = listing_queryset()
+    return base.order_by("-created_at")[:8], base.filter(popularity__gt=0).order_by("-popularity", "-pk")[:8]
+
+
+def page_context(page, items_template):
+    return {"products": page.items, "page": page, "items_template": items_template}
+
+
+# კატალოგის კატეგორია: სათაური და 404 არარსებულ slug-ზე
+def find_category(categories, slug):
+    """get_categories_cached()-ის სიიდან, query-ის გარეშე; არარსებული slug -> 404."""
+    if not slug:
+        return None
+    for category in categories:
+        if category.slug == slug:
+            return category
+    raise Http404("No Category matches the given query.")
+
+
+def is_load_more(request):
+    """HTMX "load more" მოთხოვნა (შემდეგი გვერდის ფრაგმენტი), არა boosted ნავიგაცია."""
+    return bool(
+        request.headers.get("HX-Request")
+        and not request.headers.get("HX-Boosted")
+        and request.GET.get("cursor")
+    )
 
 
 # -----------------------------
 # Pages
 # -----------------------------
-class IndexView(TemplateView):
+class CatalogVersionMixin(ConditionalGetMixin):
+    """სიის გვერდები: ნებისმიერი პროდუქტის/კატეგორიის/ზომის ცვლილება ზრდის catalog თაობას."""
+
+    def get_validator_parts(self):
+        gens = get_generations(CATALOG, POPULARITY)
+        return [gens[CATALOG], gens[POPULARITY]]
+
+
+class IndexView(CatalogVersionMixin, TemplateView):
     template_name = "core/home_content.html"
 
     def get_context_data(self, **kwargs):
@@ -72,56 +153,43 @@ class IndexView(TemplateView):
         ctx["current_category"] = None
         ctx["search_query"] = self.request.GET.get("q", "")
 
-        base_qs = (
-            Product.objects.select_related("category")
-            .only("id", "name", "slug", "price", "main_image", "created_at", "category_id")
-        )
-        latest = list(base_qs.order_by("-created_at")[:16])
-        ctx["new_products"] = latest[:8]
-        ctx["featured_products"] = latest[8:] or latest[:8]
+        new_qs, featured_qs = home_querysets()
+        ctx["new_products"] = fetch_rows(new_qs)
+        # გაყიდვების გარეშე — ახლები
+        ctx["featured_products"] = fetch_rows(featured_qs) or ctx["new_products"]
         return ctx
 
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(**kwargs)
-        return TemplateResponse(request, self.template_name, context)
+        return TemplateResponse(request, self.template_name, context, using=engine_for("index"))
 
 
-class CatalogView(TemplateView):
+class CatalogView(CatalogVersionMixin, PartialsMixin, TemplateView):
     template_name = "core/catalog.html"
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        path_category_slug = self.kwargs.get("category_slug")
-        categories = get_categories_cached()
-
-        products = (
-            Product.objects.select_related("category")
-            .only("id", "name", "slug", "price", "color", "main_image", "created_at", "category_id")
-            .order_by("-created_at")
-        )
+    engine_name = "catalog"
+    # listing — გვერდის ბარათები, heading — სათაური, facets — ფილტრების panel
+    page_needs = frozenset({"listing", "heading", "facets"})
+    partials = {
+        "filters": Partial("core/includes/catalog_filters.html", frozenset({"facets"})),
+        "load_more": Partial("core/includes/product_page.html", frozenset({"listing"})),
+    }
+
+    def get_partial(self):
+        if self.request.headers.get("HX-Request") and self.request.GET.get("show_filter"):
+            return "filters"
+        if is_load_more(self.request):
+            return "load_more"
+        return None
+
+    def filter_context(self):
+        """ფორმა -> (spec, კონტექსტი ჩიფებისთვის); IO-ს გარეშე."""
         form = ProductFilterForm(self.request.GET)
         form.is_valid()
         cd = form.cleaned_data
 
-        current_category_obj = None
-        current_category_slug = None
         query_category_slug = (cd.get("category") or "").strip()
-
-        if query_category_slug:
-            current_category_obj = get_object_or_404(
-                Category.objects.only("id", "name", "slug"), slug=query_category_slug
-            )
-            products = products.filter(category=current_category_obj)
-            current_category_slug = query_category_slug
-        elif path_category_slug:
-            current_category_obj = get_object_or_404(
-                Category.objects.only("id", "name", "slug"), slug=path_category_slug
-            )
-            products = products.filter(category=current_category_obj)
-            current_category_slug = path_category_slug
-
-        products = apply_filters(products, cd)
+        current_category_slug = query_category_slug or self.kwargs.get("category_slug") or None
+        spec = FilterSpec.from_cleaned(cd, category=current_category_slug)
 
         # UI ჩიფებისთვის პარამეტრები
         filter_params = {
@@ -131,110 +199,141 @@ class CatalogView(TemplateView):
             "size": cd.get("size") or "",
             "min_price": cd.get("min_price") if cd.get("min_price") is not None else "",
             "max_price": cd.get("max_price") if cd.get("max_price") is not None else "",
+            "in_stock": "1" if spec.in_stock else "",
             "q": (self.request.GET.get("q") or "").strip(),
         }
+        return spec, {
+            "current_category": current_category_slug,
+            "filter_params": filter_params,
+            "search_query": "",
+        }
 
-        context.update(
-            {
-                "categories": categories,
-                "products": products,
-                "current_category": current_category_slug,
-                "current_category_obj": current_category_obj,
-                "filter_params": filter_params,
-                "sizes": Size.objects.only("id", "name").order_by("name"),
-                "search_query": "",
-            }
-        )
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        spec, filter_context = self.filter_context()
+        context.update(filter_context)
+        base = listing_queryset()
+
+        # კატეგორია ყოველ მოთხოვნაზე (partial-ზეც) — არარსებული slug ყოველთვის 404-ია
+        categories = get_categories_cached()
+        category = find_category(categories, context["current_category"])
+        if "heading" in self.needs:
+            context["current_category_obj"] = category
+        if "listing" in self.needs:
+            page = listing_page(base, spec, self.request.GET.get("cursor"))
+            context.update(page_context(page, "core/includes/catalog_items.html"))
+        if "heading" in self.needs or "facets" in self.needs:
+            context["categories"] = categories
+        if "facets" in self.needs:
+            context["sizes"] = get_sizes_cached()
+            context["facets"] = get_facets(base, spec, categories=context["categories"], sizes=context["sizes"])
         return context
 
-    def get(self, request, *args, **kwargs):
-        context = self.get_context_data(**kwargs)
-        if request.headers.get("HX-Request") and request.GET.get("show_filter"):
-            return TemplateResponse(request, "core/includes/catalog_filters.html", context)
-        return TemplateResponse(request, self.template_name, context)
-class SearchView(TemplateView):
+
+class SearchView(CatalogVersionMixin, PartialsMixin, TemplateView):
     """
     /search/?q=...&category=slug&size=M&color=Black&min_price=0&max_price=1000&sort=price_asc
     """
     template_name = "core/search_results.html"
+    engine_name = "search"
+    page_needs = frozenset({"listing", "facets"})
+    partials = {
+        "load_more": Partial("core/includes/product_page.html", frozenset({"listing"})),
+    }
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
+    def get_partial(self):
+        return "load_more" if is_load_more(self.request) else None
 
+    def filter_context(self):
+        """-> (spec, ფორმის cleaned_data, q); IO-ს გარეშე."""
         q = (self.request.GET.get("q") or "").strip()
-
-        products = (
-            Product.objects.select_related("category")
-            .only("id", "name", "slug", "price", "color", "main_image", "created_at", "category_id")
-        )
-
-        # ტექსტური ძებნა
-        if q:
-            for term in q.split():
-                products = products.filter(
-                    Q(name__icontains=term)
-                    | Q(description__icontains=term)
-                    | Q(category__name__icontains=term)
-                    | Q(color__icontains=term)
-                )
-            products = products.distinct()
-
-        # ვალიდაცია/ფილტრები ProductFilterForm-ით
+        # ვალიდაცია/ფილტრები ProductFilterForm-ით; ტექსტური ძებნაც spec-შია (PostgreSQL FTS)
         form = ProductFilterForm(self.request.GET)
         form.is_valid()
         cd = form.cleaned_data
-
-        # category (თუ მიეცა)
         category_slug = (cd.get("category") or "").strip()
-        if category_slug:
-            products = products.filter(category__slug=category_slug)
+        return FilterSpec.from_cleaned(cd, category=category_slug, q=q), cd, q
 
-        # დანარჩენი ფილტრები + სორტი
-        products = apply_filters(products, cd)
+    def results_context(self, page, cd, q):
+        if q:
+            record_impressions([p.pk for p in page.items])
+        return {
+            "current_category": (cd.get("category") or "").strip() or None,
+            "search_query": q,
+            **page_context(page, "core/includes/search_items.html"),
+        }
 
-        # შაბლონისთვის დამატებითი მონაცემები (select options და არჩეული მნიშვნელობები)
-        size = cd.get("size") or ""
-        color = cd.get("color") or ""
+    @staticmethod
+    def facets_context(facets, spec, cd, categories, sizes):
+        """შაბლონისთვის დამატებითი მონაცემები (select options და არჩეული მნიშვნელობები)."""
         pmin = cd.get("min_price")
         pmax = cd.get("max_price")
-        sort = cd.get("sort") or ""
-
-        ctx.update(
-            {
-                "categories": get_categories_cached(),
-                "current_category": category_slug or None,
-                "search_query": q,
-                "products": products,
-                "sizes": Size.objects.only("id", "name").order_by("name"),
-                "colors": (
-                    Product.objects.exclude(color__isnull=True)
-                    .exclude(color__exact="")
-                    .values_list("color", flat=True)
-                    .distinct()
-                    .order_by("color")
-                ),
-                "price_range": Product.objects.aggregate(lo=Min("price"), hi=Max("price")),
-                "selected_size": size,
-                "selected_color": color,
-                "price_min": pmin if pmin is not None else "",
-                "price_max": pmax if pmax is not None else "",
-                "sort": sort,
-            }
-        )
+        return {
+            "categories": categories,
+            "sizes": sizes,
+            "facets": facets,
+            # ფასეტებიდან — მიმდინარე ფილტრის შედეგზე და არა მთელ ცხრილზე
+            "colors": [c["name"] for c in facets["colors"]],
+            "price_range": facets["price_range"],
+            "selected_size": cd.get("size") or "",
+            "selected_color": cd.get("color") or "",
+            "price_min": pmin if pmin is not None else "",
+            "price_max": pmax if pmax is not None else "",
+            "sort": cd.get("sort") or "",
+            "in_stock": spec.in_stock,
+        }
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        spec, cd, q = self.filter_context()
+        base = listing_queryset()
+        # ID-ების სია + ბარათები ქეშიდან (headline-ებიც), core/listing.py
+        page = listing_page(base, spec, self.request.GET.get("cursor"))
+        ctx.update(self.results_context(page, cd, q))
+        if "facets" in self.needs:
+            categories = get_categories_cached()
+            sizes = get_sizes_cached()
+            facets = get_facets(base, spec, categories=categories, sizes=sizes)
+            ctx.update(self.facets_context(facets, spec, cd, categories, sizes))
         return ctx
 
 
-class ProductDetailView(DetailView):
+class ProductDetailView(ConditionalGetMixin, DetailView):
     model = Product
     template_name = "core/product_detail.html"
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_validator_parts(self):
+        """
+        updated_at — პროდუქტის ველები; product:<id> თაობა — ზომები/მარაგი/სურათები;
+        catalog თაობა — "Related products" ბლოკი.
+        """
+        # [:1] და არა first(): unique slug-ზე ORDER BY pk ზედმეტი Sort-ია
+        rows = list(
+            Product.objects.filter(slug=self.kwargs.get(self.slug_url_kwarg)).values_list("pk", "updated_at")[:1]
+        )
+        if not rows:
+            return None  # 404-ს ჩვეულებრივი გზა აბრუნებს
+        pk, updated_at = rows[0]
+        self.product_pk = pk
+        return [pk, updated_at, get_generation(PRODUCT, pk), get_generation(CATALOG)]
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        # 304-იც ნახვაა (ბრაუზერის ქეშიდან ნაჩვენები გვერდი)
+        if response.status_code in (200, 304) and getattr(self, "product_pk", None):
+            record_view(self.product_pk)
+        return response
+
     def get_queryset(self):
         return (
             Product.objects.select_related("category")
             .prefetch_related(
-                Prefetch("images", queryset=ProductImage.objects.only("id", "image")),
+                Prefetch(
+                    "images",
+                    queryset=ProductImage.objects.only("id", "product_id", "image", "renditions"),
+                ),
                 Prefetch(
                     "product_size",  # შეცვალე თუ related_name სხვაა
                     queryset=ProductSize.objects.select_related("size")
@@ -250,40 +349,102 @@ class ProductDetailView(DetailView):
                 "color",
                 "description",
                 "main_image",
+                "main_image_renditions",
                 "category_id",
             )
         )
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        product = self.object
-
-        images = list(product.images.all())
+    @staticmethod
+    def product_context(product):
+        """prefetch-ილი ურთიერთობებიდან — ახალი query-ების გარეშე."""
         ps_all = list(product.product_size.all())  # შეცვალე თუ related_name სხვაა
         available_ps = [ps for ps in ps_all if ps.stock > 0]
+        return {
+            "current_category": product.category.slug,
+            "gallery_images": list(product.images.all()),
+            "available_sizes": available_ps,
+            # ამოწურულებიც — live მარაგისთვის (core/stock_stream.py)
+            "product_sizes": ps_all,
+            "has_stock": bool(available_ps),
+            "sizes_count": len(available_ps),
+            "first_size": available_ps[0] if available_ps else None,
+        }
 
-        ctx.update(
-            {
-                "categories": get_categories_cached(),
-                "current_category": product.category.slug,
-                "gallery_images": images,
-                "available_sizes": available_ps,
-                "has_stock": bool(available_ps),
-                "sizes_count": len(available_ps),
-                "first_size": available_ps[0] if available_ps else None,
-                "related_products": (
-                    Product.objects.filter(category_id=product.category_id)
-                    .exclude(id=product.id)
-                    .only("id", "name", "slug", "main_image", "price", "category_id")
-                    .prefetch_related(
-                        Prefetch("images", queryset=ProductImage.objects.only("id", "image"))
-                    )[:4]
-                ),
-            }
-        )
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx.update(self.product_context(self.object))
+        ctx["categories"] = get_categories_cached()
+        ctx["related_products"] = get_related_products(self.object)
         return ctx
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
         context = self.get_context_data(**kwargs)
         return TemplateResponse(request, self.template_name, context)
+
+
+class AutocompleteView(View):
+    """
+    /search/suggest/?q=lea — typeahead in-process ინდექსიდან (core/autocomplete.py):
+    HTMX-ზე ფრაგმენტი, სხვაგვარად JSON. ბაზას არ ეხება — context processor-ების
+    გარეშე რენდერდება, კალათის middleware და ტრანზაქცია კი urls.py-შია გამორთული.
+    """
+    http_method_names = ["get"]
+
+    def get(self, request, *args, **kwargs):
+        q = (request.GET.get("q") or "").strip()
+        suggestions = suggest(q)
+        if request.headers.get("HX-Request"):
+            html = render_to_string("core/includes/autocomplete.html", {"q": q, "suggestions": suggestions})
+            response = HttpResponse(html)
+        else:
+            response = JsonResponse({"q": q, "results": [s.as_dict() for s in suggestions]})
+        patch_vary_headers(response, ("HX-Request",))
+        patch_cache_control(response, public=True, max_age=SUGGEST_MAX_AGE)
+        return response
+
+
+@require_safe
+def export_file(request, name, folder=""):
+    """
+    core/exports.py-ის ფაილები settings.EXPORTS_ROOT-იდან: FileResponse (gunicorn-ზე
+    sendfile) და ETag / Last-Modified გახსნილი ფაილის fstat-იდან — os.replace-ით
+    ჩანაცვლებული ფაილი ახალ ვალიდატორს იღებს. If-None-Match / If-Modified-Since -> 304.
+    """
+    try:
+        fh = open(safe_join(settings.EXPORTS_ROOT, folder, name), "rb")
+    except (OSError, SuspiciousFileOperation):
+        raise Http404
+    stat = os.fstat(fh.fileno())
+    etag = quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        # .xml.gz -> application/gzip, Content-Encoding-ის გარეშე (sitemap-ის ფაილი თვითონაა gzip)
+        response = FileResponse(fh)
+    else:
+        fh.close()
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=EXPORT_MAX_AGE)
+    return response
+
+
+@require_safe
+async def stock_stream(request, pk):
+    """SSE: პროდუქტის ზომების მარაგის ცვლილებები (core/stock_stream.py); მხოლოდ ASGI-ზე."""
+    if not isinstance(request, ASGIRequest):
+        # WSGI-ზე ღია ნაკადი მთელ worker-ს დაიკავებდა; 204-ზე EventSource აღარ უკავშირდება
+        return HttpResponse(status=204)
+    # ჯერ subscribe, მერე snapshot — შუაში მომხდარი ცვლილება არ დაიკარგება
+    subscription = hub.subscribe(pk)
+    snapshot = (await load_stock([pk]))[pk]
+    if not snapshot and not await Product.objects.filter(pk=pk).aexists():
+        hub.unsubscribe(subscription)
+        raise Http404
+    response = StreamingHttpResponse(stock_events(subscription, snapshot), content_type="text/event-stream")
+    # nginx-მა ნაკადი არ დააბუფეროს
+    response["X-Accel-Buffering"] = "no"
+    patch_cache_control(response, no_cache=True)
+    return response
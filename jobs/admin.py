@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'queue', 'task')
+    search_fields = ('task', 'key', 'last_error')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'locked_by', 'last_error')
@@ -0,0 +1,70 @@
+# jobs/management/commands/jobstats.py
+"""
+python manage.py jobstats [--window 60] [--prune-days 7]
+
+თითო queue-ზე: რიგის სიღრმე (მზა / დაგეგმილი), running, failed, ყველაზე
+ძველი მზა Job-ის ასაკი და ბოლო `window` წუთის ლოდინის p50/p95
+(run_at -> started_at) და შესრულების დრო.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from jobs.models import Job
+
+STATS_SQL = """
+SELECT queue,
+       COUNT(*) FILTER (WHERE status = 'queued' AND run_at <= %(now)s),
+       COUNT(*) FILTER (WHERE status = 'queued' AND run_at > %(now)s),
+       COUNT(*) FILTER (WHERE status = 'running'),
+       COUNT(*) FILTER (WHERE status = 'failed'),
+       EXTRACT(EPOCH FROM %(now)s - MIN(run_at) FILTER (WHERE status = 'queued' AND run_at <= %(now)s)),
+       percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM started_at - run_at))
+           FILTER (WHERE status = 'done' AND finished_at >= %(since)s),
+       percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM started_at - run_at))
+           FILTER (WHERE status = 'done' AND finished_at >= %(since)s),
+       AVG(EXTRACT(EPOCH FROM finished_at - started_at))
+           FILTER (WHERE status = 'done' AND finished_at >= %(since)s),
+       COUNT(*) FILTER (WHERE status = 'done' AND finished_at >= %(since)s)
+  FROM jobs_job
+ GROUP BY queue
+ ORDER BY queue
+"""
+
+COLUMNS = ("queue", "ready", "scheduled", "running", "failed", "oldest_s", "wait_p50_s", "wait_p95_s", "run_avg_s", "done")
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float) or hasattr(value, "as_integer_ratio"):
+        return f"{float(value):.2f}"
+    return str(value)
+
+
+class Command(BaseCommand):
+    help = "Shows job queue depth and latency; optionally prunes finished jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window", type=int, default=60, help="minutes for latency stats")
+        parser.add_argument("--prune-days", type=int, help="delete done jobs older than N days")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        since = now - timedelta(minutes=options["window"])
+        with connection.cursor() as cur:
+            cur.execute(STATS_SQL, {"now": now, "since": since})
+            rows = cur.fetchall()
+
+        widths = [max(len(c), *(len(_fmt(r[i])) for r in rows)) if rows else len(c) for i, c in enumerate(COLUMNS)]
+        self.stdout.write("  ".join(c.ljust(w) for c, w in zip(COLUMNS, widths)))
+        for row in rows:
+            self.stdout.write("  ".join(_fmt(v).ljust(w) for v, w in zip(row, widths)))
+
+        if options["prune_days"] is not None:
+            deleted, _ = Job.objects.filter(
+                status=Job.DONE, finished_at__lt=now - timedelta(days=options["prune_days"])
+            ).delete()
+            self.stdout.write(self.style.SUCCESS(f"{deleted} finished jobs pruned"))
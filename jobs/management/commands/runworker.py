@@ -0,0 +1,55 @@
+# jobs/management/commands/runworker.py
+"""
+python manage.py runworker --queues default:4,images:2 [--burst]
+
+დავალებას, რომელსაც web-ის ქეში, ატვირთული ფაილები ან EXPORTS_ROOT სჭირდება
+და worker მათ ვერ ხედავს (jobs/worker.py: shared_state_problems), worker არ
+იღებს — გაფრთხილებით, Job-ები რიგში რჩება. დანარჩენი დავალებები სრულდება.
+"""
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.worker import Worker, shared_state_problems
+
+
+def parse_queues(value):
+    """ "default:4,images:2" -> {"default": 4, "images": 2} """
+    queues = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, n = part.partition(":")
+        try:
+            queues[name] = int(n or 1)
+        except ValueError:
+            raise CommandError(f"bad queue spec {part!r}")
+        if queues[name] < 1:
+            raise CommandError(f"concurrency must be >= 1: {part!r}")
+    if not queues:
+        raise CommandError("no queues given")
+    return queues
+
+
+class Command(BaseCommand):
+    help = "Runs background jobs from the jobs_job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queues", default=settings.JOBS_QUEUES)
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument("--burst", action="store_true", help="exit when the queues are empty")
+
+    def handle(self, *args, **options):
+        queues = parse_queues(options["queues"])
+        skip = shared_state_problems(queues)
+        for name, problems in skip.items():
+            self.stderr.write(f"skipping {name}, it cannot share state with web:\n  " + "\n  ".join(problems))
+        worker = Worker(
+            queues, batch_size=options["batch_size"], poll_interval=options["poll_interval"], skip_tasks=skip
+        )
+        # SIGTERM (deploy) — ახალს აღარ ვიღებთ, მიმდინარეებს ვასრულებთ
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        self.stdout.write(f"worker {worker.locked_by}: {queues}")
+        worker.run(burst=options["burst"])
+        self.stdout.write("worker stopped")
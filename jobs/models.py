@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    ფონური დავალება. იქმნება enqueue()-ით request-ის ტრანზაქციაში, სრულდება
+    `manage.py runworker`-ით (jobs/worker.py).
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # იდემპოტენტობა: იგივე key-ით მეორე enqueue იგნორირდება (მაგ. Stripe event id)
+    key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # claim query: WHERE status='queued' AND queue=... AND run_at <= now ORDER BY run_at
+            models.Index(
+                fields=['queue', 'run_at', 'id'],
+                name='jobs_ready_idx',
+                condition=models.Q(status='queued'),
+            ),
+            models.Index(
+                fields=['started_at'],
+                name='jobs_running_idx',
+                condition=models.Q(status='running'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,81 @@
+# jobs/registry.py
+"""
+დავალებების რეესტრი და enqueue.
+
+    # core/tasks.py
+    @task("core.image_renditions", queue="images", max_attempts=3, shares=(CACHE, MEDIA))
+    def image_renditions(model, pk):
+        ...
+
+    enqueue("core.image_renditions", model="core.product", pk=product.pk)
+
+payload JSON-ში ინახება, ამიტომ არგუმენტები მხოლოდ JSON-ად სერიალიზებადია.
+shares — web-თან საერთო რა სჭირდება დავალებას (jobs/worker.py: shared_state_problems).
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+REGISTRY = {}
+
+# web-თან საერთო მდგომარეობა, რომელსაც დავალება ეყრდნობა
+CACHE = "cache"      # shared ქეში: თაობების bump, ინვალიდაცია
+MEDIA = "media"      # default_storage: ატვირთული სურათები და ვერსიები
+EXPORTS = "exports"  # settings.EXPORTS_ROOT
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: object
+    queue: str
+    max_attempts: int
+    # backoff: base * 2^(attempt-1) წამი, მაქსიმუმ cap
+    backoff_base: int = 10
+    backoff_cap: int = 60 * 60
+    shares: tuple = ()
+
+
+def task(name, queue="default", max_attempts=5, backoff_base=10, shares=()):
+    def decorator(func):
+        REGISTRY[name] = Task(name, func, queue, max_attempts, backoff_base, shares=tuple(shares))
+        return func
+
+    return decorator
+
+
+def get_task(name):
+    return REGISTRY.get(name)
+
+
+def enqueue(name, *, key=None, delay=None, queue=None, **kwargs):
+    """
+    ქმნის Job-ს მიმდინარე ტრანზაქციაში — rollback-ზე დავალებაც ქრება,
+    worker კი მას მხოლოდ commit-ის შემდეგ დაინახავს. key-ის დუბლიკატზე
+    აბრუნებს None-ს.
+    """
+    spec = REGISTRY.get(name)
+    if spec is None:
+        raise KeyError(f"unknown task {name!r}")
+    job = Job(
+        queue=queue or spec.queue,
+        task=name,
+        payload=kwargs,
+        key=key,
+        max_attempts=spec.max_attempts,
+        run_at=timezone.now() + (delay or timedelta(0)),
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        # savepoint, რომ დუბლიკატმა გარე ტრანზაქცია არ გააფუჭოს
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return None
+    return job
@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import EXPORTS, MEDIA, enqueue, get_task, task
+from .worker import STALE_AFTER, backoff, claim, execute, requeue_stale, shared_state_problems
+
+CALLS = []
+
+
+@task("jobs.tests.record", queue="tests")
+def record(value):
+    CALLS.append(value)
+
+
+@task("jobs.tests.flaky", queue="tests", max_attempts=2, backoff_base=30)
+def flaky():
+    raise RuntimeError("boom")
+
+
+@task("jobs.tests.files", queue="tests", shares=(MEDIA, EXPORTS))
+def files():
+    pass
+
+
+# -----------------------------
+# enqueue / claim
+# -----------------------------
+class ClaimTests(TestCase):
+    def test_enqueue_is_idempotent_by_key(self):
+        self.assertIsNotNone(enqueue("jobs.tests.record", key="evt-1", value=1))
+        self.assertIsNone(enqueue("jobs.tests.record", key="evt-1", value=2))
+        self.assertEqual(Job.objects.get().payload, {"value": 1})
+        with self.assertRaises(KeyError):
+            enqueue("jobs.tests.missing")
+
+    def test_claim_takes_ready_jobs_in_order(self):
+        first = enqueue("jobs.tests.record", value=1)
+        second = enqueue("jobs.tests.record", value=2)
+        later = enqueue("jobs.tests.record", delay=timedelta(hours=1), value=3)
+        other = enqueue("jobs.tests.record", queue="elsewhere", value=4)
+
+        claimed = claim("tests", 10, "w1")
+        self.assertEqual([j.pk for j in claimed], [first.pk, second.pk])
+        for job in claimed:
+            self.assertEqual((job.status, job.attempts, job.locked_by), (Job.RUNNING, 1, "w1"))
+        self.assertEqual(claim("tests", 10, "w2"), [])
+        for job in (later, other):
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.QUEUED)
+
+    def test_claim_respects_limit(self):
+        for value in range(3):
+            enqueue("jobs.tests.record", value=value)
+        self.assertEqual(len(claim("tests", 2, "w1")), 2)
+        self.assertEqual(len(claim("tests", 0, "w1")), 0)
+        self.assertEqual(len(claim("tests", 2, "w1")), 1)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = enqueue("jobs.tests.record", value=1)
+        claim("tests", 1, "dead")
+        self.assertEqual(requeue_stale(), 0)
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - STALE_AFTER - timedelta(seconds=1))
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.QUEUED, "", 1))
+
+    def test_stale_job_at_max_attempts_fails(self):
+        job = enqueue("jobs.tests.flaky")
+        claim("tests", 1, "dead")
+        Job.objects.filter(pk=job.pk).update(
+            attempts=2, started_at=timezone.now() - STALE_AFTER - timedelta(seconds=1)
+        )
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.FAILED, ""))
+        self.assertIsNotNone(job.finished_at)
+        self.assertIn("worker died", job.last_error)
+
+    def test_claim_leaves_skipped_tasks_queued(self):
+        skipped = enqueue("jobs.tests.files")
+        taken = enqueue("jobs.tests.record", value=1)
+        self.assertEqual([j.pk for j in claim("tests", 10, "w1", skip_tasks=["jobs.tests.files"])], [taken.pk])
+        skipped.refresh_from_db()
+        self.assertEqual(skipped.status, Job.QUEUED)
+
+
+# -----------------------------
+# web-თან საერთო მდგომარეობა
+# -----------------------------
+@override_settings(
+    WORKER_SHARED_VOLUME=False,
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+)
+class SharedStateTests(TestCase):
+    def test_only_tasks_touching_files_are_flagged(self):
+        problems = shared_state_problems({"tests": 1})
+        self.assertEqual(list(problems), ["jobs.tests.files"])
+        self.assertEqual(len(problems["jobs.tests.files"]), 2)
+        self.assertEqual(shared_state_problems({"elsewhere": 1}), {})
+
+    def test_shared_volume_clears_file_problems(self):
+        with self.settings(WORKER_SHARED_VOLUME=True):
+            self.assertEqual(shared_state_problems({"tests": 1}), {})
+
+
+# -----------------------------
+# execute / retry
+# -----------------------------
+class ExecuteTests(TransactionTestCase):
+    # execute() — worker-ის thread-ში, autocommit-ით; close_old_connections()
+    # TestCase-ის ტრანზაქციას დახურავდა
+    def setUp(self):
+        CALLS.clear()
+
+    def run_one(self):
+        job = claim("tests", 1, "w1")[0]
+        execute(job)
+        job.refresh_from_db()
+        return job
+
+    def test_success(self):
+        enqueue("jobs.tests.record", value=7)
+        job = self.run_one()
+        self.assertEqual(CALLS, [7])
+        self.assertEqual((job.status, job.locked_by), (Job.DONE, ""))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        enqueue("jobs.tests.flaky")
+        before = timezone.now()
+        job = self.run_one()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn("RuntimeError: boom", job.last_error)
+        # backoff_base=30, ±20% jitter
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=24))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        job = self.run_one()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unknown_task_fails_without_retry(self):
+        Job.objects.create(queue="tests", task="jobs.tests.gone")
+        job = self.run_one()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("unknown task", job.last_error)
+
+    def test_backoff_grows_and_is_capped(self):
+        spec = get_task("jobs.tests.flaky")
+        self.assertLessEqual(backoff(spec, 1), timedelta(seconds=36))
+        self.assertGreaterEqual(backoff(spec, 3), timedelta(seconds=96))
+        self.assertLessEqual(backoff(spec, 30), timedelta(seconds=spec.backoff_cap * 1.2))
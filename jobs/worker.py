@@ -0,0 +1,223 @@
+# jobs/worker.py
+"""
+Worker: დავალებების აღება (claim) და შესრულება.
+
+claim — ერთი ტრანზაქცია: SELECT ... FOR UPDATE SKIP LOCKED LIMIT n, შემდეგ
+UPDATE status='running'. რამდენიმე worker პროცესი ერთმანეთს არ ელოდება და
+ერთსა და იმავე Job-ს ორჯერ ვერ აიღებს. თითო queue-ს საკუთარი thread pool
+აქვს (concurrency), ამიტომ ნელი queue სწრაფს არ აჩერებს.
+"""
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import CACHE, EXPORTS, MEDIA, REGISTRY, get_task
+
+# running-ში ამდენი ხანი -> worker მოკვდა, Job თავიდან რიგში დგება
+STALE_AFTER = timedelta(minutes=15)
+
+
+# shared ქეშის backend-ები, რომლებიც პროცესის/მანქანის გარეთ არ ჩანს
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+HOST_LOCAL_CACHES = ("django.core.cache.backends.filebased.FileBasedCache",)
+
+
+def _missing(resource):
+    """რატომ ვერ ხედავს worker resource-ს ისე, როგორც web (None — ხედავს)."""
+    if resource == CACHE:
+        backend = settings.CACHES[settings.SHARED_CACHE_ALIAS]["BACKEND"]
+        if backend in PROCESS_LOCAL_CACHES:
+            return f"shared cache {backend} is per-process: set SHARED_CACHE_BACKEND to Redis/Memcached"
+        if backend in HOST_LOCAL_CACHES and not settings.WORKER_SHARED_VOLUME:
+            location = settings.CACHES[settings.SHARED_CACHE_ALIAS]["LOCATION"]
+            return f"shared cache is a local directory ({location}): use Redis/Memcached or WORKER_SHARED_VOLUME=1"
+    elif resource == MEDIA:
+        if isinstance(default_storage, FileSystemStorage) and not settings.WORKER_SHARED_VOLUME:
+            return (
+                f"media files are on local disk ({settings.MEDIA_ROOT}): "
+                "use a network storage backend or WORKER_SHARED_VOLUME=1"
+            )
+    elif resource == EXPORTS:
+        # build_exports-ის ფაილებს web აბრუნებს (core/views.py: export_file) — სხვა გზა არაა
+        if not settings.WORKER_SHARED_VOLUME:
+            return f"exports are written to a local directory ({settings.EXPORTS_ROOT}): set WORKER_SHARED_VOLUME=1"
+    return None
+
+
+def shared_state_problems(queues):
+    """
+    {task: [პრობლემა, ...]} — queues-ის დავალებები, რომლებსაც (Task.shares) web-თან
+    საერთო რამე აკლია: shared ქეში, ატვირთული ფაილები, EXPORTS_ROOT. worker მათ
+    Job-ებს არ იღებს; მხოლოდ ბაზაზე მომუშავე დავალებები ყოველთვის სრულდება.
+    """
+    problems = {}
+    for spec in REGISTRY.values():
+        if spec.queue not in queues:
+            continue
+        found = [p for p in map(_missing, spec.shares) if p]
+        if found:
+            problems[spec.name] = found
+    return problems
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(queue, limit, locked_by, skip_tasks=()):
+    """skip_tasks — დავალებები, რომლებსაც ეს worker ვერ შეასრულებს; რიგში რჩება."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.QUEUED, queue=queue, run_at__lte=now)
+            .exclude(task__in=skip_tasks)
+            .order_by("run_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids).update(
+            status=Job.RUNNING, started_at=now, locked_by=locked_by, attempts=F("attempts") + 1
+        )
+    return list(Job.objects.filter(id__in=ids).order_by("run_at", "id"))
+
+
+def backoff(spec, attempts):
+    delay = min(spec.backoff_base * 2 ** (attempts - 1), spec.backoff_cap)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def execute(job):
+    """thread-ში: დავალების გაშვება და შედეგის ჩაწერა."""
+    close_old_connections()
+    spec = get_task(job.task)
+    try:
+        if spec is None:
+            raise LookupError(f"unknown task {job.task!r}")
+        spec.func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if spec is not None and job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED, run_at=now + backoff(spec, job.attempts),
+                last_error=error, locked_by="",
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED, finished_at=now, last_error=error, locked_by=""
+            )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.DONE, finished_at=timezone.now(), locked_by=""
+        )
+    finally:
+        close_old_connections()
+
+
+def requeue_stale():
+    """
+    მკვდარი worker-ის running Job-ები -> queued (attempts უკვე გაზრდილია);
+    max_attempts-ს მიღწეულები — failed, როგორც execute()-ში.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=now - STALE_AFTER)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, finished_at=now, last_error="worker died while running the job", locked_by=""
+    )
+    requeued = stale.update(status=Job.QUEUED, locked_by="", run_at=now)
+    return requeued + failed
+
+
+class QueueRunner:
+    """ერთი queue: thread pool + თავისუფალი სლოტების მრიცხველი."""
+
+    def __init__(self, queue, concurrency):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"job-{queue}")
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def free_slots(self):
+        with self._lock:
+            return self.concurrency - self.in_flight
+
+    def submit(self, job):
+        with self._lock:
+            self.in_flight += 1
+        future = self.pool.submit(execute, job)
+        future.add_done_callback(self._done)
+
+    def _done(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+class Worker:
+    def __init__(self, queues, batch_size=10, poll_interval=1.0, skip_tasks=()):
+        self.runners = [QueueRunner(q, n) for q, n in queues.items()]
+        self.skip_tasks = tuple(skip_tasks)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.locked_by = worker_id()
+        self._stop = threading.Event()
+
+    def stop(self, *_args):
+        self._stop.set()
+
+    def tick(self):
+        """ერთი გავლა ყველა queue-ზე; აბრუნებს აღებული Job-ების რაოდენობას."""
+        claimed = 0
+        for runner in self.runners:
+            jobs = claim(
+                runner.queue, min(self.batch_size, runner.free_slots()), self.locked_by, self.skip_tasks
+            )
+            for job in jobs:
+                runner.submit(job)
+            claimed += len(jobs)
+        return claimed
+
+    def idle(self):
+        return all(r.in_flight == 0 for r in self.runners)
+
+    def run(self, burst=False):
+        """burst=True — რიგი რომ დაცარიელდება, გამოვდივართ (deploy/cron-ისთვის)."""
+        last_reap = 0.0
+        try:
+            while not self._stop.is_set():
+                if time.monotonic() - last_reap > 60:
+                    requeue_stale()
+                    last_reap = time.monotonic()
+                # idle — tick-მდე: შესრულებისას ჩავარდნილი Job შეიძლება რიგში დაბრუნდეს
+                was_idle = self.idle()
+                claimed = self.tick()
+                close_old_connections()
+                if burst and not claimed and was_idle:
+                    break
+                if not claimed:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            for runner in self.runners:
+                runner.shutdown()
@@ -4,4 +4,12 @@ set -o errexit
 DJANGO_SETTINGS_MODULE=config.settings
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
-gunicorn config.wsgi:application --bind 0.0.0.0:$PORT
\ No newline at end of file
+
+# SERVER=asgi — uvicorn + async გვერდები (core/async_views.py) + psycopg pool;
+# სხვა შემთხვევაში — gunicorn (WSGI, sync). uvloop/httptools (requirements.txt) აუცილებელია:
+# asyncio loop-ზე --workers რეჟიმში TCP_NODELAY არ ირთვება და პასუხს ~40ms ემატება
+if [ "${SERVER:-wsgi}" = "asgi" ]; then
+    export ASYNC_VIEWS=1 DB_POOL=1
+    exec uvicorn config.asgi:application --host 0.0.0.0 --port $PORT --workers ${WEB_CONCURRENCY:-2}
+fi
+gunicorn config.wsgi:application --bind 0.0.0.0:$PORT
@@ -1,3 +1,37 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from core.models import ProductSize
+from core.seeding import seed_catalog
+from core.testing import StoreTestCase
+
+
+# -----------------------------
+# Checkout-ის ჯამი (cart.subtotal)
+# -----------------------------
+class CheckoutTotalTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = seed_catalog(2)
+        cls.user = get_user_model().objects.create(email="buyer@example.com", first_name="B", last_name="O")
+
+    def add(self, product, quantity):
+        size = ProductSize.objects.filter(product=product).first()
+        self.client.post(reverse("cart:add_to_cart", args=[product.slug]), {"size_id": size.pk, "quantity": quantity})
+
+    def test_checkout_shows_the_stored_subtotal_at_current_prices(self):
+        self.client.force_login(self.user)
+        a, b = self.products
+        self.add(a, 2)
+        self.add(b, 1)
+        a.price = Decimal("4.50")
+        a.save()
+
+        response = self.client.get(reverse("orders:checkout"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_price"], Decimal("9.00") + b.price)
+        self.assertEqual(
+            response.context["total_price"], sum(item.total_price for item in response.context["cart_items"])
+        )
@@ -1,5 +1,4 @@
 # orders/views.py
-from decimal import Decimal
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -22,6 +21,17 @@ def _is_htmx_partial(request) -> bool:
     return bool(hx) and not bool(boosted)
 
 
+def _checkout_items(cart):
+    """
+    კალათის სტრიქონები და შენახული ჯამი (cart.subtotal). ის მიმდინარე ფასებითაა:
+    item-ის ცვლილება F()-ით, ფასის ცვლილება და წაშლა — recount_totals()
+    (cart/models.py, cart/signals.py) — ამიტომ OrderItem-ებს და Stripe-ის line
+    item-ებს ემთხვევა. ფასს queryset.update()-ით ნუ შეცვლით — სიგნალი არ ეშვება.
+    """
+    items = list(cart.items.select_related("product", "product_size__size").order_by("-added_at"))
+    return items, cart.subtotal
+
+
 @method_decorator(login_required(login_url="/users/login"), name="dispatch")
 class CheckOutView(CartMixin, View):
     def get(self, request):
@@ -38,11 +48,12 @@ class CheckOutView(CartMixin, View):
                 )
             return redirect("cart:summary")
 
+        cart_items, total_price = _checkout_items(cart)
         context = {
             "form": OrderForm(user=request.user),
             "cart": cart,
-            "cart_items": cart.items.select_related("product", "product_size__size").order_by("-added_at"),
-            "total_price": cart.subtotal,
+            "cart_items": cart_items,
+            "total_price": total_price,
         }
 
         if _is_htmx_partial(request):
@@ -65,19 +76,19 @@ class CheckOutView(CartMixin, View):
                 )
             return redirect("cart:summary")
 
+        cart_items, total_price = _checkout_items(cart)
         if not payment_provider or payment_provider not in ["stripe", "heleket"]:
             context = {
                 "form": OrderForm(user=request.user),
                 "cart": cart,
-                "cart_items": cart.items.select_related("product", "product_size__size").order_by("-added_at"),
-                "total_price": cart.subtotal,
+                "cart_items": cart_items,
+                "total_price": total_price,
                 "error_message": "Please select a valid payment method (Stripe or Heleket).",
             }
             if _is_htmx_partial(request):
                 return TemplateResponse(request, "orders/checkout_content.html", context)
             return render(request, "orders/checkout.html", context)
 
-        total_price = cart.subtotal
         form_data = request.POST.copy()
         if not form_data.get("email"):
             form_data["email"] = request.user.email
@@ -102,14 +113,16 @@ class CheckOutView(CartMixin, View):
                 payment_provider=payment_provider,
             )
 
-            for item in cart.items.select_related("product", "product_size__size"):
-                OrderItem.objects.create(
+            OrderItem.objects.bulk_create(
+                OrderItem(
                     order=order,
                     product=item.product,
                     size=item.product_size,
                     quantity=item.quantity,
-                    price=item.product.price or Decimal("0.00"),
+                    price=item.product.price,
                 )
+                for item in cart_items
+            )
 
             # Stripe checkout
             try:
@@ -126,7 +139,7 @@ class CheckOutView(CartMixin, View):
                 context = {
                     "form": form,
                     "cart": cart,
-                    "cart_items": cart.items.select_related("product", "product_size__size").order_by("-added_at"),
+                    "cart_items": cart_items,
                     "total_price": total_price,
                     "error_message": f"An error occurred while processing your payment: {str(e)}. Please try again.",
                 }
@@ -137,7 +150,7 @@ class CheckOutView(CartMixin, View):
         context = {
             "form": form,
             "cart": cart,
-            "cart_items": cart.items.select_related("product", "product_size__size").order_by("-added_at"),
+            "cart_items": cart_items,
             "total_price": total_price,
             "error_message": "There were errors in your form. Please correct them and try again.",
         }
@@ -10,6 +10,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from orders.models import Order
 from cart.views import CartMixin
+from core.popularity import record_sales
 from decimal import ROUND_HALF_UP, Decimal
 import json
 import hashlib
@@ -71,15 +72,21 @@ def stripe_webhook(request):
     if event['type'] == 'checkout.session.completed':
         session = event['data']['object']
         order_id = session['metadata'].get('order_id')
-
+        # სინქრონულად (ATOMIC_REQUESTS): ერთი სტრიქონის UPDATE, worker-ზე და
+        # მის ქეშზე/ფაილებზე არ არის დამოკიდებული — გადახდა worker-ის გარეშეც ჩანს
         try:
-            order = Order.objects.get(id=order_id)
-            order.status = 'processing'
-            order.stripe_payment_intent_id = session.get('payment_intent')
-            order.save()
+            order = Order.objects.select_for_update().get(id=order_id)
         except Order.DoesNotExist:
             return HttpResponse(status=400)
-        
+        # გაყიდვა მხოლოდ pending -> processing გადასვლისას: Stripe-ის განმეორებითი
+        # მიწოდება ორჯერ არ ითვლება
+        newly_paid = order.status == 'pending'
+        order.status = 'processing'
+        order.stripe_payment_intent_id = session.get('payment_intent')
+        order.save(update_fields=['status', 'stripe_payment_intent_id', 'updated_at'])
+        if newly_paid:
+            record_sales(order.items.values_list('product_id', 'quantity'))
+
     return HttpResponse(status=200)
 
 def stripe_success(request):